@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Penyimpanan Artikel Mitigasi Bencana
+Artikel dimuat sekali dari data/articles.json, diurutkan dari yang terbaru,
+dan setiap artikel di-encode ke JSON satu kali. Halaman /api/articles hanya
+menyambung potongan JSON yang sudah jadi: pagination memakai cursor (id
+artikel terakhir, dicari dengan bisect), filter kategori memakai daftar posisi
+per kategori, dan pencarian kata kunci memakai inverted index atas judul dan
+ringkasan. Semua operasi per request bergantung pada ukuran halaman dan jumlah
+hasil, bukan jumlah artikel, sehingga tetap cepat untuk puluhan ribu artikel.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from flask import current_app, request
+from flask.json.provider import JSONProvider
+
+DEFAULT_ARTICLES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                     'data', 'articles.json')
+
+# Page size when ?limit= is not given, and the largest allowed
+ARTICLES_PAGE_SIZE = int(os.getenv('ARTICLES_PAGE_SIZE', '20'))
+ARTICLES_MAX_PAGE_SIZE = 100
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of `text`"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def encode_cursor(article_id) -> str:
+    return base64.urlsafe_b64encode(str(article_id).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Cursor tidak valid') from None
+
+
+class ArticleStore:
+    """
+    Immutable article collection with pre-encoded JSON and search indexes
+
+    Args:
+        json_provider: The app's JSON provider (`app.json`), so page bodies
+            are byte-identical to what `jsonify` would produce
+        path: JSON file {'version': ..., 'articles': [...]}
+
+    Articles are ordered newest first (date, then id). Positions in that
+    order are what the category lists and the inverted index hold, so every
+    filter result is already sorted.
+    """
+
+    def __init__(self, json_provider: JSONProvider, path: str = DEFAULT_ARTICLES_FILE):
+        self.path = path
+        self.json_provider = json_provider
+        with open(path, 'rb') as f:
+            raw = f.read()
+        document = json.loads(raw)
+        self.version = document.get('version')
+        self.digest = hashlib.sha1(raw).hexdigest()
+
+        self.articles: List[Dict] = sorted(document['articles'], key=lambda a: (a['date'], a['id']), reverse=True)
+        self._encoded: List[bytes] = [self.encode(article).rstrip(b'\n') for article in self.articles]
+        self._position: Dict[str, int] = {str(a['id']): k for k, a in enumerate(self.articles)}
+        if len(self._position) != len(self.articles):
+            raise ValueError(f'Duplicate article ids in {path}')
+
+        self._by_category: Dict[str, List[int]] = {}
+        postings: Dict[str, List[int]] = {}
+        for position, article in enumerate(self.articles):
+            self._by_category.setdefault(article['category'].lower(), []).append(position)
+            for token in set(tokenize(f"{article['title']} {article['excerpt']}")):
+                postings.setdefault(token, []).append(position)
+        self._postings = postings
+        # Sorted vocabulary for prefix matching ("banj" finds "banjir")
+        self._vocabulary: List[str] = sorted(postings)
+
+    def encode(self, obj) -> bytes:
+        """`obj` exactly as `jsonify` sends it (compact, trailing newline)"""
+        return self.json_provider.response(obj).get_data()
+
+    @property
+    def categories(self) -> List[str]:
+        return sorted({article['category'] for article in self.articles})
+
+    def _token_positions(self, token: str) -> List[int]:
+        """Positions of articles with a word starting with `token`"""
+        start = bisect_left(self._vocabulary, token)
+        stop = bisect_left(self._vocabulary, token + '\uffff', start)
+        words = self._vocabulary[start:stop]
+        if len(words) == 1:
+            return self._postings[words[0]]
+        return sorted({p for word in words for p in self._postings[word]})
+
+    def search(self, category: Optional[str] = None, query: Optional[str] = None) -> Sequence[int]:
+        """
+        Sorted positions matching the category and every query word (prefixes match)
+
+        Intersects starting from the shortest list, so the cost follows the
+        number of hits rather than the size of the store.
+        """
+        lists = []
+        if category:
+            lists.append(self._by_category.get(category.lower(), []))
+        for token in tokenize(query or ''):
+            lists.append(self._token_positions(token))
+        if not lists:
+            return range(len(self.articles))
+
+        lists.sort(key=len)
+        result = lists[0]
+        for other in lists[1:]:
+            if not result:
+                break
+            members = set(other)
+            result = [p for p in result if p in members]
+        return result
+
+    def page(self, category: Optional[str] = None, query: Optional[str] = None,
+             cursor: Optional[str] = None, limit: int = ARTICLES_PAGE_SIZE) -> bytes:
+        """
+        JSON body of one page: {'articles', 'count', 'next_cursor', 'success', 'total'}
+
+        Raises:
+            ValueError: Unknown cursor or a limit outside 1..ARTICLES_MAX_PAGE_SIZE
+        """
+        if not 1 <= limit <= ARTICLES_MAX_PAGE_SIZE:
+            raise ValueError(f'limit harus 1..{ARTICLES_MAX_PAGE_SIZE}')
+        positions = self.search(category, query)
+
+        start = 0
+        if cursor:
+            last = self._position.get(decode_cursor(cursor))
+            if last is None:
+                raise ValueError('Cursor tidak valid')
+            start = bisect_right(positions, last)
+        selected = positions[start:start + limit]
+
+        more = start + limit < len(positions)
+        meta = {
+            'count': len(selected),
+            'next_cursor': encode_cursor(self.articles[selected[-1]]['id']) if more else None,
+            'success': True,
+            'total': len(positions),
+        }
+        # Keys are sorted by the provider and 'articles' sorts first, so the
+        # pre-encoded articles are spliced in front of the encoded metadata
+        return b''.join((b'{"articles":[', b','.join(self._encoded[p] for p in selected), b'],',
+                         self.encode(meta)[1:]))
+
+    def etag(self, category: Optional[str], query: Optional[str], cursor: Optional[str], limit: int) -> str:
+        """ETag of a page without building it (the store never changes after loading)"""
+        key = '\0'.join((self.digest, (category or '').lower(), ' '.join(tokenize(query or '')),
+                         cursor or '', str(limit)))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def respond(self, args: Mapping[str, str]):
+        """
+        Serve a page for query args limit, cursor, category and q
+
+        Sends `304 Not Modified` when the client already holds the same ETag.
+        """
+        limit = int(args.get('limit', ARTICLES_PAGE_SIZE))
+        category, query, cursor = args.get('category'), args.get('q'), args.get('cursor')
+        etag = self.etag(category, query, cursor, limit)
+        if etag in request.if_none_match:
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(self.page(category, query, cursor, limit),
+                                                  mimetype='application/json')
+        response.headers['ETag'] = f'"{etag}"'
+        return response
+
+    def status(self) -> Dict:
+        return {
+            'version': self.version,
+            'articles': len(self.articles),
+            'categories': self.categories,
+            'words': len(self._vocabulary),
+        }
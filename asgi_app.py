@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mode Serving Async (ASGI) untuk Sistem Pakar Mitigasi Bencana - ENHANCED
+Route yang menunggu OpenWeatherMap (/api/weather dan /api/weather/search,
+termasuk HEAD dan OPTIONS) dijalankan native di event loop asyncio dengan
+aiohttp, sehingga satu proses bisa menahan ribuan request yang sedang
+menunggu upstream tanpa satu thread per request. Route lain diteruskan ke aplikasi Flask yang sama lewat bridge
+WSGI (thread pool kecil). Bentuk response identik dengan web_app_enhanced.
+
+Jalankan (butuh requirements-async.txt):
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+atau
+    python asgi_app.py
+"""
+
+import asyncio
+import contextvars
+import io
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qsl
+
+import aiohttp
+
+import web_app_enhanced as core
+from metrics import METRICS
+from singleflight import AsyncSingleFlight
+from upstream_async import aclose, upstream_get_async
+
+logger = logging.getLogger(__name__)
+
+WEATHER_FLIGHTS_ASYNC = AsyncSingleFlight('weather-async')
+GEOCODE_FLIGHTS_ASYNC = AsyncSingleFlight('geocode-async')
+core.FLIGHTS += [WEATHER_FLIGHTS_ASYNC, GEOCODE_FLIGHTS_ASYNC]
+
+# Threads running the Flask app for every route that is not native here
+ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', '32'))
+
+# Flask response bytes collected in the worker thread before the first send;
+# larger (streamed) bodies are forwarded chunk by chunk
+_BUFFER_LIMIT = 64 * 1024
+
+# ============================================
+# ASYNC UPSTREAM CALLS
+# ============================================
+
+async def _fetch_json_async(endpoint: str, url: str, deadline: float = None) -> Dict:
+    """GET a JSON document through the async pool, raising on HTTP errors"""
+    response = await upstream_get_async(endpoint, url, deadline=deadline)
+    response.raise_for_status()
+    return await response.json(content_type=None)
+
+async def fetch_weather_data_async(lat: float, lon: float, api_key: str) -> Dict:
+    """Async counterpart of core.fetch_weather_data (same deadline and partial results)"""
+    query = core.weather_query(lat, lon, api_key)
+    # Each call times itself out at the deadline; the wait below is a backstop
+    deadline = time.monotonic() + core.WEATHER_DEADLINE
+    tasks = {
+        'current': asyncio.ensure_future(
+            _fetch_json_async('weather', f'{core.OPENWEATHER_BASE_URL}/data/2.5/weather?{query}', deadline)),
+        'forecast': asyncio.ensure_future(
+            _fetch_json_async('forecast', f'{core.OPENWEATHER_BASE_URL}/data/2.5/forecast?{query}', deadline)),
+    }
+    _, pending = await asyncio.wait(tasks.values(), timeout=core.WEATHER_DEADLINE + 0.1)
+
+    fetched = {}
+    errors = {}
+    for name, task in tasks.items():
+        if task in pending:
+            task.cancel()
+            errors[name] = f'Timeout after {core.WEATHER_DEADLINE}s'
+            continue
+        try:
+            fetched[name] = task.result()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            errors[name] = str(e) or type(e).__name__
+        except ValueError as e:
+            errors[name] = f'Invalid JSON: {str(e)}'
+
+    return core.assemble_weather_result(lat, lon, fetched, errors)
+
+async def get_weather_data_async(city: str = None, lat: float = None, lon: float = None,
+                                 q: bool = None, r: bool = None) -> Dict:
+    """Async counterpart of core.get_weather_data (shares its cache)"""
+    api_key = os.getenv('OPENWEATHER_API_KEY')
+
+    if not api_key:
+        return {
+            'success': False,
+            'error': core.WEATHER_KEY_ERROR
+        }
+
+    lat, lon = core.resolve_weather_location(city, lat, lon)
+    key = core.weather_cache_key(lat, lon)
+    data = await core.WEATHER_CACHE.aget_or_load(
+        key,
+        lambda: fetch_weather_data_async(key[0], key[1], api_key),
+        cacheable=core.is_cacheable_weather,
+        flights=WEATHER_FLIGHTS_ASYNC
+    )
+    return core.localize_weather(data, lat, lon, q, r)
+
+async def geocode_remote_async(city: str, api_key: str) -> List[Dict]:
+    """Async counterpart of core.geocode_remote"""
+    city_lower = city.lower()
+    url_id, url_global = core.geocode_urls(city, api_key)
+    all_cities = []
+    seen = set()
+
+    logger.debug('Geocoding city %r', city)
+
+    try:
+        response_id = await upstream_get_async('geo', url_id)
+        if response_id.ok:
+            data_id = await response_id.json(content_type=None)
+            logger.debug('%d results from Indonesia search', len(data_id))
+            all_cities.extend(core.rank_geocode_results(data_id, city_lower, seen, indonesia_search=True))
+    except Exception as e:
+        logger.warning('Indonesia geocoding search for %r failed: %s', city, e)
+
+    if len(all_cities) < 5:
+        try:
+            response_global = await upstream_get_async('geo', url_global)
+            if response_global.ok:
+                data_global = await response_global.json(content_type=None)
+                logger.debug('%d results from global search', len(data_global))
+                all_cities.extend(core.rank_geocode_results(data_global, city_lower, seen, indonesia_search=False))
+        except Exception as e:
+            logger.warning('Global geocoding search for %r failed: %s', city, e)
+
+    core.remember_places(all_cities)
+    return all_cities
+
+# ============================================
+# NATIVE ROUTES
+# ============================================
+
+def _float_arg(args: Dict[str, str], name: str):
+    """Same as request.args.get(name, type=float): None when missing or invalid"""
+    try:
+        return float(args[name])
+    except (KeyError, ValueError):
+        return None
+
+async def api_weather(args: Dict[str, str]) -> Tuple[Dict, int]:
+    """Get current weather and forecast"""
+    try:
+        weather_data = await get_weather_data_async(city=args.get('city'),
+                                                     lat=_float_arg(args, 'lat'),
+                                                     lon=_float_arg(args, 'lon'),
+                                                     q=core.parse_flag(args.get('q')),
+                                                     r=core.parse_flag(args.get('r')))
+        return weather_data, 200
+    except Exception as e:
+        return {'success': False, 'error': str(e)}, 400
+
+async def api_weather_search(args: Dict[str, str]) -> Tuple[Dict, int]:
+    """Search for city coordinates (offline gazetteer first, then remote)"""
+    try:
+        city = args.get('city', '').strip()
+
+        if not city:
+            return {
+                'success': False,
+                'error': 'Parameter kota diperlukan'
+            }, 400
+
+        local, final = core.gazetteer_search(city)
+        if final:
+            return {'success': True, 'source': 'local', 'cities': [core._city_result(p) for p in local]}, 200
+
+        api_key = os.getenv('OPENWEATHER_API_KEY')
+
+        if not api_key:
+            if local:
+                return {'success': True, 'source': 'local', 'cities': [core._city_result(p) for p in local]}, 200
+            return {
+                'success': False,
+                'error': 'Kunci API tidak dikonfigurasi'
+            }, 400
+
+        all_cities = await GEOCODE_FLIGHTS_ASYNC.do(city.lower(), lambda: geocode_remote_async(city, api_key))
+        return core.remote_search_response(city, all_cities, local)
+
+    except asyncio.TimeoutError:
+        return {'success': False, 'error': 'Koneksi timeout. Coba lagi.'}, 408
+    except aiohttp.ClientError as e:
+        return {'success': False, 'error': f'Gagal terhubung ke server: {str(e)}'}, 500
+    except Exception as e:
+        logger.exception('City search for %r failed', args.get('city'))
+        return {'success': False, 'error': f'Terjadi kesalahan: {str(e)}'}, 400
+
+# Served natively for GET and HEAD (OPTIONS is answered like Flask + flask-cors)
+ROUTES = {
+    '/api/weather': api_weather,
+    '/api/weather/search': api_weather_search,
+}
+NATIVE_METHODS = frozenset({'GET', 'HEAD'})
+
+# Methods flask-cors allows in a preflight response by default
+_CORS_METHODS = b'DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT'
+
+# ============================================
+# WSGI BRIDGE (all other routes)
+# ============================================
+
+def _wsgi_environ(scope: Dict, body: bytes) -> Dict:
+    """Translate an ASGI HTTP scope into a WSGI environ"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1')
+        value = value.decode('latin-1')
+        if name == 'content-type':
+            key = 'CONTENT_TYPE'
+        elif name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+class WSGIBridge:
+    """
+    Run a WSGI app in a thread pool for ASGI requests
+
+    Small responses are produced entirely in the worker thread; streamed
+    bodies (e.g. NDJSON truth tables) are pulled one chunk per hop.
+    """
+
+    def __init__(self, wsgi_app, max_workers: int = ASGI_WSGI_THREADS):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='asgi-wsgi')
+
+    def _start(self, environ: Dict):
+        """Call the app and buffer up to _BUFFER_LIMIT bytes (worker thread)"""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]
+
+        iterable = self.wsgi_app(environ, start_response)
+        iterator = iter(iterable)
+        chunks = []
+        size = 0
+        done = False
+        while size < _BUFFER_LIMIT:
+            chunk = next(iterator, None)
+            if chunk is None:
+                done = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        if done and hasattr(iterable, 'close'):
+            iterable.close()
+        return response['status'], response['headers'], b''.join(chunks), None if done else (iterable, iterator)
+
+    @staticmethod
+    def _close(iterable):
+        if hasattr(iterable, 'close'):
+            iterable.close()
+
+    async def __call__(self, scope: Dict, receive, send):
+        body = bytearray()
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        loop = asyncio.get_running_loop()
+        # Every hop runs in one context: stream_with_context keeps Flask's
+        # request context in context variables across chunks
+        context = contextvars.copy_context()
+        status, headers, head, rest = await loop.run_in_executor(
+            self.executor, context.run, self._start, _wsgi_environ(scope, bytes(body)))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        if rest is None:
+            await send({'type': 'http.response.body', 'body': head})
+            return
+
+        iterable, iterator = rest
+        try:
+            await send({'type': 'http.response.body', 'body': head, 'more_body': True})
+            while True:
+                chunk = await loop.run_in_executor(self.executor, context.run, next, iterator, None)
+                if chunk is None:
+                    break
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            await loop.run_in_executor(self.executor, context.run, self._close, iterable)
+
+# ============================================
+# ASGI APPLICATION
+# ============================================
+
+def _cors_headers(scope: Dict, preflight: bool = False) -> List[Tuple[bytes, bytes]]:
+    """Same headers flask-cors adds with its default (allow all) settings"""
+    headers = dict(scope['headers'])
+    origin = headers.get(b'origin')
+    if origin is None:
+        return [(b'access-control-allow-origin', b'*')]
+    cors = [(b'access-control-allow-origin', origin)]
+    if preflight and b'access-control-request-method' in headers:
+        if b'access-control-request-headers' in headers:
+            cors.append((b'access-control-allow-headers', headers[b'access-control-request-headers']))
+        cors.append((b'access-control-allow-methods', _CORS_METHODS))
+    return cors + [(b'vary', b'Origin')]
+
+class AsyncApp:
+    """ASGI entry point: native async weather routes, Flask for the rest"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.fallback = WSGIBridge(flask_app.wsgi_app)
+
+    async def __call__(self, scope: Dict, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        handler = ROUTES.get(scope['path'])
+        method = scope['method']
+        if handler is None or (method not in NATIVE_METHODS and method != 'OPTIONS'):
+            await self.fallback(scope, receive, send)
+            return
+
+        # Native routes are recorded here; Flask's own hooks cover the fallback
+        route, start, status = scope['path'], time.perf_counter(), 500
+        METRICS.request_started(route)
+        try:
+            if method == 'OPTIONS':
+                # Flask's automatic OPTIONS response (no upstream call)
+                status, body = 200, b''
+                headers = [
+                    (b'content-type', b'text/html; charset=utf-8'),
+                    (b'allow', b'GET, HEAD, OPTIONS'),
+                    (b'content-length', b'0'),
+                ] + _cors_headers(scope, preflight=True)
+            else:
+                # First value wins, blanks kept: same as request.args.get()
+                args = {}
+                for name, value in parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True):
+                    args.setdefault(name, value)
+                payload, status = await handler(args)
+                # Same encoder and bytes as jsonify()
+                body = self.flask_app.json.response(payload).get_data()
+                headers = [
+                    (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode('latin-1')),
+                ] + _cors_headers(scope)
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            # HEAD: same status and headers as GET (the weather is still fetched), no body
+            await send({'type': 'http.response.body', 'body': body if method == 'GET' else b''})
+        finally:
+            METRICS.request_finished(route, method, status, time.perf_counter() - start)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await aclose()
+                self.fallback.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+app = AsyncApp(core.app)
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("🚀 Starting ASGI server (uvicorn)...")
+    print("📍 Server: http://localhost:5000")
+    uvicorn.run(app, host=os.getenv('HOST', '0.0.0.0'), port=int(os.getenv('PORT', '5000')))
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Binary Decision Diagram (ROBDD)
+Formula logika disimpan sebagai BDD tereduksi dan terurut dengan tabel node
+bersama (unique table), sehingga fungsi yang sama selalu menjadi node yang
+sama. Jumlah model (berapa skenario berisiko), satisfiability, dan restriksi
+dengan variabel yang sudah diketahui dihitung langsung pada graf, tanpa
+enumerasi 2^n baris tabel kebenaran.
+
+Contoh:
+    >>> bdd = BDD()
+    >>> flood = bdd.compile('p & (q | r)')
+    >>> bdd.count(flood)
+    3
+    >>> bdd.count(bdd.restrict(flood, {'p': True}), over=('q', 'r'))
+    3
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from logic_engine import parse, variables_of
+
+# Computed-table entries kept before the operation caches are cleared
+_CACHE_LIMIT = 1 << 20
+
+
+class BDDTooLarge(ValueError):
+    """A diagram needed more nodes than its manager's max_nodes"""
+
+
+class BDD:
+    """
+    Reduced ordered BDD manager with a shared unique table
+
+    Nodes are ints: 0 is FALSE, 1 is TRUE, every other id indexes the
+    (level, low, high) arrays. Variables are ordered by declaration (first
+    declared = top of the diagram); compiling a formula declares its unknown
+    variables in order of first appearance. All public methods are
+    thread-safe.
+
+    With `max_nodes`, creating a node beyond that many raises BDDTooLarge
+    (some formulas grow exponentially whatever the order); the nodes built
+    so far stay valid.
+    """
+
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, variables: Iterable[str] = (), max_nodes: Optional[int] = None):
+        self.max_nodes = max_nodes
+        self._names: List[str] = []
+        self._levels: Dict[str, int] = {}
+        # Terminals sit below every variable; their level is resolved lazily
+        self._level: List[int] = [-1, -1]
+        self._low: List[int] = [0, 1]
+        self._high: List[int] = [0, 1]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._apply_cache: Dict[Tuple[str, int, int], int] = {}
+        self._not_cache: Dict[int, int] = {}
+        self._lock = threading.RLock()
+        self.declare(*variables)
+
+    # --------------------------------------------
+    # Construction
+    # --------------------------------------------
+
+    def declare(self, *names: str) -> None:
+        """Append variables to the bottom of the order (already known ones are kept)"""
+        with self._lock:
+            for name in names:
+                if name not in self._levels:
+                    self._levels[name] = len(self._names)
+                    self._names.append(name)
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """Declared variables in order"""
+        return tuple(self._names)
+
+    def __len__(self) -> int:
+        """Nodes in the shared table, terminals included"""
+        return len(self._low)
+
+    def _lvl(self, u: int) -> int:
+        return len(self._names) if u < 2 else self._level[u]
+
+    def _mk(self, level: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        key = (level, low, high)
+        u = self._unique.get(key)
+        if u is None:
+            u = len(self._low)
+            if self.max_nodes is not None and u >= self.max_nodes:
+                raise BDDTooLarge(f'Formula terlalu kompleks: BDD melebihi {self.max_nodes} node')
+            self._level.append(level)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = u
+        return u
+
+    def var(self, name: str) -> int:
+        """Node of a single variable (declared on first use)"""
+        with self._lock:
+            self.declare(name)
+            return self._mk(self._levels[name], self.FALSE, self.TRUE)
+
+    def _neg(self, u: int) -> int:
+        if u < 2:
+            return 1 - u
+        result = self._not_cache.get(u)
+        if result is None:
+            result = self._mk(self._level[u], self._neg(self._low[u]), self._neg(self._high[u]))
+            self._not_cache[u] = result
+        return result
+
+    def _apply(self, op: str, u: int, v: int) -> int:
+        # Terminal cases
+        if op == 'and':
+            if u == 0 or v == 0:
+                return 0
+            if u == 1 or u == v:
+                return v
+            if v == 1:
+                return u
+        elif op == 'or':
+            if u == 1 or v == 1:
+                return 1
+            if u == 0 or u == v:
+                return v
+            if v == 0:
+                return u
+        else:  # xor
+            if u == v:
+                return 0
+            if u == 0:
+                return v
+            if v == 0:
+                return u
+            if u == 1:
+                return self._neg(v)
+            if v == 1:
+                return self._neg(u)
+
+        if u > v:  # all three operators are commutative
+            u, v = v, u
+        key = (op, u, v)
+        result = self._apply_cache.get(key)
+        if result is not None:
+            return result
+
+        lu, lv = self._lvl(u), self._lvl(v)
+        level = min(lu, lv)
+        u0, u1 = (self._low[u], self._high[u]) if lu == level else (u, u)
+        v0, v1 = (self._low[v], self._high[v]) if lv == level else (v, v)
+        result = self._mk(level, self._apply(op, u0, v0), self._apply(op, u1, v1))
+        self._apply_cache[key] = result
+        return result
+
+    def _trim_caches(self) -> None:
+        if len(self._apply_cache) > _CACHE_LIMIT:
+            self._apply_cache.clear()
+        if len(self._not_cache) > _CACHE_LIMIT:
+            self._not_cache.clear()
+
+    def clear_caches(self) -> None:
+        """Drop the operation caches (nodes are kept), e.g. before keeping a manager around"""
+        with self._lock:
+            self._apply_cache.clear()
+            self._not_cache.clear()
+
+    def neg(self, u: int) -> int:
+        """¬u"""
+        with self._lock:
+            return self._neg(u)
+
+    def apply(self, op: str, u: int, v: int) -> int:
+        """u op v for op in 'and', 'or', 'xor'"""
+        if op not in ('and', 'or', 'xor'):
+            raise ValueError(f'Unknown operator {op!r}')
+        with self._lock:
+            result = self._apply(op, u, v)
+            self._trim_caches()
+            return result
+
+    def _from_ast(self, node: tuple, env: Dict[str, int]) -> int:
+        kind = node[0]
+        if kind == 'var':
+            name = node[1]
+            if name in env:
+                return env[name]
+            self.declare(name)
+            return self._mk(self._levels[name], self.FALSE, self.TRUE)
+        if kind == 'const':
+            return self.TRUE if node[1] else self.FALSE
+        if kind == 'not':
+            return self._neg(self._from_ast(node[1], env))
+        result = self._from_ast(node[1], env)
+        for child in node[2:]:
+            result = self._apply(kind, result, self._from_ast(child, env))
+        return result
+
+    def compile(self, formula: str, env: Dict[str, int] = None) -> int:
+        """
+        Build the node of a formula string
+
+        Args:
+            formula: logic_engine syntax, e.g. 'p & (q | r)'
+            env: Names bound to existing nodes (not treated as variables)
+        """
+        node = parse(formula)
+        with self._lock:
+            env = env or {}
+            self.declare(*(name for name in variables_of(node) if name not in env))
+            result = self._from_ast(node, env)
+            self._trim_caches()
+            return result
+
+    def compile_program(self, variables: Sequence[str],
+                        assignments: Sequence[Tuple[str, str]]) -> Dict[str, int]:
+        """
+        Build nodes for named formulas, like logic_engine.compile_program
+
+        `variables` are declared first, fixing their order. Later formulas may
+        use earlier names.
+
+        Returns:
+            {name: node} for every assignment
+        """
+        if isinstance(assignments, dict):
+            assignments = assignments.items()
+        with self._lock:
+            self.declare(*variables)
+            env: Dict[str, int] = {}
+            for name, formula in assignments:
+                env[name] = self.compile(formula, env)
+            return env
+
+    # --------------------------------------------
+    # Queries (no enumeration)
+    # --------------------------------------------
+
+    def restrict(self, u: int, assignment: Dict[str, bool]) -> int:
+        """u with the given variables fixed (names not declared are ignored)"""
+        with self._lock:
+            fixed = {self._levels[name]: bool(value) for name, value in assignment.items()
+                     if name in self._levels}
+            if not fixed:
+                return u
+            memo: Dict[int, int] = {}
+
+            def walk(n: int) -> int:
+                if n < 2:
+                    return n
+                result = memo.get(n)
+                if result is None:
+                    level = self._level[n]
+                    if level in fixed:
+                        result = walk(self._high[n] if fixed[level] else self._low[n])
+                    else:
+                        result = self._mk(level, walk(self._low[n]), walk(self._high[n]))
+                    memo[n] = result
+                return result
+
+            return walk(u)
+
+    def count(self, u: int, over: Sequence[str] = None) -> int:
+        """
+        Number of satisfying assignments
+
+        Args:
+            over: Variables to count over (default: every declared variable).
+                Must include every variable u depends on, e.g. the free
+                variables left after restrict().
+        """
+        with self._lock:
+            total = len(self._names)
+            memo: Dict[int, int] = {0: 0, 1: 1}
+
+            def models(n: int) -> int:
+                # Models over the variables from level(n) down
+                result = memo.get(n)
+                if result is None:
+                    level = self._level[n]
+                    low, high = self._low[n], self._high[n]
+                    result = (models(low) << (self._lvl(low) - level - 1)) + \
+                             (models(high) << (self._lvl(high) - level - 1))
+                    memo[n] = result
+                return result
+
+            result = models(u) << self._lvl(u)
+        if over is None:
+            return result
+        over = set(over)
+        missing = self.support(u) - over
+        if missing:
+            raise ValueError(f'Variables not counted over: {", ".join(sorted(missing))}')
+        declared = len(over & set(self._names))
+        # Drop the declared variables outside `over`, add any undeclared ones
+        return (result >> (total - declared)) << (len(over) - declared)
+
+    def sat(self, u: int) -> Optional[Dict[str, bool]]:
+        """
+        One satisfying assignment, or None when u is unsatisfiable
+
+        Only the variables on the chosen path are set; the others are free.
+        """
+        if u == self.FALSE:
+            return None
+        with self._lock:
+            assignment = {}
+            while u > 1:
+                name = self._names[self._level[u]]
+                # In a reduced diagram every non-FALSE node reaches TRUE
+                if self._low[u] != self.FALSE:
+                    assignment[name] = False
+                    u = self._low[u]
+                else:
+                    assignment[name] = True
+                    u = self._high[u]
+            return assignment
+
+    def min_cost_sat(self, u: int, weights: Dict[str, Tuple[float, float]]) -> Optional[Tuple[float, Dict[str, bool]]]:
+        """
+        Cheapest satisfying assignment (shortest path to TRUE, linear in size)
+
+        Args:
+            weights: {name: (cost if False, cost if True)}; variables not
+                listed, and variables skipped by the path, cost nothing
+
+        Returns:
+            (cost, assignment of the variables on the path), or None when u
+            is unsatisfiable
+        """
+        if u == self.FALSE:
+            return None
+        with self._lock:
+            memo: Dict[int, Tuple[float, int]] = {}
+
+            def best(n: int) -> float:
+                # (cost to reach TRUE from n, branch taken: 0 low / 1 high)
+                if n < 2:
+                    return 0.0 if n == self.TRUE else float('inf')
+                if n not in memo:
+                    off, on = weights.get(self._names[self._level[n]], (0.0, 0.0))
+                    low, high = off + best(self._low[n]), on + best(self._high[n])
+                    memo[n] = (low, 0) if low <= high else (high, 1)
+                return memo[n][0]
+
+            cost = best(u)
+            assignment = {}
+            while u > 1:
+                branch = memo[u][1]
+                assignment[self._names[self._level[u]]] = bool(branch)
+                u = self._high[u] if branch else self._low[u]
+            return cost, assignment
+
+    def support(self, u: int) -> set:
+        """Variables u depends on"""
+        with self._lock:
+            return {self._names[self._level[n]] for n in self._nodes(u)}
+
+    def size(self, u: int) -> int:
+        """Internal nodes reachable from u"""
+        with self._lock:
+            return len(self._nodes(u))
+
+    def _nodes(self, u: int) -> set:
+        seen = set()
+        stack = [u]
+        while stack:
+            n = stack.pop()
+            if n > 1 and n not in seen:
+                seen.add(n)
+                stack.append(self._low[n])
+                stack.append(self._high[n])
+        return seen
+
+    def evaluate(self, u: int, assignment: Dict[str, bool]) -> bool:
+        """Value of u for a full assignment (missing variables raise KeyError)"""
+        with self._lock:
+            while u > 1:
+                u = self._high[u] if assignment[self._names[self._level[u]]] else self._low[u]
+            return u == self.TRUE
+
+
+def analyze(bdd: BDD, u: int, variables: Sequence[str], known: Dict[str, bool]) -> Dict:
+    """
+    Scenario analysis of a formula node given some known inputs
+
+    Args:
+        variables: The formula's input variables
+        known: Inputs already fixed, e.g. {'p': True}
+
+    Returns:
+        {'known', 'free', 'scenarios', 'risk_scenarios', 'ratio',
+         'satisfiable', 'always', 'example', 'nodes'} where 'example' assigns
+        every free variable (don't-cares as False)
+    """
+    known = {name: bool(value) for name, value in known.items() if name in variables}
+    free = [name for name in variables if name not in known]
+    restricted = bdd.restrict(u, known)
+    scenarios = 1 << len(free)
+    risk = bdd.count(restricted, over=free)
+    example = bdd.sat(restricted)
+    if example is not None:
+        example = {name: example.get(name, False) for name in free}
+    return {
+        'known': known,
+        'free': free,
+        'scenarios': scenarios,
+        'risk_scenarios': risk,
+        'ratio': risk / scenarios,
+        'satisfiable': risk > 0,
+        'always': risk == scenarios,
+        'example': example,
+        'nodes': bdd.size(restricted),
+    }
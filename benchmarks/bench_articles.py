@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: /api/articles dengan ArticleStore untuk koleksi besar
+
+Membuat N artikel sintetis (default 10.000) di file sementara, lalu
+membandingkan per request:
+- "before": seluruh daftar di-jsonify, filter/pencarian dengan scan linear,
+  pagination dengan slicing offset (seperti get_articles() sebelumnya)
+- "after": ArticleStore (JSON pra-encode, indeks kategori, inverted index,
+  cursor), termasuk revalidasi dengan If-None-Match (304)
+Diukur lewat test client WSGI (tanpa jaringan): latency p50/p99 dan byte.
+
+Jalankan dari root repo:
+    python benchmarks/bench_articles.py [articles] [requests]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask, jsonify, request  # noqa: E402
+
+from articles import ArticleStore  # noqa: E402
+
+CATEGORIES = ('Tips', 'Teknologi', 'Edukasi', 'Infrastruktur', 'Lingkungan', 'Kesiapsiagaan')
+WORDS = ('banjir', 'gempa', 'longsor', 'tsunami', 'evakuasi', 'mitigasi', 'drainase', 'sungai', 'sekolah',
+         'warga', 'relawan', 'sirine', 'peringatan', 'dini', 'aceh', 'pesisir', 'hutan', 'bakau', 'simulasi',
+         'posko', 'logistik', 'bendungan', 'curah', 'hujan', 'retakan', 'tanah', 'bangunan', 'tahan')
+
+
+def synthetic_articles(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [{
+        'id': k + 1,
+        'title': ' '.join(rng.choice(WORDS) for _ in range(6)).capitalize(),
+        'excerpt': ' '.join(rng.choice(WORDS) for _ in range(25)).capitalize() + '.',
+        'category': rng.choice(CATEGORIES),
+        'date': f'20{rng.randint(15, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+        'image': f'https://images.example.org/{k + 1}.jpg',
+        'image_alt': f'Foto artikel {k + 1}',
+        'author': 'BPBD Aceh',
+    } for k in range(count)]
+
+
+def before_app(articles) -> Flask:
+    app = Flask('before')
+    ordered = sorted(articles, key=lambda a: (a['date'], a['id']), reverse=True)
+
+    @app.route('/api/articles')
+    def api_articles():
+        result = ordered
+        category, query = request.args.get('category'), request.args.get('q')
+        if category:
+            result = [a for a in result if a['category'].lower() == category.lower()]
+        if query:
+            words = query.lower().split()
+            result = [a for a in result if all(w in f"{a['title']} {a['excerpt']}".lower() for w in words)]
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', 20))
+        return jsonify({'success': True, 'articles': result[offset:offset + limit], 'total': len(result)})
+
+    return app
+
+
+def after_app(path: str):
+    app = Flask('after')
+    store = ArticleStore(app.json, path)
+
+    @app.route('/api/articles')
+    def api_articles():
+        return store.respond(request.args)
+
+    return app, store
+
+
+def measure(client, url, count, headers=None):
+    latencies = []
+    size = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        size = len(response.get_data())
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return size, latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * 0.99)] * 1000
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    articles = synthetic_articles(total)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'articles.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'articles': articles}, f, ensure_ascii=False)
+        start = time.perf_counter()
+        app, store = after_app(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+    before, after = before_app(articles).test_client(), app.test_client()
+    # Cursor of page 250 (offset 5000) for the deep-page row
+    cursor = json.loads(store.page(limit=100))['next_cursor']
+    for _ in range(49):
+        cursor = json.loads(store.page(cursor=cursor, limit=100))['next_cursor']
+
+    scenarios = (
+        ('first page', '?limit=20', '?limit=20'),
+        ('deep page', '?offset=5000&limit=20', f'?cursor={cursor}&limit=20'),
+        ('category', '?category=tips', '?category=tips'),
+        ('search', '?q=banjir+evakuasi+sungai', '?q=banjir+evakuasi+sungai'),
+        ('cat+search', '?category=edukasi&q=tsunami+sirine', '?category=edukasi&q=tsunami+sirine'),
+    )
+    print(f'{total} articles, store loaded in {load_ms:.0f} ms '
+          f"({store.status()['words']} indexed words); {count} requests per row")
+    print(f"{'query':<12} {'mode':<7} {'bytes':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for label, before_query, after_query in scenarios:
+        for mode, client, query in (('before', before, before_query), ('after', after, after_query)):
+            size, p50, p99 = measure(client, '/api/articles' + query, count)
+            print(f'{label:<12} {mode:<7} {size:>7} {p50:8.3f} {p99:8.3f}')
+
+    etag = after.get('/api/articles?limit=20').headers['ETag']
+    size, p50, p99 = measure(after, '/api/articles?limit=20', count, {'If-None-Match': etag})
+    print(f"{'revalidate':<12} {'after':<7} {size:>7} {p50:8.3f} {p99:8.3f}")
+
+
+if __name__ == '__main__':
+    main()
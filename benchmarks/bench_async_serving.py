@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Flask (threaded WSGI) vs mode ASGI untuk /api/weather
+
+Menjalankan stub OpenWeather dengan latency tetap, lalu masing-masing server
+sebagai proses terpisah (Werkzeug threaded dan uvicorn asgi_app), dan
+mengirim N request /api/weather dengan koordinat unik (selalu cache miss)
+pada konkurensi C. Dilaporkan throughput, latency p50/p95 dan jumlah gagal.
+
+Butuh requirements-async.txt. Jalankan dari root repo:
+    python benchmarks/bench_async_serving.py [requests] [concurrency] [upstream_delay_s]
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.error import URLError
+from urllib.request import urlopen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aiohttp  # noqa: E402
+
+from openweather_stub import StubServer  # noqa: E402
+
+FLASK_CMD = ('import web_app_enhanced as m; from werkzeug.serving import run_simple; '
+             'run_simple("127.0.0.1", {port}, m.app, threaded=True)')
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(name: str, port: int, env: dict) -> subprocess.Popen:
+    if name == 'flask':
+        cmd = [sys.executable, '-c', FLASK_CMD.format(port=port)]
+    else:
+        cmd = [sys.executable, '-m', 'uvicorn', 'asgi_app:app', '--port', str(port),
+               '--log-level', 'warning', '--no-access-log']
+    process = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1).close()
+            return process
+        except (URLError, OSError):
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{name} server did not start')
+
+
+async def load(base: str, count: int, concurrency: int, offset: int):
+    """Fire `count` weather requests, `concurrency` at a time; returns latencies and failures"""
+    latencies = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60)) as client:
+        async def one(i):
+            nonlocal failures
+            # Unique 0.01° grid cell per request: every request misses the cache
+            lat = -10 + ((offset + i) % 1500) / 100
+            lon = 95 + ((offset + i) // 1500) / 100
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    async with client.get(f'{base}/api/weather?lat={lat:.2f}&lon={lon:.2f}') as response:
+                        data = await response.json()
+                    ok = response.status == 200 and data.get('success') and not data.get('partial')
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                if not ok:
+                    failures += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(count)))
+        return time.perf_counter() - start, sorted(latencies), failures
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.3
+
+    with StubServer(delay=delay) as stub:
+        env = dict(os.environ, OPENWEATHER_API_KEY='stub-key', OPENWEATHER_BASE_URL=stub.url,
+                   UPSTREAM_ASYNC_CONNECTIONS=os.getenv('UPSTREAM_ASYNC_CONNECTIONS', '1000'))
+        print(f'{count} requests, concurrency {concurrency}, upstream delay {delay}s per call')
+        print(f"{'server':<8} {'total s':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'failed':>7}")
+        for offset, name in enumerate(('flask', 'asgi')):
+            port = free_port()
+            process = start_server(name, port, env)
+            try:
+                elapsed, latencies, failures = asyncio.run(
+                    load(f'http://127.0.0.1:{port}', count, concurrency, offset * count))
+            finally:
+                process.terminate()
+                process.wait()
+            print(f'{name:<8} {elapsed:8.2f} {count / elapsed:8.0f} {percentile(latencies, 0.5) * 1000:8.0f} '
+                  f'{percentile(latencies, 0.95) * 1000:8.0f} {failures:>7}')
+
+
+if __name__ == '__main__':
+    main()
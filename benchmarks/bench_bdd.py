@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: analisis skenario dengan BDD untuk formula besar
+
+Untuk tiap keluarga formula diukur compile, hitung model, satu contoh
+skenario (sat) dan restriksi dengan 10 variabel diketahui. Pada ukuran kecil
+hasil hitung model dicocokkan dengan tabel kebenaran bit-parallel; pada 60
+variabel (2^60 baris) tabel kebenaran tidak mungkin dibangun.
+
+Jalankan dari root repo:
+    python benchmarks/bench_bdd.py [variables]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bdd import BDD  # noqa: E402
+from logic_engine import build_truth_table, parse, variables_of  # noqa: E402
+
+# Sizes cross-checked against the truth table
+CHECK_VARIABLES = 18
+
+
+def hazards(count: int) -> str:
+    """Flood or earthquake risk in any of count/6 regions"""
+    groups = [f'(p{i} & (q{i} | r{i})) | (e{i} & (b{i} | l{i}))' for i in range(count // 6)]
+    return ' | '.join(groups)
+
+
+def parity(count: int) -> str:
+    """Odd number of TRUE inputs"""
+    return ' ^ '.join(f'v{i}' for i in range(count))
+
+
+def window(count: int) -> str:
+    """Overlapping 3-variable clauses along a chain"""
+    return ' & '.join(f'(v{i} | v{i + 1} | ~v{i + 2})' for i in range(count - 2))
+
+
+FAMILIES = {'hazards': hazards, 'parity': parity, 'window': window}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, (time.perf_counter() - start) * 1000
+
+
+def check(name: str, formula: str):
+    bdd = BDD()
+    node = bdd.compile(formula)
+    table = build_truth_table(variables_of(parse(formula)), [('result', formula)])
+    assert bdd.count(node) == table.count(), name
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+
+    for name, family in FAMILIES.items():
+        check(name, family(CHECK_VARIABLES))
+    print(f'model counts match the truth table at {CHECK_VARIABLES} variables')
+
+    print(f"{'formula':<8} {'vars':>4} {'nodes':>6} {'compile ms':>11} {'count ms':>9} {'sat ms':>7} "
+          f"{'restrict ms':>12} {'models':>22}")
+    for name, family in FAMILIES.items():
+        formula = family(count)
+        bdd = BDD()
+        node, compile_ms = timed(bdd.compile, formula)
+        models, count_ms = timed(bdd.count, node)
+        example, sat_ms = timed(bdd.sat, node)
+        assert bdd.evaluate(node, {**dict.fromkeys(bdd.variables, False), **example})
+
+        known = {v: i % 2 == 0 for i, v in enumerate(bdd.variables[:10])}
+        free = bdd.variables[10:]
+        start = time.perf_counter()
+        restricted = bdd.restrict(node, known)
+        bdd.count(restricted, over=free)
+        restrict_ms = (time.perf_counter() - start) * 1000
+
+        print(f'{name:<8} {len(bdd.variables):>4} {bdd.size(node):>6} {compile_ms:11.2f} {count_ms:9.2f} '
+              f'{sat_ms:7.3f} {restrict_ms:12.2f} {models:>22}')
+
+
+if __name__ == '__main__':
+    main()
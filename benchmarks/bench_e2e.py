@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark End-to-End: semua route web_app dan web_app_enhanced
+
+Menjalankan stub OpenWeather (/weather, /forecast, /geo/1.0/direct) dengan
+latency dan error yang bisa diatur, lalu tiap aplikasi sebagai proses
+terpisah (Werkzeug threaded, seperti `python web_app*.py`). Setiap route
+dibebani N request pada beberapa tingkat konkurensi tetap (satu koneksi
+http.client per thread, dipakai ulang bila server mendukung keep-alive).
+Hasilnya throughput dan latency p50/p95/p99 per route per konkurensi,
+ditulis sebagai JSON agar dua run bisa dibandingkan:
+
+    python benchmarks/bench_e2e.py --output before.json
+    (ubah kode)
+    python benchmarks/bench_e2e.py --output after.json --compare before.json
+
+Route yang tidak punya skenario di ROUTES dicatat di "uncovered" pada laporan.
+Jalankan dari root repo; `python benchmarks/bench_e2e.py --help` untuk opsi.
+"""
+
+import argparse
+import http.client
+import importlib
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.error import URLError
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from openweather_stub import StubServer  # noqa: E402
+
+SERVER_CMD = ('import {module} as m; from werkzeug.serving import run_simple; '
+              'run_simple("127.0.0.1", {port}, m.app, threaded=True)')
+
+
+class Route(NamedTuple):
+    """
+    One load scenario
+
+    path may use {n} (unique per request), {lat} and {lon} (a 0.01° grid
+    cell unique per request, so weather requests always miss the cache).
+    """
+    name: str
+    method: str
+    path: str
+    body: Optional[Dict] = None
+    headers: Optional[Dict[str, str]] = None
+
+    def render(self, n: int) -> Tuple[str, Optional[bytes], Dict[str, str]]:
+        path = self.path.format(n=n, lat=f'{-10 + (n % 1500) / 100:.2f}', lon=f'{95 + (n // 1500) / 100:.2f}')
+        headers = dict(self.headers or {})
+        body = None
+        if self.body is not None:
+            body = json.dumps(self.body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        return path, body, headers
+
+
+BROWSER = {'Accept-Encoding': 'gzip, deflate, br'}
+COMBINED_COLUMNS = {v: [(i >> k) & 1 == 1 for i in range(512)] for k, v in enumerate('pqrebl')}
+
+ROUTES: Dict[str, Tuple[Route, ...]] = {
+    'web_app': (
+        Route('index', 'GET', '/', headers=BROWSER),
+        Route('enhanced page', 'GET', '/enhanced', headers=BROWSER),
+        Route('calculate', 'POST', '/api/calculate', {'p': True, 'q': False, 'r': True}),
+        Route('truth-table', 'GET', '/api/truth-table'),
+        Route('articles', 'GET', '/api/articles'),
+        Route('articles search', 'GET', '/api/articles?q=banjir&limit=5'),
+        Route('health', 'GET', '/api/health'),
+        Route('metrics', 'GET', '/metrics'),
+        Route('static', 'GET', '/static/images/manifest.json'),
+    ),
+    'web_app_enhanced': (
+        Route('index', 'GET', '/', headers=BROWSER),
+        Route('rules', 'GET', '/api/rules'),
+        Route('rules reload', 'POST', '/api/rules/reload'),
+        Route('calculate-flood', 'POST', '/api/calculate-flood', {'p': True, 'q': False, 'r': True}),
+        Route('calculate-earthquake', 'POST', '/api/calculate-earthquake', {'e': True, 'b': True, 'l': False}),
+        Route('calculate-combined', 'POST', '/api/calculate-combined',
+              {'p': True, 'q': True, 'r': False, 'e': True, 'b': False, 'l': True}),
+        Route('calculate-batch', 'POST', '/api/calculate-batch', {'hazard': 'combined', 'columns': COMBINED_COLUMNS}),
+        Route('truth-table flood', 'GET', '/api/truth-table/flood'),
+        Route('truth-table earthquake', 'GET', '/api/truth-table/earthquake'),
+        Route('truth-table custom', 'GET', '/api/truth-table/custom?formula=p%26(q|r)%26~s'),
+        Route('truth-table landslide', 'GET', '/api/truth-table/landslide'),
+        Route('minimize', 'GET', '/api/minimize?formula=(p%26q)|(p%26r)|(q%26r%26~p)'),
+        Route('mitigation', 'GET', '/api/mitigation/flood?p=1&q=1&r=1'),
+        Route('analyze', 'GET', '/api/analyze/flood?p=1'),
+        Route('weather cached', 'GET', '/api/weather?lat=5.55&lon=95.32&q=1'),
+        Route('weather miss', 'GET', '/api/weather?lat={lat}&lon={lon}'),
+        Route('weather cache-stats', 'GET', '/api/weather/cache-stats'),
+        Route('search local', 'GET', '/api/weather/search?city=Banda%20Aceh'),
+        Route('search remote', 'GET', '/api/weather/search?city=Kota{n}'),
+        Route('scan flood', 'POST', '/api/scan/flood', {'regions': ['Banda Aceh', 'Sabang', 'Langsa']}),
+        Route('health', 'GET', '/api/health'),
+        Route('metrics', 'GET', '/metrics'),
+        Route('static', 'GET', '/static/images/manifest.json'),
+    ),
+}
+
+# Request numbers for {n}/{lat}/{lon}, unique across the whole run
+_sequence = itertools.count()
+_sequence_lock = threading.Lock()
+
+
+def next_number() -> int:
+    with _sequence_lock:
+        return next(_sequence)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def uncovered_endpoints(module_name: str, routes: Tuple[Route, ...]) -> List[str]:
+    """Endpoints of the app that no scenario reaches"""
+    app = importlib.import_module(module_name).app
+    adapter = app.url_map.bind('127.0.0.1')
+    reached = {adapter.match(urlsplit(route.render(0)[0]).path, method=route.method)[0] for route in routes}
+    return sorted({rule.endpoint for rule in app.url_map.iter_rules()} - reached)
+
+
+def start_app(module: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, '-c', SERVER_CMD.format(module=module, port=port)],
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{module} exited with code {process.returncode}')
+        try:
+            urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1).close()
+            return process
+        except (URLError, OSError):
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{module} did not start')
+
+
+def run_load(port: int, route: Route, count: int, concurrency: int) -> Dict:
+    """Send `count` requests for `route` from `concurrency` client threads"""
+    tickets = iter(range(count))
+    lock = threading.Lock()
+    samples: List[Tuple[float, Optional[int]]] = []
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        local = []
+        while True:
+            with lock:
+                if next(tickets, None) is None:
+                    break
+            path, body, headers = route.render(next_number())
+            start = time.perf_counter()
+            try:
+                connection.request(route.method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                status = None
+            local.append((time.perf_counter() - start, status))
+        connection.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in samples)
+    statuses = Counter('error' if status is None else str(status) for _, status in samples)
+    return {
+        'concurrency': concurrency,
+        'requests': len(samples),
+        'errors': sum(n for status, n in statuses.items() if status == 'error' or int(status) >= 400),
+        'status': dict(sorted(statuses.items())),
+        'elapsed_s': round(elapsed, 4),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies) * 1000, 3),
+            'p50': round(percentile(latencies, 0.50) * 1000, 3),
+            'p95': round(percentile(latencies, 0.95) * 1000, 3),
+            'p99': round(percentile(latencies, 0.99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3),
+        },
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                           capture_output=True, text=True).stdout.strip()
+    return result.stdout.strip() + ('-dirty' if dirty else '')
+
+
+def compare(report: Dict, baseline: Dict):
+    """Print throughput and p50/p99 changes against an earlier report"""
+    print(f"\nvs {baseline['meta'].get('git') or 'baseline'} ({baseline['meta']['started']})")
+    print(f"{'app':<17} {'route':<23} {'c':>3} {'req/s':>8} {'p50':>8} {'p99':>8}")
+    for app, result in report['apps'].items():
+        old_routes = baseline['apps'].get(app, {}).get('routes', {})
+        for name, route in result['routes'].items():
+            old_runs = {run['concurrency']: run for run in old_routes.get(name, {}).get('runs', ())}
+            for run in route['runs']:
+                old = old_runs.get(run['concurrency'])
+                if old is None:
+                    continue
+                changes = [run['throughput_rps'] / old['throughput_rps'] - 1] + [
+                    run['latency_ms'][p] / old['latency_ms'][p] - 1 for p in ('p50', 'p99')]
+                print(f"{app:<17} {name:<23} {run['concurrency']:>3} " + ' '.join(f'{c:+8.1%}' for c in changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end load benchmark of both apps against the OpenWeather stub')
+    parser.add_argument('--apps', default=','.join(ROUTES), help='Comma-separated app modules')
+    parser.add_argument('--routes', default='', help='Only scenarios whose name contains one of these (comma-separated)')
+    parser.add_argument('--concurrency', default='1,8,32', help='Comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per route per concurrency level')
+    parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per route first')
+    parser.add_argument('--delay', type=float, default=0.1, help='Stub latency for every endpoint (s)')
+    parser.add_argument('--weather-delay', type=float, help='Stub latency for /data/2.5/weather (s)')
+    parser.add_argument('--forecast-delay', type=float, help='Stub latency for /data/2.5/forecast (s)')
+    parser.add_argument('--geo-delay', type=float, help='Stub latency for /geo/1.0/direct (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of stub 503 responses')
+    parser.add_argument('--output', default='e2e-report.json', help='JSON report path')
+    parser.add_argument('--compare', help='Earlier JSON report to compare against')
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(',')]
+    filters = [f.strip().lower() for f in args.routes.split(',') if f.strip()]
+    delays = {name: value for name, value in (
+        ('weather', args.weather_delay), ('forecast', args.forecast_delay), ('geo', args.geo_delay)
+    ) if value is not None}
+
+    report = {
+        'meta': {
+            'started': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'config': {'requests': args.requests, 'warmup': args.warmup, 'concurrency': levels,
+                       'stub': {'delay': args.delay, 'delays': delays, 'error_rate': args.error_rate}},
+        },
+        'apps': {},
+    }
+
+    print(f"{'app':<17} {'route':<23} {'c':>3} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err':>4}")
+    with StubServer(delay=args.delay, error_rate=args.error_rate, delays=delays) as stub:
+        env = dict(os.environ, OPENWEATHER_API_KEY='stub-key', OPENWEATHER_BASE_URL=stub.url)
+        for module in args.apps.split(','):
+            routes = tuple(r for r in ROUTES[module] if not filters or any(f in r.name for f in filters))
+            port = free_port()
+            process = start_app(module, port, env)
+            result = {'routes': {}, 'uncovered': uncovered_endpoints(module, ROUTES[module])}
+            try:
+                for route in routes:
+                    if args.warmup:
+                        run_load(port, route, args.warmup, 1)
+                    runs = []
+                    for concurrency in levels:
+                        run = run_load(port, route, args.requests, concurrency)
+                        runs.append(run)
+                        latency = run['latency_ms']
+                        print(f"{module:<17} {route.name:<23} {concurrency:>3} {run['throughput_rps']:8.0f} "
+                              f"{latency['p50']:8.2f} {latency['p95']:8.2f} {latency['p99']:8.2f} {run['errors']:>4}")
+                    result['routes'][route.name] = {'method': route.method, 'path': route.path, 'runs': runs}
+            finally:
+                process.terminate()
+                process.wait()
+            report['apps'][module] = result
+            if result['uncovered']:
+                print(f"{module}: no scenario for {', '.join(result['uncovered'])}")
+        report['meta']['stub_hits'] = dict(stub.state.hits)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f'report: {args.output}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
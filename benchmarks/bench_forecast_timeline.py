@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: biaya timeline risiko prakiraan per kota
+
+Mengukur build_timeline (satu lintasan atas 40 slot: kartu harian, kolom
+slot, agregat harian) dan evaluate_timeline (formula banjir bit-parallel
+untuk semua slot) pada dokumen /forecast dari stub.
+
+Jalankan dari root repo:
+    python benchmarks/bench_forecast_timeline.py [cities]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from forecast_timeline import build_timeline, evaluate_timeline  # noqa: E402
+from openweather_stub import forecast_payload  # noqa: E402
+
+FLOOD_VARIABLES = ('p', 'q', 'r')
+FLOOD_STEPS = (('q_or_r', 'q | r'), ('result', 'p & q_or_r'))
+
+
+def main():
+    cities = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    documents = [forecast_payload(-10 + i / 100, 95 + i / 100) for i in range(cities)]
+
+    start = time.perf_counter()
+    timelines = [build_timeline(doc, threshold=3)[1] for doc in documents]
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, timeline in enumerate(timelines):
+        evaluate_timeline(timeline, FLOOD_VARIABLES, FLOOD_STEPS, {'q': bool(i % 2), 'r': None})
+    evaluated = time.perf_counter() - start
+
+    total = built + evaluated
+    print(f'{cities} cities x {len(timelines[0]["slots"]["p"])} slots')
+    print(f'build_timeline    {built / cities * 1e6:8.0f} us/city')
+    print(f'evaluate_timeline {evaluated / cities * 1e6:8.0f} us/city')
+    print(f'total             {total / cities * 1e6:8.0f} us/city  ({cities / total * 60:,.0f} cities/minute)')
+
+
+if __name__ == '__main__':
+    main()
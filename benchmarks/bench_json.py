@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: encoder JSON Flask bawaan vs FastJSONProvider
+
+Untuk tiga respons web_app_enhanced, dengan isi yang sama seperti yang
+dikirim route-nya:
+- /api/calculate-combined (satu kombinasi 9 variabel, lengkap dengan blok
+  rekomendasi; di app dipakai saat membangun tabel respons)
+- /api/truth-table/flood (tabel lengkap)
+- /api/weather (entry cache dari dokumen stub OpenWeatherMap + timeline)
+diukur µs per encode untuk: provider bawaan Flask, FastJSONProvider dengan
+json standar, dengan orjson (bila terpasang), dan dengan bagian bersama
+sebagai Fragment pra-encode. Di bawahnya latency p50 request lewat test
+client WSGI untuk tiap backend.
+
+Jalankan dari root repo:
+    python benchmarks/bench_json.py [repeat]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Any key: the weather entry below is put in the cache, nothing is fetched
+os.environ.setdefault('OPENWEATHER_API_KEY', 'bench')
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import web_app_enhanced as core  # noqa: E402
+from fastjson import FastJSONProvider, orjson  # noqa: E402
+from openweather_stub import current_payload, forecast_payload  # noqa: E402
+
+LAT, LON = 5.5483, 95.3238
+
+
+def warm_weather_cache():
+    """Put one stub-built weather entry in the cache, as a first request would"""
+    key = core.weather_cache_key(LAT, LON)
+    fetched = {'current': current_payload(LAT, LON), 'forecast': forecast_payload(LAT, LON)}
+    core.WEATHER_CACHE.get_or_load(key, lambda: core.assemble_weather_result(key[0], key[1], fetched, {}),
+                                   cacheable=core.is_cacheable_weather)
+
+
+def payloads():
+    """(label, plain payload, payload with shared parts as fragments)"""
+    combined = core.build_combined_payload(*(i % 3 != 1 for i in range(len(core.HAZARDS.variables))))
+    table = core.generate_hazard_truth_table('flood')
+    weather = core.get_weather_data(lat=LAT, lon=LON, q=True, r=None)
+    with core.app.app_context():
+        return (
+            ('calculate-combined', combined, None),
+            ('truth-table/flood', {'success': True, 'table': list(table.rows())},
+             {'success': True, 'table': core.SHARED_FRAGMENTS.get(table, lambda t: list(t.rows()))}),
+            ('weather', weather, core.weather_json(weather)),
+        )
+
+
+def per_call_us(function, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1e6
+
+
+def request_p50_ms(client, method: str, url: str, count: int, **kwargs) -> float:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        client.open(url, method=method, **kwargs).get_data()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1000
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    warm_weather_cache()
+
+    flask_default = DefaultJSONProvider(core.app)
+    stdlib = FastJSONProvider(core.app)
+    stdlib.backend = 'json'
+    providers = [('flask default', flask_default, False), ('fast json', stdlib, False),
+                 ('fast json+frag', stdlib, True)]
+    if orjson is not None:
+        fast = FastJSONProvider(core.app)
+        providers += [('fast orjson', fast, False), ('fast orjson+frag', fast, True)]
+
+    print(f"encode, best of 5 x {repeat} (backend in use: {core.app.json.backend})")
+    print(f"{'payload':<20} {'encoder':<17} {'bytes':>7} {'us/call':>9}")
+    with core.app.app_context():
+        for label, plain, shared in payloads():
+            for name, provider, fragments in providers:
+                if fragments and shared is None:
+                    continue
+                payload = shared if fragments else plain
+                size = len(provider.response(payload).get_data())
+                print(f'{label:<20} {name:<17} {size:>7} {per_call_us(lambda: provider.response(payload), repeat):9.1f}')
+
+    requests = (
+        ('calculate-combined', 'POST', '/api/calculate-combined', {'json': {'p': True, 'q': False, 'r': True}}),
+        ('truth-table/flood', 'GET', '/api/truth-table/flood', {}),
+        ('weather', 'GET', f'/api/weather?lat={LAT}&lon={LON}&q=1', {}),
+    )
+    backends = ['json'] + (['orjson'] if orjson is not None else [])
+    client = core.app.test_client()
+    print(f"\nrequest p50 ms over {repeat} requests (test client)")
+    print(f"{'endpoint':<20} " + ' '.join(f'{b:>8}' for b in backends))
+    for label, method, url, kwargs in requests:
+        row = []
+        for backend in backends:
+            core.app.json.backend = backend
+            row.append(request_p50_ms(client, method, url, repeat, **kwargs))
+        print(f'{label:<20} ' + ' '.join(f'{ms:8.3f}' for ms in row))
+
+
+if __name__ == '__main__':
+    main()
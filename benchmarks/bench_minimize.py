@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: evaluasi aturan sebelum dan sesudah minimisasi
+
+Aturan yang ditulis panjang (bentuk kanonik dari tabel kebenaran, suku
+redundan) diminimisasi, dicek ekuivalen lewat tabel kebenaran, lalu
+dibandingkan jumlah gerbang dan kecepatan evaluasi evaluator terkompilasi
+('bool' per skenario dan 'bits' untuk seluruh tabel).
+
+Jalankan dari root repo:
+    python benchmarks/bench_minimize.py [rounds]
+"""
+
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic_engine import build_truth_table, compile_program  # noqa: E402
+from minimize import minimize, sop_formula  # noqa: E402
+
+
+def canonical(formula: str, variables: tuple) -> str:
+    """The rule as an operator would copy it from a truth table: one term per TRUE row"""
+    column = build_truth_table(variables, [('result', formula)]).columns['result']
+    return sop_formula([(m, 0) for m in range(1 << len(variables)) if column >> m & 1], variables)
+
+
+RULES = {
+    'flood (canonical)': canonical('p & (q | r)', ('p', 'q', 'r')),
+    'combined (canonical)': canonical('p & (q | r) | e & (b | l)', ('p', 'q', 'r', 'e', 'b', 'l')),
+    'redundant terms': 'p & q & r | p & q & ~r | p & ~q & r | p & r & (q | ~q) | q & r & p',
+    'landslide (8 vars)': canonical('(h & s) & (v | ~g) | (h & w & ~g) | (e & s & u)',
+                                    ('h', 's', 'v', 'g', 'w', 'e', 'u', 'x')),
+}
+
+
+def per_call_ns(formula: str, variables: tuple, rounds: int) -> float:
+    evaluate = compile_program(variables, [('result', formula)]).evaluate
+    rows = list(itertools.product((False, True), repeat=len(variables)))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for row in rows:
+            evaluate(*row)
+    return (time.perf_counter() - start) / (rounds * len(rows)) * 1e9
+
+
+def table_ms(formula: str, variables: tuple, rounds: int) -> float:
+    build_truth_table(variables, [('result', formula)])  # compile outside the timing
+    start = time.perf_counter()
+    for _ in range(rounds):
+        build_truth_table(variables, [('result', formula)])
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"{'rule':<22} {'vars':>4} {'gates':>12} {'minimize ms':>12} {'cached µs':>10} "
+          f"{'bool ns/call':>14} {'bits table µs':>16}")
+    for name, formula in RULES.items():
+        start = time.perf_counter()
+        rule = minimize(formula)
+        cold_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        minimize(formula)
+        cached_us = (time.perf_counter() - start) * 1e6
+
+        variables = rule.variables
+        before = build_truth_table(variables, [('result', formula)]).columns['result']
+        after = build_truth_table(variables, [('result', rule.minimized)]).columns['result']
+        assert before == after, name
+
+        slow, fast = (per_call_ns(f, variables, rounds) for f in (formula, rule.minimized))
+        slow_table, fast_table = (table_ms(f, variables, rounds) * 1000 for f in (formula, rule.minimized))
+        print(f'{name:<22} {len(variables):>4} {rule.gates_before:>5} -> {rule.gates_after:<4} {cold_ms:12.2f} '
+              f'{cached_us:10.1f} {slow:6.0f} -> {fast:<5.0f} {slow_table:7.0f} -> {fast_table:<6.0f}')
+        print(f'{"":<22} {rule.minimized}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: solver mitigasi biaya minimum (tabel pra-hitung vs pencarian BDD)
+
+Formula kecil (banjir, gabungan 6 variabel) dilayani dari tabel yang
+diindeks bitmask; formula besar (wilayah x banjir/gempa, 60 variabel)
+dicari sebagai lintasan biaya minimum pada BDD. Pada ukuran tabel, kedua
+cara dicek memberi biaya yang sama untuk setiap kombinasi input.
+
+Jalankan dari root repo:
+    python benchmarks/bench_mitigation.py [variables]
+"""
+
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mitigation import MitigationSearch, MitigationSolver, MitigationTable  # noqa: E402
+
+FLOOD = (('p', 'q', 'r'), (('q_or_r', 'q | r'), ('result', 'p & q_or_r')), {'q': 5, 'r': 3})
+COMBINED = (('p', 'q', 'r', 'e', 'b', 'l'),
+            (('result', 'p & (q | r) | e & (b | l)'),),
+            {'q': 5, 'r': 3, 'b': 4, 'l': 6})
+
+
+def regions(count: int):
+    """Flood or earthquake risk in any of count/6 regions; q, r, b, l controllable"""
+    groups = count // 6
+    variables = tuple(f'{v}{i}' for i in range(groups) for v in 'pqrebl')
+    formula = ' | '.join(f'(p{i} & (q{i} | r{i})) | (e{i} & (b{i} | l{i}))' for i in range(groups))
+    costs = {f'{v}{i}': 1 + (i + k) % 5 for i in range(groups) for k, v in enumerate('qrbl')}
+    return variables, (('result', formula),), costs
+
+
+def per_lookup_us(solver, assignments) -> float:
+    start = time.perf_counter()
+    for assignment in assignments:
+        solver.solve(assignment)
+    return (time.perf_counter() - start) / len(assignments) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    rng = random.Random(7)
+
+    for variables, steps, costs in (FLOOD, COMBINED):
+        table, search = MitigationTable(variables, steps, costs), MitigationSearch(variables, steps, costs)
+        for row in itertools.product((False, True), repeat=len(variables)):
+            assignment = dict(zip(variables, row))
+            expected, found = table.lookup(assignment), search.lookup(assignment)
+            assert expected[0] == found[0] and (expected[1] or (None,))[0] == (found[1] or (None,))[0]
+    print('table and search agree on every input of the flood and combined formulas')
+
+    print(f"{'formula':<10} {'vars':>4} {'method':>7} {'build ms':>9} {'µs/lookup':>10}")
+    for name, (variables, steps, costs) in (('flood', FLOOD), ('combined', COMBINED),
+                                            ('regions', regions(count))):
+        start = time.perf_counter()
+        solver = MitigationSolver(variables, steps, costs)
+        build_ms = (time.perf_counter() - start) * 1000
+        assignments = [{v: rng.random() < 0.6 for v in variables} for _ in range(200)]
+        print(f'{name:<10} {len(variables):>4} {solver.method:>7} {build_ms:9.2f} '
+              f'{per_lookup_us(solver, assignments):10.1f}')
+
+    variables, steps, costs = regions(count)
+    example = MitigationSolver(variables, steps, costs).solve({v: True for v in variables})
+    print(f"all {len(variables)} inputs TRUE: {len(example['changes'])} changes, cost {example['cost']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: halaman utama dirender per request vs pra-render + pra-kompresi
+
+"before" merender index_enhanced.html lewat Jinja di setiap request tanpa
+kompresi (seperti index() sebelumnya); "after" adalah route / dari
+web_app_enhanced (varian gzip/brotli, ETag, Cache-Control). Diukur lewat
+test client WSGI (tanpa jaringan): byte yang dikirim per request dan
+latency p50/p99 handler, untuk browser (gzip, br), klien gzip saja, dan
+revalidasi dengan If-None-Match.
+
+Jalankan dari root repo:
+    python benchmarks/bench_pages.py [requests]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask, render_template  # noqa: E402
+
+import web_app_enhanced as core  # noqa: E402
+
+SCENARIOS = (
+    ('browser', {'Accept-Encoding': 'gzip, deflate, br'}),
+    ('gzip only', {'Accept-Encoding': 'gzip'}),
+    ('no encoding', {}),
+)
+
+
+def before_app() -> Flask:
+    app = Flask('before', template_folder=os.path.join(ROOT, 'templates'))
+
+    @app.route('/')
+    def index():
+        return render_template('index_enhanced.html')
+
+    return app
+
+
+def wire_bytes(response) -> int:
+    head = sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+    return head + len(response.get_data())
+
+
+def measure(client, headers, count):
+    latencies = []
+    size = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        response = client.get('/', headers=headers)
+        size = wire_bytes(response)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return size, latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * 0.99)] * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    clients = {'before': before_app().test_client(), 'after': core.app.test_client()}
+    encodings = ', '.join(core.INDEX_PAGE.variants)
+    print(f'{count} requests per row; variants: {encodings}')
+    print(f"{'client':<12} {'mode':<7} {'bytes':>8} {'p50 ms':>8} {'p99 ms':>8}")
+
+    for label, headers in SCENARIOS:
+        for mode, client in clients.items():
+            size, p50, p99 = measure(client, headers, count)
+            print(f'{label:<12} {mode:<7} {size:>8} {p50:8.3f} {p99:8.3f}')
+
+    etag = clients['after'].get('/', headers=SCENARIOS[0][1]).headers['ETag']
+    size, p50, p99 = measure(clients['after'], dict(SCENARIOS[0][1], **{'If-None-Match': etag}), count)
+    print(f"{'revalidate':<12} {'after':<7} {size:>8} {p50:8.3f} {p99:8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: per-row truth table loop vs bit-parallel generator
+
+Jalankan dari root repo:
+    python benchmarks/bench_truth_table.py [max_variables]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic_engine import build_truth_table, compile_program  # noqa: E402
+
+# Per-row loop is only timed up to this size (it grows ~1 µs/row)
+PER_ROW_MAX_VARIABLES = 18
+
+
+def make_formula(count: int) -> tuple:
+    """Flood-style formula over `count` variables: v0 ∧ (v1 ∨ ... ∨ v(n-1))"""
+    variables = tuple(f'v{i}' for i in range(count))
+    steps = (
+        ('any_factor', ' | '.join(variables[1:])),
+        ('result', f'{variables[0]} & any_factor'),
+    )
+    return variables, steps
+
+
+def per_row_table(variables: tuple, steps: tuple) -> list:
+    """The original approach: one dict per row, one call per row"""
+    evaluate = compile_program(variables, steps).evaluate
+    count = len(variables)
+    table = []
+    for i in range(1 << count):
+        values = [bool(i & (1 << (count - 1 - k))) for k in range(count)]
+        any_factor, result = evaluate(*values)
+        row = dict(zip(variables, values))
+        row['any_factor'] = any_factor
+        row['result'] = result
+        table.append(row)
+    return table
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main():
+    max_variables = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+
+    print(f"{'vars':>4} {'rows':>10} {'per-row ms':>12} {'bitset ms':>10} {'count':>10} {'first 1k rows ms':>17}")
+    for count in range(4, max_variables + 1, 2):
+        variables, steps = make_formula(count)
+
+        table, bitset_ms = timed(build_truth_table, variables, steps)
+        _, page_ms = timed(lambda: list(table.rows(0, 1000)))
+
+        if count <= PER_ROW_MAX_VARIABLES:
+            rows, loop_ms = timed(per_row_table, variables, steps)
+            assert rows[:1000] == list(table.rows(0, 1000))
+            assert sum(r['result'] for r in rows) == table.count()
+            loop = f'{loop_ms:12.1f}'
+        else:
+            loop = f"{'-':>12}"
+
+        print(f'{count:>4} {1 << count:>10} {loop} {bitset_ms:10.2f} {table.count():>10} {page_ms:17.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: bare requests.get vs pooled upstream session
+
+Mengirim N request ke stub lokal (sekuensial dan dengan beberapa thread),
+lalu membandingkan waktu total dan jumlah koneksi TCP yang dibuka stub.
+Terhadap OpenWeatherMap asli selisihnya lebih besar karena setiap koneksi
+baru juga membayar handshake TLS.
+
+Jalankan dari root repo:
+    python benchmarks/bench_upstream_pool.py [requests] [threads]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests  # noqa: E402
+
+from openweather_stub import StubServer  # noqa: E402
+from upstream import upstream_get  # noqa: E402
+
+
+def bare_get(url):
+    return requests.get(url, timeout=5).json()
+
+
+def pooled_get(url):
+    return upstream_get('weather', url).json()
+
+
+def measure(stub, fn, url, count, threads):
+    stub.state.reset()
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(count):
+            fn(url)
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(fn, [url] * count))
+    elapsed = time.perf_counter() - start
+    return elapsed, stub.state.connections
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with StubServer() as stub:
+        url = f'{stub.url}/data/2.5/weather?lat=5.55&lon=95.32&appid=stub'
+        print(f"{'mode':<10} {'threads':>7} {'requests':>8} {'total s':>8} {'req/s':>8} {'connections':>11}")
+        for n_threads in (1, threads):
+            for name, fn in (('bare', bare_get), ('pooled', pooled_get)):
+                elapsed, connections = measure(stub, fn, url, count, n_threads)
+                print(f'{name:<10} {n_threads:>7} {count:>8} {elapsed:8.2f} {count / elapsed:8.0f} {connections:>11}')
+
+
+if __name__ == '__main__':
+    main()
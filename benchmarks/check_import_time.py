@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verifikasi: anggaran waktu import (cold start) web_app_enhanced
+
+Membangun data pra-hitung ke folder sementara (seperti saat deploy), lalu
+menjalankan `python -X importtime -c "import web_app_enhanced"` beberapa
+kali di proses baru. Gagal bila:
+- modul yang hanya dibutuhkan upstream/ASGI (requests, urllib3, asyncio,
+  dotenv, aiohttp) ikut ter-import saat startup,
+- waktu import total melebihi anggaran, atau
+- waktu modul milik repo sendiri (tanpa Flask dkk.) melebihi anggaran.
+
+Jalankan dari root repo:
+    python benchmarks/check_import_time.py [runs]
+
+Anggaran (ms) bisa diubah lewat IMPORT_BUDGET_MS dan APP_IMPORT_BUDGET_MS.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Whole import of web_app_enhanced (Flask included), and the repo's own modules
+IMPORT_BUDGET_MS = float(os.getenv('IMPORT_BUDGET_MS', '300'))
+APP_IMPORT_BUDGET_MS = float(os.getenv('APP_IMPORT_BUDGET_MS', '40'))
+
+# Only needed once an upstream call is made, or by the ASGI mode
+LAZY_MODULES = ('requests', 'urllib3', 'asyncio', 'dotenv', 'aiohttp')
+
+REPO_MODULES = {name[:-3] for name in os.listdir(ROOT) if name.endswith('.py')}
+
+
+def import_times(env: Dict[str, str]) -> Dict[str, Tuple[int, int]]:
+    """{module: (self µs, cumulative µs)} of one fresh `import web_app_enhanced`"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import web_app_enhanced'],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failures = []
+
+    with tempfile.TemporaryDirectory() as folder:
+        env = dict(os.environ, PRECOMPUTED_FILE=os.path.join(folder, 'precomputed.pickle'),
+                   RULES_RELOAD_INTERVAL='0')
+        subprocess.run([sys.executable, 'build_precomputed.py'], cwd=ROOT, env=env, check=True)
+
+        # Best of several runs: the budget is about our code, not machine noise
+        samples = [import_times(env) for _ in range(runs)]
+
+    best = min(samples, key=lambda times: times['web_app_enhanced'][1])
+    total_ms = best['web_app_enhanced'][1] / 1000
+    app_ms = min(sum(own for name, (own, _) in times.items() if name in REPO_MODULES)
+                 for times in samples) / 1000
+    print(f'import web_app_enhanced: {total_ms:.1f} ms (budget {IMPORT_BUDGET_MS:.0f}), '
+          f'repo modules {app_ms:.1f} ms (budget {APP_IMPORT_BUDGET_MS:.0f}), best of {runs}')
+    for name, (own, cumulative) in sorted(best.items(), key=lambda item: -item[1][0])[:10]:
+        print(f'  {name:<40} self {own / 1000:7.1f} ms  cumulative {cumulative / 1000:7.1f} ms')
+
+    eager = [name for name in LAZY_MODULES if name in best]
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    if total_ms > IMPORT_BUDGET_MS:
+        failures.append(f'import took {total_ms:.1f} ms')
+    if app_ms > APP_IMPORT_BUDGET_MS:
+        failures.append(f'repo modules took {app_ms:.1f} ms')
+
+    if failures:
+        print('FAILED: ' + '; '.join(failures))
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
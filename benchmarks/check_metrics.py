@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verifikasi: /metrics menghitung tepat dan murah di route /api/calculate*
+
+1. Counter per thread tanpa lock: T thread menulis bersamaan lalu selesai;
+   total yang di-render harus tepat (tabel thread yang sudah selesai dilipat
+   ke total).
+2. web_app_enhanced di server threaded Werkzeug (satu thread per request)
+   dengan stub OpenWeather: N request /api/calculate-flood serentak plus satu
+   /api/weather, lalu /metrics di-scrape. Jumlah request, count histogram,
+   gauge in-flight, panggilan upstream per endpoint (dibanding hit di stub)
+   dan cache harus cocok; setiap baris harus format teks Prometheus yang sah.
+3. Overhead hook before/after_request per request (µs), dibanding batas
+   OVERHEAD_BUDGET_US dan latency p50 /api/calculate-flood lewat test client.
+
+Jalankan dari root repo:
+    python benchmarks/check_metrics.py [N]
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from metrics import Metrics  # noqa: E402
+from openweather_stub import StubServer  # noqa: E402
+
+OVERHEAD_BUDGET_US = 15.0
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*\})? '
+                     r'(-?[0-9.e+-]+|\+Inf|NaN)$')
+
+
+def parse_exposition(text: str):
+    """{(name, labels text): value}, or raise ValueError on a malformed line"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith('# HELP ') or line.startswith('# TYPE '):
+            continue
+        match = _SAMPLE.match(line)
+        if match is None:
+            raise ValueError(f'malformed line: {line!r}')
+        samples[(match.group(1), match.group(2) or '')] = float(match.group(3))
+    return samples
+
+
+def check_threads(threads: int = 8, per_thread: int = 20000):
+    metrics = Metrics()
+
+    def work():
+        for k in range(per_thread):
+            metrics.request_started('/x')
+            metrics.request_finished('/x', 'GET', 200, k % 7 * 0.001)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    del workers, worker
+    samples = parse_exposition(metrics.render())
+    expected = threads * per_thread
+    got = (samples[('http_requests_total', '{route="/x",method="GET",status="200"}')],
+           samples[('http_request_duration_seconds_count', '{route="/x",method="GET"}')],
+           samples[('http_requests_in_flight', '{route="/x"}')])
+    print(f'{threads} threads x {per_thread}: total={got[0]:.0f} count={got[1]:.0f} in_flight={got[2]:.0f} '
+          f'(live tables: {metrics._shards.threads()})')
+    return [] if got == (expected, expected, 0) else ['concurrent counters lost updates']
+
+
+def check_server(count: int):
+    failures = []
+    with StubServer() as stub:
+        os.environ.update({'OPENWEATHER_API_KEY': 'stub-key', 'OPENWEATHER_BASE_URL': stub.url})
+        import web_app_enhanced as core
+
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, core.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{server.server_port}'
+
+        def calculate(_):
+            body = json.dumps({'p': True, 'q': False, 'r': True}).encode()
+            request = Request(f'{base}/api/calculate-flood', body, {'Content-Type': 'application/json'})
+            with urlopen(request, timeout=30) as response:
+                return response.status
+
+        try:
+            with ThreadPoolExecutor(16) as pool:
+                statuses = list(pool.map(calculate, range(count)))
+            with urlopen(f'{base}/api/weather?lat=4.1400&lon=96.1300', timeout=30) as response:
+                response.read()
+            # The last request's thread may still be closing its response
+            time.sleep(0.2)
+            with urlopen(f'{base}/metrics', timeout=30) as response:
+                content_type = response.headers['Content-Type']
+                text = response.read().decode()
+        finally:
+            server.shutdown()
+
+        samples = parse_exposition(text)
+        route = '{route="/api/calculate-flood",method="POST"}'
+        total = samples.get(('http_requests_total', '{route="/api/calculate-flood",method="POST",status="200"}'))
+        histogram = samples.get(('http_request_duration_seconds_count', route))
+        in_flight = samples.get(('http_requests_in_flight', '{route="/api/calculate-flood"}'))
+        upstream = {endpoint: samples.get(('upstream_requests_total', f'{{endpoint="{endpoint}",status="200"}}'))
+                    for endpoint in ('weather', 'forecast')}
+        misses = samples.get(('cache_misses_total', '{cache="weather"}'))
+        print(f'/api/calculate-flood x{count}: statuses ok={statuses.count(200)}, total={total}, '
+              f'histogram count={histogram}, in_flight={in_flight}')
+        print(f'upstream calls={upstream}, stub hits={dict(stub.state.hits)}, weather cache misses={misses}')
+        print(f'{len(samples)} samples, content type {content_type!r}')
+
+        if statuses.count(200) != count or total != count or histogram != count or in_flight != 0:
+            failures.append('request counters do not match the requests sent')
+        if any(upstream[e] != stub.state.hits.get(e) for e in upstream):
+            failures.append('upstream counters do not match the calls the stub received')
+        if misses != 1:
+            failures.append('weather cache miss was not reported')
+        if not content_type.startswith('text/plain; version=0.0.4'):
+            failures.append('wrong content type')
+    return failures, core
+
+
+def per_call_us(function, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1e6
+
+
+def check_overhead(core, repeat: int = 20000):
+    from metrics import METRICS
+
+    app = core.app
+
+    def bare():
+        response = app.response_class(b'{}')
+        response.close()
+
+    def hooked():
+        METRICS._before_request()
+        response = METRICS._after_request(app.response_class(b'{}'))
+        response.close()
+
+    with app.test_request_context('/api/calculate-flood', method='POST'):
+        overhead = per_call_us(hooked, repeat) - per_call_us(bare, repeat)
+
+    client = app.test_client()
+    latencies = []
+    for _ in range(2000):
+        start = time.perf_counter()
+        client.post('/api/calculate-flood', json={'p': True, 'q': False, 'r': True}).close()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e6
+    print(f'metrics hooks: {overhead:.1f} us per request (budget {OVERHEAD_BUDGET_US:.0f} us); '
+          f'/api/calculate-flood p50 via test client {p50:.0f} us')
+    return [] if overhead <= OVERHEAD_BUDGET_US else ['metrics hooks exceed the overhead budget']
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    failures = check_threads()
+    server_failures, core = check_server(count)
+    failures += server_failures
+    failures += check_overhead(core)
+
+    if failures:
+        print('FAILED: ' + '; '.join(failures))
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
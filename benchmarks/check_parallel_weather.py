@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verifikasi: fetch /weather dan /forecast berjalan paralel dengan deadline bersama
+
+Menjalankan get_weather_data terhadap stub lokal yang diberi delay:
+  1. kedua endpoint lambat 0.8 s  -> total ~0.8 s (bukan ~1.6 s)
+  2. kedua endpoint lambat 1.5 s  -> tetap berhasil: percobaan pertama boleh
+     memakai seluruh sisa deadline (retry default tetap aktif)
+  3. forecast melewati deadline   -> data current saja (partial)
+  4. current melewati deadline    -> data forecast saja (partial)
+
+Jalankan dari root repo:
+    python benchmarks/check_parallel_weather.py
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from openweather_stub import StubServer  # noqa: E402
+
+DEADLINE = 2.0
+
+
+def run(stub, weather_delay, forecast_delay):
+    import web_app_enhanced as app_module
+
+    stub.state.delays = {'weather': weather_delay, 'forecast': forecast_delay}
+    app_module.WEATHER_CACHE.clear()
+    start = time.perf_counter()
+    data = app_module.get_weather_data(lat=5.5483, lon=95.3238)
+    return data, time.perf_counter() - start
+
+
+def main():
+    failures = []
+
+    with StubServer() as stub:
+        os.environ.update({
+            'OPENWEATHER_API_KEY': 'stub-key',
+            'OPENWEATHER_BASE_URL': stub.url,
+            'WEATHER_DEADLINE': str(DEADLINE),
+        })
+
+        data, elapsed = run(stub, 0.8, 0.8)
+        print(f'both 0.8 s        -> {elapsed:.2f} s, success={data["success"]}, partial={data.get("partial", False)}')
+        if not data['success'] or data.get('partial') or elapsed > 1.4:
+            failures.append('calls were not fetched concurrently')
+
+        data, elapsed = run(stub, 1.5, 1.5)
+        print(f'both 1.5 s        -> {elapsed:.2f} s, success={data["success"]}, partial={data.get("partial", False)}')
+        if not data['success'] or data.get('partial') or elapsed > DEADLINE:
+            failures.append('a slow but in-deadline upstream was cut short')
+
+        data, elapsed = run(stub, 0.2, DEADLINE + 1)
+        print(f'forecast too slow -> {elapsed:.2f} s, forecast={len(data.get("forecast", []))} days, errors={data.get("errors")}')
+        if not data['success'] or not data.get('partial') or data['forecast'] or elapsed > DEADLINE + 0.3:
+            failures.append('slow forecast did not yield current-only partial data')
+
+        data, elapsed = run(stub, DEADLINE + 1, 0.2)
+        print(f'current too slow  -> {elapsed:.2f} s, forecast={len(data.get("forecast", []))} days, errors={data.get("errors")}')
+        if not data['success'] or not data.get('partial') or not data['forecast'] or elapsed > DEADLINE + 0.3:
+            failures.append('slow current weather did not yield forecast-only partial data')
+
+    if failures:
+        print('FAILED: ' + '; '.join(failures))
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
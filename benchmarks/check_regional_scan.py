@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verifikasi: scan regional Aceh di-stream per wilayah dengan fan-out terbatas
+
+Menjalankan web_app_enhanced (server threaded Werkzeug) terhadap stub
+OpenWeather yang lambat, memanggil GET /api/scan/flood?state=Aceh dan
+mencatat kapan tiap baris NDJSON tiba. Baris pertama harus tiba jauh
+sebelum baris terakhir, dan total waktu harus mendekati
+ceil(wilayah / konkurensi) x latency, bukan wilayah x latency.
+
+Jalankan dari root repo:
+    python benchmarks/check_regional_scan.py [concurrency]
+"""
+
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from urllib.request import urlopen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from openweather_stub import StubServer  # noqa: E402
+
+UPSTREAM_DELAY = 0.3
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    failures = []
+
+    with StubServer(delay=UPSTREAM_DELAY) as stub:
+        os.environ.update({'OPENWEATHER_API_KEY': 'stub-key', 'OPENWEATHER_BASE_URL': stub.url})
+        import web_app_enhanced as app_module
+
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_port}/api/scan/flood?state=Aceh&concurrency={concurrency}'
+
+        try:
+            start = time.perf_counter()
+            arrivals = []
+            lines = []
+            with urlopen(url, timeout=60) as response:
+                for line in response:
+                    arrivals.append(time.perf_counter() - start)
+                    lines.append(json.loads(line))
+        finally:
+            server.shutdown()
+
+    regions = [line for line in lines if 'summary' not in line]
+    summary = lines[-1].get('summary', {})
+    expected = math.ceil(len(regions) / concurrency) * UPSTREAM_DELAY
+    print(f'{len(regions)} regions, concurrency {concurrency}, upstream delay {UPSTREAM_DELAY}s')
+    print(f'first line after {arrivals[0]:.2f}s, last after {arrivals[-1]:.2f}s '
+          f'(expected ≈ {expected:.1f}s, sequential ≈ {len(regions) * UPSTREAM_DELAY:.1f}s)')
+    print(f'summary: {summary}')
+    for line in sorted(regions, key=lambda item: item['name'])[:5]:
+        print(f"  {line['name']:<16} p={line['p']} q={line['q']} r={line['r']} -> {line['result']}")
+
+    if not regions or summary.get('total') != len(regions):
+        failures.append('summary does not match the streamed regions')
+    if summary.get('failed'):
+        failures.append(f"{summary['failed']} regions failed")
+    if arrivals[0] > arrivals[-1] / 2:
+        failures.append('results were not streamed as they completed')
+    if arrivals[-1] > expected * 2 + 1:
+        failures.append('scan did not fan out')
+
+    if failures:
+        print('FAILED: ' + '; '.join(failures))
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verifikasi: N request bersamaan yang identik = tepat satu panggilan upstream
+
+Menjalankan web_app_enhanced dengan server threaded Werkzeug (seperti
+`app.run`) terhadap stub OpenWeather yang lambat, lalu mengirim N request
+/api/weather dan N request /api/weather/search serentak dan menghitung hit
+di stub.
+
+Jalankan dari root repo:
+    python benchmarks/check_singleflight.py [N]
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from openweather_stub import StubServer  # noqa: E402
+
+UPSTREAM_DELAY = 0.5
+
+
+def fire(url, count):
+    barrier = threading.Barrier(count)
+
+    def one(_):
+        barrier.wait()
+        with urlopen(url, timeout=30) as response:
+            return json.loads(response.read())
+
+    with ThreadPoolExecutor(count) as pool:
+        return list(pool.map(one, range(count)))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    failures = []
+
+    with StubServer(delay=UPSTREAM_DELAY) as stub:
+        os.environ.update({'OPENWEATHER_API_KEY': 'stub-key', 'OPENWEATHER_BASE_URL': stub.url})
+        import web_app_enhanced as app_module
+
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{server.server_port}'
+
+        try:
+            results = fire(f'{base}/api/weather?lat=4.1400&lon=96.1300', count)
+            hits = dict(stub.state.hits)
+            ok = all(r['success'] for r in results)
+            print(f'/api/weather x{count}: success={ok}, upstream hits={hits}')
+            if not ok or hits.get('weather') != 1 or hits.get('forecast') != 1:
+                failures.append('weather requests were not coalesced into one upstream fetch')
+
+            stub.state.reset()
+            results = fire(f'{base}/api/weather/search?city=Atlantis', count)
+            hits = dict(stub.state.hits)
+            ok = all(r['success'] for r in results)
+            # One coalesced search = one Indonesia query + one global query
+            print(f'/api/weather/search x{count}: success={ok}, upstream hits={hits}')
+            if not ok or hits.get('geo', 0) > 2:
+                failures.append('geocoding requests were not coalesced into one upstream search')
+        finally:
+            server.shutdown()
+
+    if failures:
+        print('FAILED: ' + '; '.join(failures))
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stub Lokal OpenWeatherMap
+Server HTTP kecil yang meniru endpoint /data/2.5/weather, /data/2.5/forecast
+dan /geo/1.0/direct, dengan latency dan error yang bisa diatur. Dipakai oleh
+benchmark dan skrip verifikasi agar tidak memanggil API asli.
+
+Jalankan mandiri:
+    python benchmarks/openweather_stub.py --port 8081 --delay 0.2 --error-rate 0.05
+lalu set OPENWEATHER_BASE_URL=http://127.0.0.1:8081 saat menjalankan app.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+ENDPOINTS = {
+    '/data/2.5/weather': 'weather',
+    '/data/2.5/forecast': 'forecast',
+    '/geo/1.0/direct': 'geo',
+}
+
+BASE_TIMESTAMP = 1767225600  # 2026-01-01 00:00 UTC
+
+
+def current_payload(lat: float, lon: float) -> Dict:
+    """Minimal /weather document with every field the app reads"""
+    return {
+        'name': 'Banda Aceh',
+        'dt': BASE_TIMESTAMP,
+        'sys': {'country': 'ID', 'sunrise': BASE_TIMESTAMP - 20000, 'sunset': BASE_TIMESTAMP + 20000},
+        'coord': {'lat': lat, 'lon': lon},
+        'main': {'temp': 29.4, 'feels_like': 33.0, 'temp_min': 28.0, 'temp_max': 31.0,
+                 'pressure': 1008, 'humidity': 84},
+        'weather': [{'description': 'hujan ringan', 'icon': '10d'}],
+        'wind': {'speed': 3.1, 'deg': 200},
+        'clouds': {'all': 75},
+        'visibility': 8000,
+        'rain': {'1h': 4.2},
+    }
+
+
+def forecast_payload(lat: float, lon: float) -> Dict:
+    """40 three-hour slots with rain in some of them"""
+    slots = []
+    for i in range(40):
+        slot = {
+            'dt': BASE_TIMESTAMP + i * 10800,
+            'main': {'temp': 27.0 + (i % 6), 'feels_like': 30.0, 'temp_min': 26.0, 'temp_max': 32.0,
+                     'pressure': 1009, 'humidity': 78 + (i % 15)},
+            'weather': [{'description': 'hujan sedang' if i % 4 == 0 else 'berawan', 'icon': '10d'}],
+            'wind': {'speed': 2.4, 'deg': 180},
+            'clouds': {'all': 60},
+            'visibility': 10000,
+        }
+        if i % 4 == 0:
+            slot['rain'] = {'3h': round(3.5 * (i % 9), 2)}
+        slots.append(slot)
+    return {
+        'list': slots,
+        'city': {'name': 'Banda Aceh', 'country': 'ID', 'coord': {'lat': lat, 'lon': lon},
+                 'timezone': 25200, 'sunrise': BASE_TIMESTAMP - 20000, 'sunset': BASE_TIMESTAMP + 20000},
+    }
+
+
+def geo_payload(query: str, limit: int) -> list:
+    """A few direct-geocoding matches for the queried name"""
+    name = query.split(',')[0].strip().title() or 'Banda Aceh'
+    # Deterministic per-name coordinates somewhere over Indonesia
+    seed = zlib.crc32(name.encode('utf-8'))
+    lat = -10 + (seed % 1500) / 100
+    lon = 95 + (seed // 1500 % 4500) / 100
+    return [
+        {'name': name, 'country': 'ID', 'state': 'Aceh', 'lat': round(lat + i * 0.1, 4), 'lon': round(lon + i * 0.1, 4)}
+        for i in range(min(limit, 3))
+    ]
+
+
+class StubState:
+    """Latency/error configuration plus hit and connection counters"""
+
+    def __init__(self, delay: float = 0.0, error_rate: float = 0.0, delays: Dict[str, float] = None):
+        self.delay = delay
+        self.delays = dict(delays or {})
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.connections = 0
+
+    def delay_for(self, endpoint: str) -> float:
+        return self.delays.get(endpoint, self.delay)
+
+    def count(self, endpoint: str):
+        with self.lock:
+            self.hits[endpoint] = self.hits.get(endpoint, 0) + 1
+
+    def reset(self):
+        with self.lock:
+            self.hits = {}
+            self.connections = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is observable
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def setup(self):
+        super().setup()
+        state = self.server.state
+        with state.lock:
+            state.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        endpoint = ENDPOINTS.get(url.path)
+        if endpoint is None:
+            self._send(404, {'cod': '404', 'message': 'not found'})
+            return
+
+        state = self.server.state
+        state.count(endpoint)
+        delay = state.delay_for(endpoint)
+        if delay:
+            time.sleep(delay)
+        if state.error_rate and random.random() < state.error_rate:
+            self._send(503, {'cod': '503', 'message': 'stub injected error'})
+            return
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        lat = float(params.get('lat', 5.5483))
+        lon = float(params.get('lon', 95.3238))
+        if endpoint == 'weather':
+            self._send(200, current_payload(lat, lon))
+        elif endpoint == 'forecast':
+            self._send(200, forecast_payload(lat, lon))
+        else:
+            self._send(200, geo_payload(params.get('q', ''), int(params.get('limit', 5))))
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # load benchmarks open hundreds of connections at once
+
+    def handle_error(self, request, client_address):
+        pass  # clients giving up on a slow response (timeouts) are expected here
+
+
+class StubServer:
+    """
+    Run the stub in a background thread
+
+    Example:
+        with StubServer(delays={'forecast': 2.0}) as stub:
+            os.environ['OPENWEATHER_BASE_URL'] = stub.url
+            ...
+            stub.state.hits['forecast']
+    """
+
+    def __init__(self, port: int = 0, delay: float = 0.0, error_rate: float = 0.0,
+                 delays: Dict[str, float] = None):
+        self.httpd = _StubHTTPServer(('127.0.0.1', port), StubHandler)
+        self.httpd.state = StubState(delay, error_rate, delays)
+        self.state = self.httpd.state
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='openweather-stub', daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def start(self) -> 'StubServer':
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local OpenWeatherMap stub')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--delay', type=float, default=0.0, help='Latency for every endpoint (s)')
+    parser.add_argument('--weather-delay', type=float, help='Latency for /data/2.5/weather (s)')
+    parser.add_argument('--forecast-delay', type=float, help='Latency for /data/2.5/forecast (s)')
+    parser.add_argument('--geo-delay', type=float, help='Latency for /geo/1.0/direct (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 503 responses')
+    args = parser.parse_args()
+
+    delays = {name: value for name, value in (
+        ('weather', args.weather_delay), ('forecast', args.forecast_delay), ('geo', args.geo_delay)
+    ) if value is not None}
+    stub = StubServer(args.port, args.delay, args.error_rate, delays)
+    print(f'OpenWeather stub listening on {stub.url}')
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
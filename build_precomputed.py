@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build Data Pra-Hitung untuk Deploy
+Meng-encode semua tabel respons web_app_enhanced (banjir, gempa, gabungan)
+dan halaman utama (dikompresi gzip/brotli tingkat maksimum) ke satu file
+(default data/precomputed.pickle) yang dimuat saat cold start. File menyimpan
+sidik jari kode, template, file aturan, dan backend JSON (orjson atau json
+standar beserta versinya); bila salah satunya berubah setelah build, file
+diabaikan dan semuanya dihitung saat startup seperti biasa.
+
+Jalankan sebelum deploy, dari root repo:
+    python build_precomputed.py [output]
+    vercel deploy
+"""
+
+import os
+import sys
+import time
+
+
+def main():
+    start = time.perf_counter()
+    import web_app_enhanced as core
+
+    path = sys.argv[1] if len(sys.argv) > 1 else core.PRECOMPUTED_FILE
+    for page in core.STATIC_PAGES:
+        page.render(core.app, best=True)
+    store = core.precomputed_store(core.app, path)
+    store.save(core.RESPONSE_TABLES, core.STATIC_PAGES)
+
+    entries = sum(len(table.entries) for table in core.RESPONSE_TABLES)
+    print(f'{path}: {len(core.RESPONSE_TABLES)} tables, {entries} responses, '
+          f'{os.path.getsize(path) // 1024} KiB, fingerprint {store.fingerprint[:12]} '
+          f'({(time.perf_counter() - start) * 1000:.0f} ms)')
+    for page in core.STATIC_PAGES:
+        sizes = ', '.join(f'{encoding} {len(body) // 1024} KiB' for encoding, (body, _) in page.variants.items())
+        print(f'  page {page.name}: {sizes}')
+
+
+if __name__ == '__main__':
+    main()
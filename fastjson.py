@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON Provider Cepat untuk Flask
+FastJSONProvider menggantikan encoder bawaan Flask: memakai orjson bila
+terpasang (pip install orjson) dan kembali ke modul json standar bila tidak.
+Bagian respons yang sama di setiap request (status health, tabel kebenaran
+hazard, bagian data cuaca yang di-cache) di-encode sekali menjadi Fragment
+dan disambung apa adanya ke respons berikutnya, tanpa di-encode ulang.
+
+Catatan: backend orjson selalu menulis UTF-8 (tanpa escape \\uXXXX untuk
+karakter non-ASCII); isinya tetap JSON yang sama.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Fragments are encoded as this marker string first and substituted after
+# encoding; the random part keeps real data from ever matching it
+_MARKER = f'\x00{os.urandom(6).hex()}:'
+_MARKER_RE = re.compile(rb'"\\u0000' + _MARKER[1:].encode() + rb'(\d+)"')
+
+
+class Fragment:
+    """Already-encoded JSON, written into a response verbatim"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: Union[bytes, str]):
+        self.data = data.encode('utf-8') if isinstance(data, str) else data
+
+    def __repr__(self):
+        return f'Fragment({self.data[:40]!r}{"..." if len(self.data) > 40 else ""})'
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider with orjson when available and Fragment splicing
+
+    Install with `app.json = FastJSONProvider(app)` before anything encodes
+    with `app.json`. Output is compact (as in Flask's non-debug responses)
+    with sorted keys; debug mode still pretty-prints with the stdlib.
+    Set `backend = 'json'` to force the stdlib encoder, whose output is
+    byte-identical to Flask's own.
+    """
+
+    backend = 'orjson' if orjson is not None else 'json'
+
+    def backend_version(self) -> str:
+        """Encoder in use and its version, e.g. 'orjson 3.8.3' (encoded bytes depend on it)"""
+        if self.backend == 'orjson':
+            return f'orjson {orjson.__version__}'
+        return f'json {json.__version__}'
+
+    def _encoder(self, fragments: List[bytes]) -> Callable[[Any], Any]:
+        """`default` hook: Fragments become numbered markers, the rest goes to Flask's default"""
+        def default(o):
+            if isinstance(o, Fragment):
+                fragments.append(o.data)
+                return f'{_MARKER}{len(fragments) - 1}'
+            return self.default(o)
+        return default
+
+    @staticmethod
+    def _splice(data: bytes, fragments: List[bytes]) -> bytes:
+        if not fragments:
+            return data
+        return _MARKER_RE.sub(lambda m: fragments[int(m.group(1))], data)
+
+    def _encode_stdlib(self, obj: Any, **kwargs) -> bytes:
+        fragments: List[bytes] = []
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        data = json.dumps(obj, default=self._encoder(fragments), **kwargs).encode('utf-8')
+        return self._splice(data, fragments)
+
+    def encode(self, obj: Any) -> bytes:
+        """Compact JSON bytes of `obj` (Fragments spliced in)"""
+        if isinstance(obj, Fragment):
+            return obj.data
+        if self.backend != 'orjson':
+            return self._encode_stdlib(obj, separators=(',', ':'))
+
+        fragments: List[bytes] = []
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            data = orjson.dumps(obj, default=self._encoder(fragments), option=option)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits and the like: the stdlib handles them
+            return self._encode_stdlib(obj, separators=(',', ':'))
+        return self._splice(data, fragments)
+
+    def fragment(self, obj: Any) -> Fragment:
+        """Encode `obj` once for splicing into later responses"""
+        return Fragment(self.encode(obj))
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Compact JSON text; any json.dumps keyword argument selects the stdlib encoder"""
+        if kwargs:
+            return self._encode_stdlib(obj, **kwargs).decode('utf-8')
+        return self.encode(obj).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if self.backend != 'orjson' or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Same contract as DefaultJSONProvider.response (used by jsonify)"""
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            body = self._encode_stdlib(obj, indent=2)
+        else:
+            body = self.encode(obj)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+class FragmentCache:
+    """
+    Encoded fragments of shared objects, keyed by identity
+
+    For objects that are never mutated once built and are handed out to
+    many requests (cache entries, static payloads). The cache holds a
+    reference to each object, so its id cannot be reused while cached.
+
+    Args:
+        max_size: Maximum number of objects (least recently used is evicted)
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[int, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0}
+
+    def get(self, obj: Any, build: Optional[Callable[[Any], Any]] = None) -> Fragment:
+        """
+        Fragment of `obj` (or of `build(obj)`), encoded with current_app.json on first use
+        """
+        key = id(obj)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is obj:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return entry[1]
+            self._counters['misses'] += 1
+
+        fragment = current_app.json.fragment(build(obj) if build else obj)
+        with self._lock:
+            self._entries[key] = (obj, fragment)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return fragment
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Hits, misses (encodes) and cached objects"""
+        with self._lock:
+            return dict(self._counters, size=len(self._entries))
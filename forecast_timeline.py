@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Timeline Risiko dari Prakiraan Cuaca
+Satu lintasan atas (maksimal) 40 slot prakiraan 3 jam OpenWeatherMap
+menghasilkan kolom per slot (waktu, hujan, intensitas, p), kartu prakiraan
+harian, dan agregat harian (total hujan, intensitas maksimum). Formula banjir
+lalu dievaluasi untuk semua slot sekaligus (bit-parallel) dengan q/r lokasi.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from logic_engine import evaluate_batch
+
+# p = TRUE from this rainfall intensity (BMKG: hujan sangat lebat ≥ 20 mm/jam)
+RAIN_P_THRESHOLD = float(os.getenv('RAIN_P_THRESHOLD', '20'))
+
+# flood_risk level of the current weather: above these hourly rainfall (mm)
+# or humidity (%) values it is 'high', else above the medium ones 'medium'
+FLOOD_RAIN_HIGH = 50
+FLOOD_HUMIDITY_HIGH = 90
+FLOOD_RAIN_MEDIUM = 20
+FLOOD_HUMIDITY_MEDIUM = 80
+
+_EPOCH = datetime(1970, 1, 1)
+
+FORECAST_SLOTS = 40   # 5 days * 8 (3-hour intervals)
+FORECAST_DAYS = 5     # daily cards in the /api/weather response
+SLOT_HOURS = 3
+
+
+def flood_risk_level(rainfall: float, humidity: float) -> str:
+    """'high', 'medium' or 'low' for the current hourly rainfall (mm) and humidity (%)"""
+    if rainfall > FLOOD_RAIN_HIGH or humidity > FLOOD_HUMIDITY_HIGH:
+        return 'high'
+    if rainfall > FLOOD_RAIN_MEDIUM or humidity > FLOOD_HUMIDITY_MEDIUM:
+        return 'medium'
+    return 'low'
+
+
+def build_timeline(forecast_data: Dict, threshold: float = RAIN_P_THRESHOLD) -> Tuple[List[Dict], Dict]:
+    """
+    Daily forecast cards and the per-slot timeline in one pass
+
+    Each card holds the first 3-hour sample of its day (temperature,
+    description, ..., `rain` of that slot) and the day's total rain as
+    `rain_total`. Times and day boundaries are in the city's local time
+    (the `city.timezone` offset OpenWeatherMap returns; server time if absent).
+
+    Returns:
+        (daily_forecast, timeline) where timeline is
+        {'threshold', 'slots': {column: [...]}, 'daily': [{'date', 'slot_range',
+        'total_rain', 'max_intensity'}]}
+    """
+    times, rain, intensity, p = [], [], [], []
+    cards: List[Dict] = []
+    days: List[Dict] = []
+    date = None
+    day = card = None
+    offset = forecast_data.get('city', {}).get('timezone')
+
+    for index, item in enumerate(forecast_data['list'][:FORECAST_SLOTS]):
+        # Naive city-local time: the epoch plus the shifted timestamp
+        moment = (_EPOCH + timedelta(seconds=item['dt'] + offset) if offset is not None
+                  else datetime.fromtimestamp(item['dt']))
+        slot_rain = item.get('rain', {}).get('3h', 0) or 0
+        slot_intensity = slot_rain / SLOT_HOURS
+        times.append(moment.isoformat(' ', 'minutes'))  # 'YYYY-MM-DD HH:MM'
+        rain.append(slot_rain)
+        intensity.append(round(slot_intensity, 2))
+        p.append(slot_intensity >= threshold)
+
+        slot_date = moment.date().isoformat()
+        if slot_date != date:
+            date = slot_date
+            day = {'date': date, 'slot_range': [index, index], 'total_rain': 0.0, 'max_intensity': 0.0}
+            days.append(day)
+            card = None
+            if len(cards) < FORECAST_DAYS:
+                card = {
+                    'date': date,
+                    'day': moment.strftime('%A'),
+                    'temp': round(item['main']['temp']),
+                    'temp_min': round(item['main']['temp_min']),
+                    'temp_max': round(item['main']['temp_max']),
+                    'description': item['weather'][0]['description'].capitalize(),
+                    'icon': item['weather'][0]['icon'],
+                    'humidity': item['main']['humidity'],
+                    'wind_speed': round(item['wind']['speed'] * 3.6, 1),  # Convert m/s to km/h
+                    'rain': item.get('rain', {}).get('3h', 0),
+                    'rain_total': 0
+                }
+                cards.append(card)
+        day['slot_range'][1] = index + 1
+        day['total_rain'] += slot_rain
+        if slot_intensity > day['max_intensity']:
+            day['max_intensity'] = slot_intensity
+        if card is not None:
+            card['rain_total'] = round(day['total_rain'], 2)
+
+    for day in days:
+        day['total_rain'] = round(day['total_rain'], 2)
+        day['max_intensity'] = round(day['max_intensity'], 2)
+
+    timeline = {
+        'threshold': threshold,
+        'slots': {'time': times, 'rain': rain, 'intensity': intensity, 'p': p},
+        'daily': days,
+    }
+    return cards, timeline
+
+
+def evaluate_timeline(timeline: Dict, variables: Sequence[str], steps: Sequence[Tuple[str, str]],
+                      known: Dict[str, Optional[bool]]) -> Dict:
+    """
+    Evaluate a hazard formula for every slot (new dict, input untouched)
+
+    Args:
+        timeline: From build_timeline (supplies the 'p' column)
+        variables, steps: Hazard formula, e.g. HAZARD_FORMULAS['flood']
+        known: Constant location inputs such as {'q': True, 'r': None};
+            None (unknown) is evaluated as TRUE, i.e. the worst case
+
+    Returns:
+        Copy with slots['risk'] and per day 'risk_slots' / 'first_risk'
+    """
+    slots = timeline['slots']
+    size = len(slots['p'])
+    columns = {'p': slots['p']}
+    for name in variables:
+        if name != 'p':
+            value = known.get(name)
+            columns[name] = [value is None or bool(value)] * size
+    risk = evaluate_batch(variables, steps, columns, size)['result'] if size else []
+
+    daily = []
+    for day in timeline['daily']:
+        start, end = day['slot_range']
+        hits = [i for i in range(start, end) if risk[i]]
+        daily.append(dict(day, risk_slots=len(hits), first_risk=slots['time'][hits[0]] if hits else None))
+
+    result = dict(timeline, slots=dict(slots, risk=risk), daily=daily)
+    result.update({name: known.get(name) for name in variables if name != 'p'})
+    return result
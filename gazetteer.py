@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gazetteer Offline Indonesia
+Indeks nama kabupaten/kota/kecamatan (data/gazetteer_id.csv) di memori untuk
+pencarian exact, prefix, dan fuzzy tanpa memanggil API geocoding. Hasil
+geocoding remote dapat ditambahkan ke indeks saat runtime (dengan batas
+jumlah, disisipkan satu per satu tanpa membangun ulang indeks).
+"""
+
+import csv
+import os
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_GAZETTEER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      'data', 'gazetteer_id.csv')
+
+# Administrative prefixes ignored when matching ("Kota Langsa" == "Langsa")
+_PREFIX_RE = re.compile(r'^(kota|kabupaten|kab\.?|kecamatan|kec\.?)\s+')
+_CLEAN_RE = re.compile(r'[^a-z0-9 ]+')
+
+# Scores, aligned with the remote search ranking in api_weather_search
+SCORE_EXACT = 100
+SCORE_PREFIX = 80
+SCORE_FUZZY = 60
+
+
+def normalize(name: str) -> str:
+    """Lowercase, drop punctuation and administrative prefixes"""
+    text = _CLEAN_RE.sub(' ', name.lower().replace('-', ' '))
+    text = ' '.join(text.split())
+    return _PREFIX_RE.sub('', text)
+
+
+def _bigrams(text: str) -> set:
+    padded = f' {text} '
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, returning limit + 1 as soon as it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, cb in enumerate(b, 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            current.append(value)
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class GazetteerIndex:
+    """
+    Sorted-key prefix index with exact, prefix and fuzzy lookup
+
+    Keys are (normalized name, place id) tuples in one sorted list, so a
+    prefix query is a bisect plus a short scan. Adding a place only appends
+    to the lists and inserts its keys in order (no rebuild); the place is
+    stored before its keys, so lock-free readers may see a place added
+    mid-search but never a key without its place.
+
+    Args:
+        places: Initial places (the offline gazetteer)
+        max_added: Places add_many() may add on top of them (None = no limit)
+    """
+
+    def __init__(self, places: Sequence[Dict] = (), max_added: Optional[int] = None):
+        self._lock = threading.Lock()
+        self.max_added = max_added
+        self.added = 0
+        self._places: List[Dict] = []
+        self._keys: List[Tuple[str, int]] = []
+        self._exact: Dict[str, List[int]] = {}
+        self._grams: Dict[str, List[int]] = {}
+        self._coords = set()
+        for place in places:
+            if self._remember(place):
+                self._index(place, sort=False)
+        self._keys.sort()
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    @classmethod
+    def from_csv(cls, path: str = DEFAULT_GAZETTEER_FILE, max_added: Optional[int] = None) -> 'GazetteerIndex':
+        """Load a gazetteer CSV (name,type,state,lat,lon,aliases)"""
+        places = []
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                places.append({
+                    'name': row['name'],
+                    'type': row.get('type', ''),
+                    'country': 'ID',
+                    'state': row.get('state', ''),
+                    'lat': float(row['lat']),
+                    'lon': float(row['lon']),
+                    'aliases': [a for a in (row.get('aliases') or '').split('|') if a],
+                })
+        return cls(places, max_added)
+
+    def _remember(self, place: Dict) -> bool:
+        """Claim the place's coordinates; False when already known"""
+        coord = (round(place['lat'], 4), round(place['lon'], 4))
+        if coord in self._coords:
+            return False
+        self._coords.add(coord)
+        return True
+
+    def _index(self, place: Dict, sort: bool = True):
+        pid = len(self._places)
+        self._places.append({
+            'name': place['name'],
+            'type': place.get('type', ''),
+            'country': place.get('country', 'ID'),
+            'state': place.get('state', ''),
+            'lat': place['lat'],
+            'lon': place['lon'],
+            'aliases': list(place.get('aliases', [])),
+        })
+        for name in [place['name']] + list(place.get('aliases', [])):
+            key = normalize(name)
+            if not key:
+                continue
+            if sort:
+                insort(self._keys, (key, pid))
+            else:
+                self._keys.append((key, pid))
+            self._exact.setdefault(key, []).append(pid)
+            for gram in _bigrams(key):
+                self._grams.setdefault(gram, []).append(pid)
+
+    def add_many(self, places: Sequence[Dict]) -> int:
+        """
+        Add places (e.g. remote geocoding results), skipping known coordinates
+        and anything past max_added
+
+        Returns:
+            Number of places added
+        """
+        added = 0
+        with self._lock:
+            for place in places:
+                if self.max_added is not None and self.added >= self.max_added:
+                    break
+                if self._remember(place):
+                    self._index(place)
+                    self.added += 1
+                    added += 1
+        return added
+
+    def search(self, query: str, limit: int = 5, country: str = None) -> List[Tuple[Dict, int]]:
+        """
+        Find places matching `query`
+
+        Order: exact matches, then prefix matches (shortest name first). Only
+        when neither exists, fuzzy matches within an edit distance of 1
+        (short queries) or 2.
+
+        Returns:
+            List of (place, match_score)
+        """
+        places, keys, exact, grams = self._places, self._keys, self._exact, self._grams
+        key = normalize(query)
+        if not key:
+            return []
+
+        scored: Dict[int, int] = {}
+
+        for pid in exact.get(key, ()):
+            scored.setdefault(pid, SCORE_EXACT)
+
+        prefix_hits = []
+        i = bisect_left(keys, (key,))
+        while i < len(keys) and keys[i][0].startswith(key):
+            prefix_hits.append(keys[i])
+            i += 1
+        for name, pid in sorted(prefix_hits, key=lambda k: (len(k[0]), k[0])):
+            scored.setdefault(pid, SCORE_PREFIX)
+
+        if not scored and len(key) >= 3:
+            max_distance = 1 if len(key) <= 5 else 2
+            query_grams = _bigrams(key)
+            counts: Dict[int, int] = {}
+            for gram in query_grams:
+                for pid in grams.get(gram, ()):
+                    counts[pid] = counts.get(pid, 0) + 1
+            # Each edit changes at most two bigrams
+            needed = len(query_grams) - 2 * max_distance
+            candidates = [pid for pid, n in counts.items() if n >= needed and pid not in scored]
+            fuzzy = []
+            for pid in candidates:
+                place = places[pid]
+                distance = min(_edit_distance(key, normalize(n), max_distance)
+                               for n in [place['name']] + place['aliases'])
+                if distance <= max_distance:
+                    fuzzy.append((distance, place['name'], pid))
+            for distance, _, pid in sorted(fuzzy):
+                scored.setdefault(pid, SCORE_FUZZY - 10 * distance)
+
+        results = []
+        for pid, score in scored.items():
+            place = places[pid]
+            if country and place['country'] != country:
+                continue
+            results.append((place, score))
+            if len(results) >= limit:
+                break
+        return results
+
+    def lookup(self, name: str, state: str = None) -> Optional[Dict]:
+        """Exact (normalized) name match, optionally within one province"""
+        places, exact = self._places, self._exact
+        for pid in exact.get(normalize(name), ()):
+            if state is None or places[pid]['state'].lower() == state.lower():
+                return places[pid]
+        return None
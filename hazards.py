@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registri Bencana (N-hazard)
+Setiap bencana (banjir, gempa, longsor, tsunami, ...) mendeklarasikan
+variabel dan formulanya sekali. Registri menggabungkan semua formula menjadi
+satu program atas satu vektor variabel bersama, sehingga penilaian gabungan
+cukup satu kali evaluasi (atau satu lintasan bit-parallel untuk batch), lalu
+tingkat bahaya diambil dari tabel yang diindeks bitmask hasil per bencana.
+Menambah bencana tidak menambah percabangan per request.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+from logic_engine import compile_program, evaluate_batch, format_formula, parse, rename_variables
+
+# Combined assessment when no registered hazard is active
+SAFE_ASSESSMENT = {
+    'level': 'SAFE',
+    'severity': 1,
+    'color': 'green-600',
+    'icon': 'fa-shield-alt',
+    'title': '✅ KONDISI AMAN',
+    'description': 'Tidak ada risiko bencana terdeteksi'
+}
+
+# Combined assessment when two or more hazards are active at once
+MULTI_HAZARD_ASSESSMENT = {
+    'level': 'CRITICAL',
+    'severity': 5,
+    'color': 'red-900',
+    'icon': 'fa-skull-crossbones',
+    'title': '🔴 BAHAYA EKSTREM - MULTI BENCANA',
+}
+
+
+class Hazard:
+    """
+    One registered hazard
+
+    Args:
+        name: Registry key, e.g. 'flood'
+        label: Short Indonesian noun for combined descriptions, e.g. 'banjir'
+        variables: Input variable names (shared by name across hazards)
+        steps: (name, formula) pairs; the last one is the result
+        alert: Combined assessment when this hazard is the only active one
+    """
+
+    __slots__ = ('name', 'label', 'variables', 'steps', 'alert')
+
+    def __init__(self, name: str, label: str, variables: Sequence[str],
+                 steps: Sequence[Tuple[str, str]], alert: Dict):
+        self.name = name
+        self.label = label
+        self.variables = tuple(variables)
+        self.steps = tuple(steps)
+        self.alert = alert
+
+
+def _describe(labels: List[str]) -> str:
+    listed = ', '.join(labels[:-1]) + ' DAN ' + labels[-1]
+    return f'Risiko {listed} terdeteksi bersamaan!'
+
+
+class HazardRegistry:
+    """
+    Registered hazards and their combined single-pass evaluation
+
+    Attributes (rebuilt on every register call):
+        formulas: {name: {'variables', 'steps'}}, per hazard
+        variables: Shared input vector (first-registration order)
+        steps, outputs: Every hazard's steps, renamed '<hazard>_<step>'
+        program: All hazards compiled into one function of `variables`
+        severity_table: Combined assessment per bitmask of hazard results
+            (first registered hazard = most significant bit)
+    """
+
+    def __init__(self):
+        self.hazards: Dict[str, Hazard] = {}
+        self.formulas: Dict[str, Dict] = {}
+        self.variables: Tuple[str, ...] = ()
+        self.outputs: Tuple[str, ...] = ()
+        self.steps: Tuple[Tuple[str, str], ...] = ()
+        self.program = None
+        self.severity_table: Tuple[Dict, ...] = (SAFE_ASSESSMENT,)
+        self._result_index: Tuple[int, ...] = ()
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self.hazards)
+
+    def register(self, hazard: Hazard) -> Hazard:
+        """Add (or replace) a hazard and rebuild the combined program and table"""
+        self.hazards[hazard.name] = hazard
+        self._rebuild()
+        return hazard
+
+    def _rebuild(self):
+        variables: Dict[str, None] = {}
+        steps = []
+        result_index = []
+        for hazard in self.hazards.values():
+            variables.update(dict.fromkeys(hazard.variables))
+            # Step names are local to a hazard: prefix them in the shared program
+            mapping = {name: f'{hazard.name}_{name}' for name, _ in hazard.steps}
+            for name, formula in hazard.steps:
+                steps.append((mapping[name], format_formula(rename_variables(parse(formula), mapping))))
+            result_index.append(len(steps) - 1)
+
+        self.formulas = {name: {'variables': h.variables, 'steps': h.steps} for name, h in self.hazards.items()}
+        self.variables = tuple(variables)
+        self.steps = tuple(steps)
+        self.outputs = tuple(name for name, _ in steps)
+        self.program = compile_program(self.variables, self.steps)
+        self._result_index = tuple(result_index)
+        self.severity_table = tuple(self._assessment(mask) for mask in range(1 << len(self.hazards)))
+
+    def _assessment(self, mask: int) -> Dict:
+        count = len(self.hazards)
+        active = [h for k, h in enumerate(self.hazards.values()) if mask >> (count - 1 - k) & 1]
+        if not active:
+            return SAFE_ASSESSMENT
+        if len(active) == 1:
+            return active[0].alert
+        return dict(MULTI_HAZARD_ASSESSMENT, description=_describe([h.label for h in active]))
+
+    def severity(self, results: Dict[str, bool]) -> Dict:
+        """Combined assessment for {hazard: result} (missing hazards = False)"""
+        mask = 0
+        for name in self.hazards:
+            mask = (mask << 1) | (1 if results.get(name) else 0)
+        return self.severity_table[mask]
+
+    def evaluate(self, *values: bool) -> Tuple[Tuple[bool, ...], int]:
+        """
+        All hazards for one input vector (one bool per `variables` entry)
+
+        Returns:
+            (every step output in `outputs` order, bitmask of hazard results)
+        """
+        outputs = self.program.evaluate(*values)
+        if not isinstance(outputs, tuple):
+            outputs = (outputs,)
+        mask = 0
+        for index in self._result_index:
+            mask = (mask << 1) | outputs[index]
+        return outputs, mask
+
+    def assess(self, values: Dict[str, bool]) -> Dict:
+        """
+        Evaluate every hazard for an input dict in one pass (missing inputs = False)
+
+        Returns:
+            {'results': {hazard: bool}, 'combined_risk': assessment}
+        """
+        outputs, mask = self.evaluate(*(bool(values.get(v, False)) for v in self.variables))
+        results = {name: bool(outputs[index]) for name, index in zip(self.hazards, self._result_index)}
+        return {'results': results, 'combined_risk': self.severity_table[mask]}
+
+    def evaluate_batch(self, columns: Dict[str, Sequence[bool]], size: int) -> Tuple[Dict[str, List[bool]], List[int]]:
+        """
+        All hazards for many scenarios in one bit-parallel pass
+
+        Args:
+            columns: One sequence of booleans per variable (missing = all False)
+
+        Returns:
+            ({hazard: results}, severity_table index per scenario)
+        """
+        outputs = evaluate_batch(self.variables, self.steps, columns, size)
+        results = {name: outputs[self.outputs[index]] for name, index in zip(self.hazards, self._result_index)}
+        index = [0] * size
+        for column in results.values():
+            index = [(i << 1) | v for i, v in zip(index, column)]
+        return results, index
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline Gambar Statis (foto tim)
+Saat build, setiap foto di static/images/team diubah ukurannya ke beberapa
+lebar dan disimpan sebagai AVIF, WebP, dan JPEG dengan nama ber-hash konten
+(agna-256.1a2b3c4d5e.webp), dicatat di static/images/manifest.json. Template
+memilih varian lewat <picture>/srcset sehingga ponsel di koneksi lambat hanya
+mengunduh ukuran yang dibutuhkan; karena nama file berubah setiap isinya
+berubah, file tersebut dikirim dengan Cache-Control immutable.
+
+Build (butuh Pillow; hanya saat build, bukan saat serving):
+    python images.py
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+from typing import Dict, List, Sequence
+
+from flask import Flask, request
+from markupsafe import Markup, escape
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+IMAGE_MANIFEST_FILE = os.path.join(STATIC_DIR, 'images', 'manifest.json')
+
+# Source folders (relative to static/) and the widths generated for them:
+# the team photos are shown at 112-128 CSS px, so 1x, 2x and 3x screens
+IMAGE_SOURCES = {
+    'images/team': (128, 256, 384),
+}
+
+# Copies of static/ that are deployed as-is (Vercel serves public/)
+MIRROR_DIRS = (os.path.join(BASE_DIR, 'public', 'static'),)
+
+# Output formats in <picture> preference order; JPEG is the <img> fallback
+IMAGE_FORMATS = (
+    ('avif', 'image/avif', {'quality': 50}),
+    ('webp', 'image/webp', {'quality': 75, 'method': 6}),
+    ('jpg', 'image/jpeg', {'quality': 80, 'optimize': True, 'progressive': True}),
+)
+
+# <stem>-<width>.<10 hex digits>.<ext>: content-hashed, safe to cache forever
+HASHED_NAME = re.compile(r'-\d+\.[0-9a-f]{10}\.(?:avif|webp|jpg)$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def _encode(image, ext: str, options: Dict) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format={'jpg': 'JPEG'}.get(ext, ext.upper()), **options)
+    return buffer.getvalue()
+
+
+def build_variants(folder: str, widths: Sequence[int]) -> Dict[str, Dict]:
+    """
+    Write every width x format variant of the JPEG photos in static/<folder>
+
+    Returns:
+        Manifest entries {'<folder>/<name>.jpg': {'width', 'height', 'variants'}}
+    """
+    from PIL import Image, ImageOps, features
+
+    directory = os.path.join(STATIC_DIR, folder)
+    entries = {}
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in ('.jpg', '.jpeg') or HASHED_NAME.search(name):
+            continue
+        with Image.open(os.path.join(directory, name)) as original:
+            image = ImageOps.exif_transpose(original).convert('RGB')
+
+        variants: Dict[str, List[Dict]] = {}
+        for ext_out, mimetype, options in IMAGE_FORMATS:
+            if ext_out != 'jpg' and not features.check(ext_out):
+                continue
+            for width in widths:
+                width = min(width, image.width)
+                if any(v['width'] == width for v in variants.get(mimetype, ())):
+                    continue
+                height = round(image.height * width / image.width)
+                data = _encode(image.resize((width, height), Image.LANCZOS), ext_out, options)
+                digest = hashlib.sha1(data).hexdigest()[:10]
+                filename = f'{stem}-{width}.{digest}.{ext_out}'
+                with open(os.path.join(directory, filename), 'wb') as f:
+                    f.write(data)
+                variants.setdefault(mimetype, []).append(
+                    {'width': width, 'file': f'{folder}/{filename}', 'bytes': len(data)})
+
+        entries[f'{folder}/{name}'] = {'width': image.width, 'height': image.height, 'variants': variants}
+    return entries
+
+
+def build(sources: Dict[str, Sequence[int]] = IMAGE_SOURCES) -> Dict[str, Dict]:
+    """Build all variants, drop outdated ones, write the manifest and mirror it"""
+    manifest = {}
+    for folder, widths in sources.items():
+        manifest.update(build_variants(folder, widths))
+
+    current = {v['file'] for entry in manifest.values() for group in entry['variants'].values() for v in group}
+    for folder in sources:
+        for name in os.listdir(os.path.join(STATIC_DIR, folder)):
+            if HASHED_NAME.search(name) and f'{folder}/{name}' not in current:
+                os.remove(os.path.join(STATIC_DIR, folder, name))
+
+    with open(IMAGE_MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+    for mirror in MIRROR_DIRS:
+        if not os.path.isdir(mirror):
+            continue
+        for folder in sources:
+            target = os.path.join(mirror, folder)
+            for name in os.listdir(target):
+                if HASHED_NAME.search(name) and f'{folder}/{name}' not in current:
+                    os.remove(os.path.join(target, name))
+        for path in sorted(current) + [os.path.relpath(IMAGE_MANIFEST_FILE, STATIC_DIR)]:
+            shutil.copyfile(os.path.join(STATIC_DIR, path), os.path.join(mirror, path))
+    return manifest
+
+
+class ImageManifest:
+    """
+    Template helpers over static/images/manifest.json
+
+    Without a manifest (images not built) every helper falls back to the
+    original file, so templates render either way.
+    """
+
+    def __init__(self, path: str = IMAGE_MANIFEST_FILE):
+        self.path = path
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.entries: Dict[str, Dict] = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+
+    def srcset(self, path: str, mimetype: str = 'image/jpeg', base: str = '/static/') -> str:
+        """'url 128w, url 256w, ...' of one format ('' when not built)"""
+        group = self.entries.get(path, {}).get('variants', {}).get(mimetype, ())
+        return ', '.join(f"{base}{v['file']} {v['width']}w" for v in group)
+
+    def src(self, path: str, base: str = '/static/') -> str:
+        """Largest JPEG variant, or the original file"""
+        group = self.entries.get(path, {}).get('variants', {}).get('image/jpeg')
+        return f"{base}{group[-1]['file'] if group else path}"
+
+    def sources(self, path: str, sizes: str, base: str = '/static/') -> Markup:
+        """<source> elements for the modern formats, to put before the <img> in a <picture>"""
+        tags = []
+        for _, mimetype, _ in IMAGE_FORMATS[:-1]:
+            srcset = self.srcset(path, mimetype, base)
+            if srcset:
+                tags.append(f'<source type="{mimetype}" srcset="{escape(srcset)}" sizes="{escape(sizes)}">')
+        return Markup(''.join(tags))
+
+    def install(self, app: Flask):
+        """Register the template globals and immutable caching of hashed files"""
+        app.add_template_global(self.sources, 'image_sources')
+        app.add_template_global(self.srcset, 'image_srcset')
+        app.add_template_global(self.src, 'image_src')
+        app.after_request(immutable_static)
+
+
+def immutable_static(response):
+    """Content-hashed static files never change under the same name"""
+    if request.endpoint == 'static' and response.status_code == 200 and HASHED_NAME.search(request.path):
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+def main():
+    manifest = build()
+    for path, entry in sorted(manifest.items()):
+        original = os.path.getsize(os.path.join(STATIC_DIR, path))
+        print(f"{path}: {original // 1024} KiB, {entry['width']}x{entry['height']}")
+        for mimetype, group in entry['variants'].items():
+            sizes = ', '.join(f"{v['width']}w {v['bytes'] / 1024:.1f} KiB" for v in group)
+            print(f'  {mimetype:<11} {sizes}')
+    print(f'manifest: {os.path.relpath(IMAGE_MANIFEST_FILE, BASE_DIR)}')
+
+
+if __name__ == '__main__':
+    main()
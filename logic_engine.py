@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mesin Logika Proposisional - Formula Compiler
+Parse ekspresi seperti `p & (q | r) & ~s` satu kali, compile menjadi satu
+fungsi Python datar, lalu cache hasilnya sehingga hazard baru cukup
+didefinisikan lewat string formula.
+"""
+
+import keyword
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+# ============================================
+# TOKENIZER & PARSER
+# ============================================
+
+# Operator yang diterima (simbol ASCII, simbol logika, dan kata kunci)
+_OPERATORS = {
+    '&': 'and', '∧': 'and', 'and': 'and',
+    '|': 'or', '∨': 'or', 'or': 'or',
+    '^': 'xor', '⊕': 'xor', 'xor': 'xor',
+    '~': 'not', '!': 'not', '¬': 'not', 'not': 'not',
+}
+
+_CONSTANTS = {'0': False, '1': True, 'false': False, 'true': True}
+
+_TOKEN_RE = re.compile(r'\s*(?:([A-Za-z_][A-Za-z0-9_]*|[01])|(.))')
+
+_NAME_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Nama yang dipakai oleh kode hasil compile
+_RESERVED = {'_mask'}
+
+
+def _tokenize(expr: str) -> List[str]:
+    """Split a formula string into names, constants, operators and parentheses"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(expr):
+        word, symbol = match.groups()
+        if word is not None:
+            tokens.append(word)
+        elif symbol is not None and not symbol.isspace():
+            if symbol not in _OPERATORS and symbol not in '()':
+                raise ValueError(f'Invalid character {symbol!r} in formula {expr!r}')
+            tokens.append(symbol)
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent parser
+    Precedence (lowest to highest): OR, XOR, AND, NOT
+    """
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        self.tokens = _tokenize(expr)
+        self.pos = 0
+
+    def _peek_operator(self) -> str:
+        if self.pos < len(self.tokens):
+            return _OPERATORS.get(self.tokens[self.pos].lower())
+        return None
+
+    def parse(self) -> tuple:
+        if not self.tokens:
+            raise ValueError('Formula is empty')
+        node = self._parse_or()
+        if self.pos != len(self.tokens):
+            raise ValueError(f'Unexpected token {self.tokens[self.pos]!r} in formula {self.expr!r}')
+        return node
+
+    def _parse_nary(self, op: str, parse_operand) -> tuple:
+        operands = [parse_operand()]
+        while self._peek_operator() == op:
+            self.pos += 1
+            operands.append(parse_operand())
+        if len(operands) == 1:
+            return operands[0]
+        # Flatten nested operators of the same kind: a & (b & c) -> and(a, b, c)
+        flat = []
+        for operand in operands:
+            if operand[0] == op:
+                flat.extend(operand[1:])
+            else:
+                flat.append(operand)
+        return (op, *flat)
+
+    def _parse_or(self) -> tuple:
+        return self._parse_nary('or', self._parse_xor)
+
+    def _parse_xor(self) -> tuple:
+        return self._parse_nary('xor', self._parse_and)
+
+    def _parse_and(self) -> tuple:
+        return self._parse_nary('and', self._parse_not)
+
+    def _parse_not(self) -> tuple:
+        if self._peek_operator() == 'not':
+            self.pos += 1
+            return ('not', self._parse_not())
+        return self._parse_atom()
+
+    def _parse_atom(self) -> tuple:
+        if self.pos >= len(self.tokens):
+            raise ValueError(f'Unexpected end of formula {self.expr!r}')
+        token = self.tokens[self.pos]
+        self.pos += 1
+
+        if token == '(':
+            node = self._parse_or()
+            if self.pos >= len(self.tokens) or self.tokens[self.pos] != ')':
+                raise ValueError(f'Missing closing parenthesis in formula {self.expr!r}')
+            self.pos += 1
+            return node
+        if token.lower() in _CONSTANTS:
+            return ('const', _CONSTANTS[token.lower()])
+        if token.lower() in _OPERATORS or token == ')':
+            raise ValueError(f'Unexpected token {token!r} in formula {self.expr!r}')
+        if keyword.iskeyword(token) or token in _RESERVED:
+            raise ValueError(f'Reserved name {token!r} cannot be used as a variable')
+        return ('var', token)
+
+
+@lru_cache(maxsize=1024)
+def parse(expr: str) -> tuple:
+    """
+    Parse a formula string into an AST of nested tuples
+
+    Nodes:
+        ('var', name), ('const', bool), ('not', x),
+        ('and', a, b, ...), ('or', a, b, ...), ('xor', a, b, ...)
+    """
+    return _Parser(expr).parse()
+
+
+def variables_of(node: tuple) -> Tuple[str, ...]:
+    """Return the variables of an AST in order of first appearance"""
+    seen: Dict[str, None] = {}
+
+    def walk(n):
+        if n[0] == 'var':
+            seen.setdefault(n[1], None)
+        elif n[0] != 'const':
+            for child in n[1:]:
+                walk(child)
+
+    walk(node)
+    return tuple(seen)
+
+
+def rename_variables(node: tuple, mapping: Dict[str, str]) -> tuple:
+    """Return a copy of an AST with variables renamed (names not in `mapping` are kept)"""
+    kind = node[0]
+    if kind == 'var':
+        return ('var', mapping.get(node[1], node[1]))
+    if kind == 'const':
+        return node
+    return (kind,) + tuple(rename_variables(child, mapping) for child in node[1:])
+
+
+def format_formula(node: tuple) -> str:
+    """Formula string for an AST, in the syntax `parse` reads"""
+    kind = node[0]
+    if kind == 'var':
+        return node[1]
+    if kind == 'const':
+        return '1' if node[1] else '0'
+    if kind == 'not':
+        return '~' + format_formula(node[1])
+    joiner = {'and': ' & ', 'or': ' | ', 'xor': ' ^ '}[kind]
+    return '(' + joiner.join(format_formula(c) for c in node[1:]) + ')'
+
+
+# ============================================
+# CODE GENERATION
+# ============================================
+
+def _emit_bool(node: tuple) -> str:
+    """Emit Python source using short-circuit boolean operators"""
+    kind = node[0]
+    if kind == 'var':
+        return node[1]
+    if kind == 'const':
+        return 'True' if node[1] else 'False'
+    if kind == 'not':
+        return f'(not {_emit_bool(node[1])})'
+    if kind == 'and':
+        return '(' + ' and '.join(_emit_bool(c) for c in node[1:]) + ')'
+    if kind == 'or':
+        return '(' + ' or '.join(_emit_bool(c) for c in node[1:]) + ')'
+    # xor: chained inequality is not associative, so fold pairwise
+    source = _emit_bool(node[1])
+    for child in node[2:]:
+        source = f'({source} != {_emit_bool(child)})'
+    return source
+
+
+def _emit_bits(node: tuple) -> str:
+    """Emit Python source using bitwise operators on packed integer columns"""
+    kind = node[0]
+    if kind == 'var':
+        return node[1]
+    if kind == 'const':
+        return '_mask' if node[1] else '0'
+    if kind == 'not':
+        return f'(_mask ^ {_emit_bits(node[1])})'
+    joiner = {'and': ' & ', 'or': ' | ', 'xor': ' ^ '}[kind]
+    return '(' + joiner.join(_emit_bits(c) for c in node[1:]) + ')'
+
+
+_EMITTERS = {'bool': _emit_bool, 'bits': _emit_bits}
+
+
+class CompiledProgram:
+    """
+    A compiled sequence of named logic assignments
+
+    `evaluate` is a plain Python function generated from the formulas, so
+    calling it costs one function call plus the operators themselves.
+    For the 'bool' backend it takes one bool per input variable; for the
+    'bits' backend it takes one packed integer per variable plus `_mask`.
+    """
+
+    __slots__ = ('variables', 'outputs', 'formulas', 'backend', 'source', 'evaluate')
+
+    def __init__(self, variables, outputs, formulas, backend, source, evaluate):
+        self.variables = variables
+        self.outputs = outputs
+        self.formulas = formulas
+        self.backend = backend
+        self.source = source
+        self.evaluate = evaluate
+
+    def __repr__(self):
+        return f'CompiledProgram(variables={self.variables}, outputs={self.outputs}, backend={self.backend!r})'
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(variables: Tuple[str, ...], assignments: Tuple[Tuple[str, str], ...],
+                    backend: str) -> CompiledProgram:
+    emit = _EMITTERS[backend]
+    known = set(variables)
+    lines = []
+    outputs = []
+
+    for name in variables:
+        if not _NAME_RE.match(name) or keyword.iskeyword(name) or name in _RESERVED:
+            raise ValueError(f'Invalid variable name {name!r}')
+
+    for name, expr in assignments:
+        if not _NAME_RE.match(name) or keyword.iskeyword(name) or name in _RESERVED:
+            raise ValueError(f'Invalid output name {name!r}')
+        node = parse(expr)
+        unknown = [v for v in variables_of(node) if v not in known]
+        if unknown:
+            raise ValueError(f'Unknown variable(s) {", ".join(unknown)} in formula {expr!r}')
+        lines.append(f'    {name} = {emit(node)}')
+        known.add(name)
+        outputs.append(name)
+
+    params = list(variables) + (['_mask'] if backend == 'bits' else [])
+    returned = outputs[0] if len(outputs) == 1 else '(' + ', '.join(outputs) + ',)'
+    source = (
+        f'def _program({", ".join(params)}):\n'
+        + '\n'.join(lines) + '\n'
+        + f'    return {returned}\n'
+    )
+    namespace: Dict[str, object] = {}
+    exec(compile(source, '<logic_engine>', 'exec'), namespace)
+
+    return CompiledProgram(variables, tuple(outputs), dict(assignments), backend,
+                           source, namespace['_program'])
+
+
+def compile_program(variables: Sequence[str], assignments: Sequence[Tuple[str, str]],
+                    backend: str = 'bool') -> CompiledProgram:
+    """
+    Compile named formulas into one function (cached)
+
+    Args:
+        variables: Input variable names, in argument order
+        assignments: (name, formula) pairs; later formulas may use earlier names
+        backend: 'bool' for single scenarios, 'bits' for packed bit columns
+
+    Returns:
+        CompiledProgram whose `evaluate` returns the outputs as a tuple
+        (or a single value when there is only one assignment)
+
+    Example:
+        >>> flood = compile_program(('p', 'q', 'r'), [('q_or_r', 'q | r'), ('result', 'p & q_or_r')])
+        >>> flood.evaluate(True, False, True)
+        (True, True)
+    """
+    if backend not in _EMITTERS:
+        raise ValueError(f'Unknown backend {backend!r}')
+    if isinstance(assignments, dict):
+        assignments = assignments.items()
+    return _compile_cached(tuple(variables), tuple((n, e) for n, e in assignments), backend)
+
+
+def compile_formula(expr: str, variables: Sequence[str] = None,
+                    backend: str = 'bool') -> CompiledProgram:
+    """
+    Compile a single formula (cached)
+
+    Variables default to their order of first appearance in the formula.
+    """
+    if variables is None:
+        variables = variables_of(parse(expr))
+    return compile_program(variables, [('result', expr)], backend)
+
+
+# ============================================
+# BIT-PARALLEL TRUTH TABLES
+# ============================================
+
+# 2^26 rows = 8 MB per packed column; larger tables need the BDD engine
+MAX_TRUTH_TABLE_VARIABLES = 26
+
+# Rows are decoded from the packed columns in chunks of this many bits
+_ROW_CHUNK_BITS = 4096
+
+
+def pack_bits(values: Sequence[bool]) -> int:
+    """Pack a sequence of booleans into an int column (item i -> bit i)"""
+    if not values:
+        return 0
+    return int(''.join(['1' if v else '0' for v in reversed(values)]), 2)
+
+
+def unpack_bits(bits: int, size: int) -> List[bool]:
+    """Unpack an int column into a list of `size` booleans (bit i -> item i)"""
+    if size == 0:
+        return []
+    text = format(bits, f'0{size}b')[::-1]
+    return [c == '1' for c in text[:size]]
+
+
+def variable_column(index: int, count: int) -> int:
+    """
+    Packed column for variable `index` of `count` in truth-table order
+
+    The first variable is the most significant bit of the row number,
+    matching the existing `p = bool(i & 4)` convention.
+    """
+    size = 1 << count
+    block = 1 << (count - 1 - index)
+    column = ((1 << block) - 1) << block
+    width = block << 1
+    while width < size:
+        column |= column << width
+        width <<= 1
+    return column
+
+
+class TruthTable:
+    """
+    Truth table stored column-wise as packed integers
+
+    Every output column is computed with one bitwise pass of the compiled
+    program; row dicts are only built when `rows()` is iterated.
+    """
+
+    def __init__(self, variables: Tuple[str, ...], outputs: Tuple[str, ...], columns: Dict[str, int]):
+        self.variables = variables
+        self.outputs = outputs
+        self.columns = columns
+        self.size = 1 << len(variables)
+        self._column_bytes: Dict[str, bytes] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def count(self, output: str = 'result') -> int:
+        """Number of rows where `output` is true"""
+        return self.columns[output].bit_count()
+
+    def _bytes(self, output: str) -> bytes:
+        data = self._column_bytes.get(output)
+        if data is None:
+            data = self.columns[output].to_bytes((self.size + 7) // 8, 'little')
+            self._column_bytes[output] = data
+        return data
+
+    def _row(self, i: int, chunks: Dict[str, int], base: int) -> dict:
+        n = len(self.variables)
+        row = {name: bool((i >> (n - 1 - k)) & 1) for k, name in enumerate(self.variables)}
+        for name in self.outputs:
+            row[name] = bool((chunks[name] >> (i - base)) & 1)
+        return row
+
+    def _chunk(self, output: str, start: int) -> int:
+        return int.from_bytes(self._bytes(output)[start // 8:(start + _ROW_CHUNK_BITS) // 8], 'little')
+
+    def rows(self, offset: int = 0, limit: int = None, only_true: bool = False,
+             output: str = 'result'):
+        """
+        Iterate rows as dicts, decoding one chunk of columns at a time
+
+        Args:
+            offset: Number of (filtered) rows to skip
+            limit: Maximum number of rows to yield (None = all)
+            only_true: Only yield rows where `output` is true
+            output: Column used by the `only_true` filter
+        """
+        if limit is not None and limit <= 0:
+            return
+        remaining = limit
+        skip = max(offset, 0)
+
+        if only_true:
+            start = 0
+        else:
+            # Jump straight to the chunk containing the first requested row
+            start = min(skip, self.size) // _ROW_CHUNK_BITS * _ROW_CHUNK_BITS
+            skip -= start
+
+        for base in range(start, self.size, _ROW_CHUNK_BITS):
+            end = min(base + _ROW_CHUNK_BITS, self.size)
+            chunks = {name: self._chunk(name, base) & ((1 << (end - base)) - 1) for name in self.outputs}
+
+            if only_true:
+                bits = chunks[output]
+                if not bits:
+                    continue
+                found = bits.bit_count()
+                if skip >= found:
+                    skip -= found
+                    continue
+                while bits:
+                    low = bits & -bits
+                    bits ^= low
+                    if skip:
+                        skip -= 1
+                        continue
+                    yield self._row(base + low.bit_length() - 1, chunks, base)
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining == 0:
+                            return
+            else:
+                for i in range(base + skip, end):
+                    yield self._row(i, chunks, base)
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining == 0:
+                            return
+                skip = 0
+
+
+def build_truth_table(variables: Sequence[str], assignments: Sequence[Tuple[str, str]]) -> TruthTable:
+    """
+    Evaluate a program over all 2^n input combinations in one bitwise pass
+
+    Args:
+        variables: Input variable names (first = most significant)
+        assignments: (name, formula) pairs, as for compile_program
+
+    Returns:
+        TruthTable with one packed column per output
+    """
+    variables = tuple(variables)
+    count = len(variables)
+    if count > MAX_TRUTH_TABLE_VARIABLES:
+        raise ValueError(f'Truth table limited to {MAX_TRUTH_TABLE_VARIABLES} variables (got {count})')
+
+    program = compile_program(variables, assignments, backend='bits')
+    mask = (1 << (1 << count)) - 1
+    inputs = [variable_column(k, count) for k in range(count)]
+    values = program.evaluate(*inputs, mask)
+    if len(program.outputs) == 1:
+        values = (values,)
+    return TruthTable(variables, program.outputs, dict(zip(program.outputs, values)))
+
+
+def evaluate_batch(variables: Sequence[str], assignments: Sequence[Tuple[str, str]],
+                   columns: Dict[str, Sequence[bool]], size: int) -> Dict[str, List[bool]]:
+    """
+    Evaluate a program for many scenarios in one bitwise pass
+
+    Args:
+        variables: Input variable names
+        assignments: (name, formula) pairs, as for compile_program
+        columns: One sequence of booleans per variable (missing = all False)
+        size: Number of scenarios
+
+    Returns:
+        Dictionary of output name -> list of booleans, in scenario order
+    """
+    program = compile_program(variables, assignments, backend='bits')
+    packed = []
+    for name in program.variables:
+        column = columns.get(name)
+        if column is None:
+            packed.append(0)
+        elif len(column) != size:
+            raise ValueError(f'Column {name!r} has {len(column)} values, expected {size}')
+        else:
+            packed.append(pack_bits(column))
+
+    values = program.evaluate(*packed, (1 << size) - 1)
+    if len(program.outputs) == 1:
+        values = (values,)
+    return {name: unpack_bits(value, size) for name, value in zip(program.outputs, values)}
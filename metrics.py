@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrik Prometheus (/metrics)
+Histogram latency request per route, gauge request yang sedang berjalan,
+latency dan jumlah error panggilan OpenWeatherMap per endpoint, serta hit
+ratio cache. Setiap thread menulis ke tabel counternya sendiri tanpa lock;
+tabel-tabel itu baru dijumlahkan saat /metrics di-scrape, sehingga biaya
+per request di route /api/calculate* hanya beberapa mikrodetik.
+"""
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flask import request
+
+# Upper bounds (seconds) of the request and upstream latency buckets
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UPSTREAM_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Route label of requests that matched no URL rule (404s, probes)
+UNMATCHED_ROUTE = 'unmatched'
+
+# (metric name, type, help, series kind, label names) of the recorded families
+_FAMILIES = (
+    ('http_requests_in_flight', 'gauge', 'Requests being handled, by route',
+     'in_flight', ('route',)),
+    ('http_requests_total', 'counter', 'Finished requests by route, method and status',
+     'requests', ('route', 'method', 'status')),
+    ('http_request_duration_seconds', 'histogram', 'Request latency until the response body is sent',
+     'request', ('route', 'method')),
+    ('upstream_request_duration_seconds', 'histogram', 'OpenWeatherMap call latency (retries included)',
+     'upstream', ('endpoint',)),
+    ('upstream_requests_total', 'counter', 'OpenWeatherMap calls by endpoint and status ("error": no response)',
+     'upstream_requests', ('endpoint', 'status')),
+    ('upstream_errors_total', 'counter', 'Failed OpenWeatherMap calls by endpoint and reason',
+     'upstream_errors', ('endpoint', 'reason')),
+    ('cache_lookups_total', 'counter', 'Lookups of caches without their own counters, by result',
+     'cache_lookups', ('cache', 'result')),
+)
+
+
+def _merge(into: Dict, table: Dict):
+    """Add the series of `table` to `into` (copying, never aliasing lists)"""
+    for key, values in list(table.items()):
+        total = into.get(key)
+        if total is None:
+            into[key] = list(values)
+        else:
+            for i, value in enumerate(list(values)):
+                total[i] += value
+
+
+class _Shards:
+    """
+    Per-thread series tables, summed when read
+
+    Each thread only ever writes its own table, so an update is a plain
+    list increment with no lock (and no lost updates under the GIL). The
+    lock is taken when a thread first records, when a finished thread's
+    table is folded into the retired totals, and while reading.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tables: Dict[int, Dict] = {}
+        self._retired: Dict = {}
+
+    def table(self) -> Dict:
+        try:
+            return self._local.table
+        except AttributeError:
+            return self._register()
+
+    def _register(self) -> Dict:
+        table: Dict = {}
+        with self._lock:
+            self._tables[id(table)] = table
+        self._local.table = table
+        # Threaded servers start one thread per request: fold the table
+        # into the retired totals when its thread is gone
+        weakref.finalize(threading.current_thread(), self._retire, table)
+        return table
+
+    def _retire(self, table: Dict):
+        with self._lock:
+            if self._tables.pop(id(table), None) is not None:
+                _merge(self._retired, table)
+
+    def snapshot(self) -> Dict:
+        """{(kind, labels): summed values} over every table"""
+        total: Dict = {}
+        with self._lock:
+            for table in [self._retired, *self._tables.values()]:
+                _merge(total, table)
+        return total
+
+    def threads(self) -> int:
+        return len(self._tables)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def upstream_error_reason(status: Optional[int], error: Optional[BaseException]) -> Optional[str]:
+    """'timeout', 'connection', 'http_5xx', 'http_4xx' or None for a successful call"""
+    if error is not None:
+        if isinstance(error, TimeoutError) or 'Timeout' in type(error).__name__:
+            return 'timeout'
+        return 'connection'
+    if status >= 500:
+        return 'http_5xx'
+    if status >= 400:
+        return 'http_4xx'
+    return None
+
+
+def lru_cache_stats(function) -> Callable[[], Dict[str, int]]:
+    """Stats callable for add_cache() from a functools.lru_cache wrapper"""
+    def stats():
+        info = function.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+    return stats
+
+
+class Metrics:
+    """
+    Process-wide request, upstream and cache metrics in Prometheus text format
+
+    Example:
+        METRICS.install(app)                        # request histograms and gauges
+        METRICS.observe_upstream('weather', 0.21, status=200)
+        METRICS.add_cache('weather', lambda: {'hits': 9, 'misses': 1, 'size': 1})
+        body = METRICS.render()
+    """
+
+    def __init__(self, request_buckets: Sequence[float] = REQUEST_BUCKETS,
+                 upstream_buckets: Sequence[float] = UPSTREAM_BUCKETS):
+        self.buckets = {'request': tuple(request_buckets), 'upstream': tuple(upstream_buckets)}
+        self._shards = _Shards()
+        self._caches: Dict[str, Callable[[], Dict[str, int]]] = {}
+        self._collectors: List[Tuple[str, str, str, Tuple[str, ...], Callable[[], Iterable]]] = []
+
+    # ---- recording (lock-free, this thread's table only) ----
+
+    def _series(self, key: Tuple, size: int, table: Optional[Dict] = None) -> List:
+        if table is None:
+            table = self._shards.table()
+        series = table.get(key)
+        if series is None:
+            series = table[key] = [0] * size
+        return series
+
+    def _observe(self, kind: str, labels: Tuple, value: float, table: Optional[Dict] = None):
+        buckets = self.buckets[kind]
+        # One slot per bucket, then +Inf, sum and count
+        series = self._series((kind, labels), len(buckets) + 3, table)
+        series[bisect_left(buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def request_started(self, route: str):
+        self._series(('in_flight', (route,)), 1)[0] += 1
+
+    def request_finished(self, route: str, method: str, status: int, seconds: float):
+        table = self._shards.table()
+        self._series(('in_flight', (route,)), 1, table)[0] -= 1
+        self._series(('requests', (route, method, str(status))), 1, table)[0] += 1
+        self._observe('request', (route, method), seconds, table)
+
+    def observe_upstream(self, endpoint: str, seconds: float, status: Optional[int] = None,
+                         error: Optional[BaseException] = None):
+        """One upstream call: its HTTP status, or the exception when no response came"""
+        self._observe('upstream', (endpoint,), seconds)
+        self._series(('upstream_requests', (endpoint, 'error' if error is not None else str(status))), 1)[0] += 1
+        reason = upstream_error_reason(status, error)
+        if reason is not None:
+            self._series(('upstream_errors', (endpoint, reason)), 1)[0] += 1
+
+    def cache_lookup(self, cache: str, hit: bool):
+        """Count a lookup of a cache that keeps no counters itself"""
+        self._series(('cache_lookups', (cache, 'hit' if hit else 'miss')), 1)[0] += 1
+
+    # ---- scrape-time sources ----
+
+    def add_cache(self, name: str, stats: Callable[[], Dict[str, int]]):
+        """Report a cache from its own counters: `stats()` returns hits, misses and optionally size"""
+        self._caches[name] = stats
+
+    def add_collector(self, name: str, kind: str, help_text: str, label_names: Sequence[str],
+                      samples: Callable[[], Iterable[Tuple[Sequence[Any], float]]]):
+        """Family computed at scrape time: `samples()` yields (label values, value)"""
+        self._collectors.append((name, kind, help_text, tuple(label_names), samples))
+
+    # ---- Flask integration ----
+
+    def install(self, app):
+        """Record every request of `app` (route = URL rule, so ids in paths do not add series)"""
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _before_request(self):
+        req = request._get_current_object()
+        rule = req.url_rule
+        route = rule.rule if rule is not None else UNMATCHED_ROUTE
+        req.environ['metrics.start'] = (route, time.perf_counter())
+        self.request_started(route)
+
+    def _after_request(self, response):
+        req = request._get_current_object()
+        started = req.environ.pop('metrics.start', None)
+        if started is None:
+            return response
+        route, start = started
+        method, status = req.method, response.status_code
+
+        # Runs when the server closes the response, after a streamed body too
+        def finished():
+            self.request_finished(route, method, status, time.perf_counter() - start)
+
+        response.call_on_close(finished)
+        return response
+
+    # ---- exposition ----
+
+    def _cache_lines(self, lookups: Dict[str, List[int]]) -> List[str]:
+        caches: Dict[str, Dict[str, int]] = {}
+        for name, stats in list(self._caches.items()):
+            caches[name] = stats()
+        for name, (hits, misses) in lookups.items():
+            caches.setdefault(name, {'hits': hits, 'misses': misses})
+
+        families = (
+            ('cache_hits_total', 'counter', 'Cache hits', lambda s: s['hits']),
+            ('cache_misses_total', 'counter', 'Cache misses', lambda s: s['misses']),
+            ('cache_hit_ratio', 'gauge', 'Hits / lookups since start',
+             lambda s: round(s['hits'] / (s['hits'] + s['misses']), 4) if s['hits'] + s['misses'] else 0.0),
+            ('cache_entries', 'gauge', 'Entries currently cached', lambda s: s.get('size')),
+        )
+        lines = []
+        for name, kind, help_text, value_of in families:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            for cache in sorted(caches):
+                value = value_of(caches[cache])
+                if value is not None:
+                    lines.append(f'{name}{_labels(("cache",), (cache,))} {_number(value)}')
+        return lines
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format (0.0.4)"""
+        snapshot = self._shards.snapshot()
+        by_kind: Dict[str, List] = {}
+        for (kind, labels), values in snapshot.items():
+            by_kind.setdefault(kind, []).append((labels, values))
+
+        lines = []
+        for name, kind, help_text, series_kind, label_names in _FAMILIES:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            for labels, values in sorted(by_kind.get(series_kind, ())):
+                if kind != 'histogram':
+                    lines.append(f'{name}{_labels(label_names, labels)} {_number(values[0])}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets[series_kind] + (float('inf'),), values[:-2]):
+                    cumulative += count
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f'{name}_bucket{_labels(label_names, labels, le)} {cumulative}')
+                lines.append(f'{name}_sum{_labels(label_names, labels)} {_number(values[-2])}')
+                lines.append(f'{name}_count{_labels(label_names, labels)} {values[-1]}')
+
+        lookups: Dict[str, List[int]] = {}
+        for (cache, result), values in by_kind.get('cache_lookups', ()):
+            lookups.setdefault(cache, [0, 0])[result == 'miss'] += values[0]
+        lines += self._cache_lines(lookups)
+
+        for name, kind, help_text, label_names, samples in self._collectors:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            for labels, value in samples():
+                lines.append(f'{name}{_labels(label_names, labels)} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# Shared by both apps, the upstream layers and the ASGI server
+METRICS = Metrics()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Minimisasi Formula Logika (Quine–McCluskey)
+Aturan risiko yang ditulis panjang (atau sebagai daftar minterm tabel
+kebenaran) direduksi menjadi bentuk dua tingkat minimal: sum-of-products
+dari f, atau product-of-sums lewat SOP dari ¬f, mana yang butuh lebih
+sedikit gerbang. Hasil di-cache per formula, dan evaluator terkompilasi
+memakai bentuk minimal hanya jika memang lebih kecil dari formula asli.
+
+Contoh:
+    >>> minimize('p & q & r | p & q & ~r | p & ~q & r').formula
+    'p & (q | r)'
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from logic_engine import build_truth_table, parse, variables_of
+
+# Two-level minimization is exponential in the worst case; larger rules are
+# left as written (the BDD engine analyzes them without a truth table)
+MAX_MINIMIZE_VARIABLES = 10
+
+# Covers left after the essential primes are searched exactly up to this many
+# minterms (bounded by the node budget); larger ones keep the greedy cover
+_EXACT_COVER_MINTERMS = 64
+_COVER_SEARCH_BUDGET = 20000
+
+# An implicant is (value, mask): bits in `mask` are don't-care, and bit
+# (n - 1 - k) belongs to variable k, as in the truth-table row numbers
+Implicant = Tuple[int, int]
+
+
+def gate_count(node: tuple) -> int:
+    """Two-input gates plus inverters needed for an AST (constants and variables are free)"""
+    kind = node[0]
+    if kind in ('var', 'const'):
+        return 0
+    if kind == 'not':
+        return 1 + gate_count(node[1])
+    return len(node) - 2 + sum(gate_count(child) for child in node[1:])
+
+
+def prime_implicants(count: int, ones: Iterable[int], dont_cares: Iterable[int] = ()) -> List[Implicant]:
+    """All prime implicants of the function that is TRUE on `ones` (Quine–McCluskey merging)"""
+    current = {(m, 0) for m in set(ones) | set(dont_cares)}
+    bits = [1 << k for k in range(count)]
+    primes = set()
+    while current:
+        merged = set()
+        following = set()
+        for value, mask in current:
+            # Each term merges with its partner that has one more free-bit set
+            for bit in bits:
+                if not (value | mask) & bit and (value | bit, mask) in current:
+                    following.add((value, mask | bit))
+                    merged.add((value, mask))
+                    merged.add((value | bit, mask))
+        primes |= current - merged
+        current = following
+    return sorted(primes, key=lambda p: (-p[1].bit_count(), p))
+
+
+def _expand(implicant: Implicant) -> List[int]:
+    """Minterms covered by an implicant"""
+    value, mask = implicant
+    minterms = [value]
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        minterms += [m | bit for m in minterms]
+    return minterms
+
+
+def _literals(implicant: Implicant, count: int) -> int:
+    return count - implicant[1].bit_count()
+
+
+def select_cover(count: int, ones: Iterable[int], primes: Sequence[Implicant]) -> List[Implicant]:
+    """
+    Small set of primes covering every minterm (fewest terms, then literals)
+
+    Essential primes are taken first, then greedily the prime covering the
+    most remaining minterms. When few minterms are left a bounded
+    branch-and-bound replaces the greedy choice, so small rules get an
+    exact cover.
+    """
+    remaining = set(ones)
+    covers = {p: remaining.intersection(_expand(p)) for p in primes}
+    covering: Dict[int, List[Implicant]] = {m: [] for m in remaining}
+    for prime, minterms in covers.items():
+        for m in minterms:
+            covering[m].append(prime)
+
+    chosen = []
+    for candidates in covering.values():
+        if len(candidates) == 1 and candidates[0] not in chosen:
+            chosen.append(candidates[0])
+    for prime in chosen:
+        remaining -= covers[prime]
+    if not remaining:
+        return chosen
+
+    candidates = [p for p in primes if covers[p] & remaining]
+    greedy = []
+    left = set(remaining)
+    while left:
+        best = max(candidates, key=lambda p: (len(covers[p] & left), -_literals(p, count)))
+        greedy.append(best)
+        left -= covers[best]
+    if len(remaining) > _EXACT_COVER_MINTERMS:
+        return chosen + greedy
+
+    def cost(cover):
+        return len(cover), sum(_literals(p, count) for p in cover)
+
+    best_cover = greedy
+    budget = _COVER_SEARCH_BUDGET
+
+    def search(left: FrozenSet[int], cover: List[Implicant]):
+        nonlocal best_cover, budget
+        if budget <= 0:
+            return
+        budget -= 1
+        if not left:
+            if cost(cover) < cost(best_cover):
+                best_cover = list(cover)
+            return
+        if len(cover) + 1 > len(best_cover):
+            return
+        # Branch on the minterm with the fewest ways to be covered
+        minterm = min(left, key=lambda m: len(covering[m]))
+        for prime in covering[minterm]:
+            cover.append(prime)
+            search(left - covers[prime], cover)
+            cover.pop()
+
+    search(frozenset(remaining), [])
+    return chosen + best_cover
+
+
+def _term(implicant: Implicant, variables: Sequence[str], positive: bool) -> List[str]:
+    value, mask = implicant
+    count = len(variables)
+    literals = []
+    for k, name in enumerate(variables):
+        bit = 1 << (count - 1 - k)
+        if not mask & bit:
+            literals.append(name if bool(value & bit) == positive else f'~{name}')
+    return literals
+
+
+def _ordered(cover: Sequence[Implicant], count: int) -> List[Implicant]:
+    """Terms in reading order: by variable, positive before negated before absent"""
+    def key(implicant):
+        value, mask = implicant
+        return [2 if mask & (1 << (count - 1 - k)) else (0 if value & (1 << (count - 1 - k)) else 1)
+                for k in range(count)]
+    return sorted(cover, key=key)
+
+
+def sop_formula(cover: Sequence[Implicant], variables: Sequence[str]) -> str:
+    """Sum-of-products formula string for a cover"""
+    if not cover:
+        return '0'
+    cover = _ordered(cover, len(variables))
+    terms = [' & '.join(_term(p, variables, True)) or '1' for p in cover]
+    return '1' if '1' in terms else ' | '.join(terms)
+
+
+def pos_formula(cover: Sequence[Implicant], variables: Sequence[str]) -> str:
+    """Product-of-sums formula string for a cover of the complement (De Morgan)"""
+    if not cover:
+        return '1'
+    cover = _ordered(cover, len(variables))
+    clauses = []
+    for p in cover:
+        literals = _term(p, variables, False)
+        if not literals:
+            return '0'
+        clauses.append(literals[0] if len(literals) == 1 else '(' + ' | '.join(literals) + ')')
+    return ' & '.join(clauses)
+
+
+class MinimizedRule:
+    """
+    A rule together with its minimal two-level form
+
+    `formula` is what evaluators should use: the minimal form when it needs
+    fewer gates than the original, otherwise the original text.
+    """
+
+    __slots__ = ('variables', 'original', 'minimized', 'form', 'gates_before', 'gates_after', 'formula')
+
+    def __init__(self, variables, original, minimized, form, gates_before, gates_after):
+        self.variables = variables
+        self.original = original
+        self.minimized = minimized
+        self.form = form
+        self.gates_before = gates_before
+        self.gates_after = gates_after
+        self.formula = minimized if gates_after < gates_before or original is None else original
+
+    def as_dict(self) -> Dict:
+        return {
+            'variables': list(self.variables),
+            'original': self.original,
+            'minimized': self.minimized,
+            'form': self.form,
+            'gates': {'before': self.gates_before, 'after': self.gates_after},
+            'formula': self.formula,
+        }
+
+    def __repr__(self):
+        return (f'MinimizedRule({self.minimized!r}, form={self.form!r}, '
+                f'gates={self.gates_before}->{self.gates_after})')
+
+
+@lru_cache(maxsize=256)
+def _minimize_table(variables: Tuple[str, ...], ones: FrozenSet[int],
+                    dont_cares: FrozenSet[int]) -> Tuple[str, str]:
+    count = len(variables)
+    zeros = set(range(1 << count)) - ones - dont_cares
+    sop = sop_formula(select_cover(count, ones, prime_implicants(count, ones, dont_cares)), variables)
+    pos = pos_formula(select_cover(count, zeros, prime_implicants(count, zeros, dont_cares)), variables)
+    if gate_count(parse(pos)) < gate_count(parse(sop)):
+        return pos, 'pos'
+    return sop, 'sop'
+
+
+def _check_size(variables: Sequence[str]):
+    if len(variables) > MAX_MINIMIZE_VARIABLES:
+        raise ValueError(f'Minimisasi dibatasi {MAX_MINIMIZE_VARIABLES} variabel (formula memiliki {len(variables)})')
+
+
+def minimize_table(variables: Sequence[str], minterms: Iterable[int],
+                   dont_cares: Iterable[int] = ()) -> MinimizedRule:
+    """
+    Minimal formula for a rule given as truth-table rows (cached)
+
+    Args:
+        variables: Input names, first = most significant bit of the row number
+        minterms: Row numbers where the rule is TRUE
+        dont_cares: Rows that may be either (never occur in practice)
+    """
+    variables = tuple(variables)
+    _check_size(variables)
+    ones, dont_cares = frozenset(minterms), frozenset(dont_cares)
+    if any(not 0 <= m < 1 << len(variables) for m in ones | dont_cares):
+        raise ValueError(f'Minterm di luar rentang 0..{(1 << len(variables)) - 1}')
+    minimized, form = _minimize_table(variables, ones - dont_cares, dont_cares)
+    canonical = sop_formula([(m, 0) for m in sorted(ones - dont_cares)], variables)
+    return MinimizedRule(variables, None, minimized, form,
+                         gate_count(parse(canonical)), gate_count(parse(minimized)))
+
+
+@lru_cache(maxsize=256)
+def minimize(formula: str, variables: Optional[Tuple[str, ...]] = None) -> MinimizedRule:
+    """
+    Minimal two-level form of a formula string (cached)
+
+    Variables default to their order of first appearance; variables the
+    rule does not actually depend on disappear from the minimized form.
+    """
+    node = parse(formula)
+    variables = tuple(variables) if variables is not None else variables_of(node)
+    _check_size(variables)
+    column = build_truth_table(variables, [('result', formula)]).columns['result']
+    ones = []
+    while column:
+        low = column & -column
+        ones.append(low.bit_length() - 1)
+        column ^= low
+    minimized, form = _minimize_table(variables, frozenset(ones), frozenset())
+    return MinimizedRule(variables, formula, minimized, form,
+                         gate_count(node), gate_count(parse(minimized)))
+
+
+def minimize_steps(steps: Sequence[Tuple[str, str]]) -> Tuple[Tuple[Tuple[str, str], ...], Dict[str, MinimizedRule]]:
+    """
+    Minimize every step of a program (see logic_engine.compile_program)
+
+    Each step is minimized over the names it references, so outputs of
+    earlier steps stay available. Steps over more than MAX_MINIMIZE_VARIABLES
+    names are kept as written.
+
+    Returns:
+        (steps using the smaller form of each formula, {name: MinimizedRule})
+    """
+    chosen = []
+    report = {}
+    for name, formula in steps:
+        if len(variables_of(parse(formula))) > MAX_MINIMIZE_VARIABLES:
+            chosen.append((name, formula))
+            continue
+        rule = minimize(formula)
+        report[name] = rule
+        chosen.append((name, rule.formula))
+    return tuple(chosen), report
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Solver Mitigasi Biaya Minimum
+Untuk satu kondisi input, cari variabel terkendali mana (mis. q alih fungsi
+lahan, r drainase, b kualitas bangunan, l zona longsor) yang harus diubah
+agar hasil formula menjadi FALSE dengan total biaya paling kecil. Formula
+kecil dipra-hitung untuk setiap kombinasi input dan diindeks dengan bitmask
+(lookup O(1)); formula besar dicari sebagai lintasan biaya minimum pada BDD.
+"""
+
+import math
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from bdd import BDD
+from logic_engine import build_truth_table, unpack_bits
+from precomputed import input_mask
+
+# Formulas up to this many inputs get a full precomputed table (2^n rows)
+MITIGATION_TABLE_VARIABLES = 10
+
+# (total cost, variables to flip), or None when no flip removes the risk
+Plan = Optional[Tuple[float, Tuple[str, ...]]]
+
+
+class MitigationTable:
+    """
+    Cheapest flip set for every combination of inputs, indexed by bitmask
+
+    Args:
+        variables: Input names, in bitmask order (first = most significant)
+        steps: (name, formula) pairs; the last one is the risk
+        costs: {controllable variable: cost of changing it}
+    """
+
+    def __init__(self, variables: Sequence[str], steps: Sequence[Tuple[str, str]], costs: Dict[str, float]):
+        self.variables = tuple(variables)
+        self.costs = dict(costs)
+        table = build_truth_table(self.variables, steps)
+        count = len(self.variables)
+        risk = unpack_bits(table.columns[table.outputs[-1]], 1 << count)
+
+        # Every flip set, cheapest first (ties: fewer changes, then variable order)
+        controllable = [name for name in self.variables if name in self.costs]
+        flips = []
+        for size in range(1, len(controllable) + 1):
+            for names in combinations(controllable, size):
+                mask = 0
+                for name in names:
+                    mask |= 1 << (count - 1 - self.variables.index(name))
+                flips.append((sum(self.costs[name] for name in names), size, names, mask))
+        flips.sort(key=lambda flip: flip[:2])
+
+        entries: List[Plan] = []
+        for row in range(1 << count):
+            plan = (0.0, ()) if not risk[row] else None
+            if plan is None:
+                for cost, _, names, mask in flips:
+                    if not risk[row ^ mask]:
+                        plan = (cost, names)
+                        break
+            entries.append(plan)
+        self.risk = tuple(risk)
+        self.entries = tuple(entries)
+
+    def lookup(self, assignment: Dict[str, bool]) -> Tuple[bool, Plan]:
+        """(risk, plan) for a full assignment of the inputs"""
+        mask = input_mask(assignment, self.variables)
+        return self.risk[mask], self.entries[mask]
+
+
+class MitigationSearch:
+    """
+    The same query for formulas too large to tabulate
+
+    Fixes the uncontrollable inputs, then finds the cheapest path to TRUE in
+    the BDD of ¬risk where keeping a controllable input costs nothing and
+    changing it costs its price.
+    """
+
+    def __init__(self, variables: Sequence[str], steps: Sequence[Tuple[str, str]], costs: Dict[str, float],
+                 max_nodes: Optional[int] = None):
+        self.variables = tuple(variables)
+        self.costs = dict(costs)
+        self.bdd = BDD(self.variables, max_nodes=max_nodes)
+        risk = self.bdd.compile_program(self.variables, steps)[steps[-1][0]]
+        self.risk = risk
+        self.safe = self.bdd.neg(risk)
+
+    def lookup(self, assignment: Dict[str, bool]) -> Tuple[bool, Plan]:
+        values = {name: bool(assignment.get(name, False)) for name in self.variables}
+        at_risk = self.bdd.evaluate(self.risk, values)
+        if not at_risk:
+            return False, (0.0, ())
+        fixed = {name: value for name, value in values.items() if name not in self.costs}
+        weights = {name: (cost if values[name] else 0.0, 0.0 if values[name] else cost)
+                   for name, cost in self.costs.items() if name in values}
+        found = self.bdd.min_cost_sat(self.bdd.restrict(self.safe, fixed), weights)
+        if found is None:
+            return True, None
+        cost, path = found
+        names = tuple(name for name in self.variables if name in path and path[name] != values[name])
+        return True, (cost, names)
+
+
+class MitigationSolver:
+    """
+    Minimum-cost mitigation for one hazard formula
+
+    Uses a MitigationTable (O(1) lookups) up to MITIGATION_TABLE_VARIABLES
+    inputs, MitigationSearch beyond that; `max_nodes` caps the search's BDD
+    (bdd.BDDTooLarge past it).
+    """
+
+    def __init__(self, variables: Sequence[str], steps: Sequence[Tuple[str, str]], costs: Dict[str, float],
+                 max_nodes: Optional[int] = None):
+        unknown = [name for name in costs if name not in variables]
+        if unknown:
+            raise ValueError(f"Variabel terkendali tidak dikenal: {', '.join(unknown)}")
+        costs = {name: float(cost) for name, cost in costs.items()}
+        # NaN compares false with everything, so it would pass a `< 0` check
+        # and then silently break the cheapest-plan ordering
+        invalid = [name for name, cost in costs.items() if not math.isfinite(cost) or cost < 0]
+        if invalid:
+            raise ValueError(f"Biaya harus angka hingga dan tidak negatif: {', '.join(invalid)}")
+        self.variables = tuple(variables)
+        self.costs = costs
+        if len(self.variables) <= MITIGATION_TABLE_VARIABLES:
+            self.method = 'table'
+            self._engine = MitigationTable(variables, steps, costs)
+        else:
+            self.method = 'search'
+            self._engine = MitigationSearch(variables, steps, costs, max_nodes)
+
+    def solve(self, assignment: Dict[str, bool]) -> Dict:
+        """
+        Cheapest changes that make the risk FALSE
+
+        Returns:
+            {'risk', 'achievable', 'cost', 'changes': [{'variable', 'from', 'to', 'cost'}],
+             'method'}
+        """
+        risk, plan = self._engine.lookup(assignment)
+        result = {'risk': bool(risk), 'achievable': plan is not None, 'method': self.method}
+        if plan is None:
+            result.update({'cost': None, 'changes': []})
+            return result
+        cost, names = plan
+        result['cost'] = cost
+        result['changes'] = [
+            {'variable': name, 'from': bool(assignment.get(name, False)),
+             'to': not assignment.get(name, False), 'cost': self.costs[name]}
+            for name in names
+        ]
+        return result
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabel Respons Pra-Hitung
+Semua kombinasi input (8 banjir, 8 gempa, 512 gabungan) dihitung dan
+di-encode ke bytes satu kali, diindeks dengan bitmask input. Endpoint cukup
+melakukan satu lookup lalu menulis bytes yang sudah jadi.
+
+Halaman HTML (template tanpa data per request) dirender sekali dan disimpan
+dalam varian identity, gzip, dan brotli; request memilih varian lewat
+Accept-Encoding, dengan ETag kuat per varian dan Cache-Control.
+
+Tabel dan halaman dapat dibangun saat deploy (build_precomputed.py) dan
+disimpan sebagai satu file; saat cold start file itu dimuat alih-alih
+menghitung ulang, selama sidik jarinya (hash file sumber) masih cocok dengan
+kode, template, dan aturan saat ini.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import pickle
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from flask import Flask, current_app, render_template, request
+from flask.json.provider import JSONProvider
+
+logger = logging.getLogger(__name__)
+
+# Cache-Control of pre-rendered pages; clients revalidate with the ETag after it
+PAGE_CACHE_CONTROL = os.getenv('PAGE_CACHE_CONTROL', 'public, max-age=300')
+
+
+def input_mask(data: Dict, variables: Sequence[str]) -> int:
+    """
+    Build the bitmask of a JSON body (first variable = most significant bit)
+
+    Uses the same truthiness as `bool(data.get(name, False))`.
+    """
+    mask = 0
+    for name in variables:
+        mask = (mask << 1) | (1 if data.get(name, False) else 0)
+    return mask
+
+
+class ResponseTable:
+    """
+    Pre-serialized JSON responses for every combination of boolean inputs
+
+    Args:
+        variables: Input names, in bitmask order
+        build_payload: Function taking one bool per variable, returning a dict
+        json_provider: The app's JSON provider (`app.json`), so bodies are
+            byte-identical to what `jsonify` would produce. Without it the
+            table stays empty until `bind` (app factories).
+        name: Key of the table in a PrecomputedStore
+    """
+
+    def __init__(self, variables: Sequence[str], build_payload: Callable[..., Dict],
+                 json_provider: Optional[JSONProvider] = None, name: str = None):
+        self.variables = tuple(variables)
+        self.build_payload = build_payload
+        self.json_provider = json_provider
+        self.name = name
+        self.entries: Tuple[Tuple[bytes, str], ...] = ()
+        if json_provider is not None:
+            self.rebuild()
+
+    def bind(self, json_provider: JSONProvider, store: 'PrecomputedStore' = None):
+        """Attach the app's JSON provider; take the entries from `store` when it has them"""
+        self.json_provider = json_provider
+        entries = store.get(self.name, len(self.variables)) if store is not None else None
+        if entries is None:
+            self.rebuild()
+        else:
+            self.entries = entries
+
+    def rebuild(self):
+        """Recompute every body and ETag, then swap the table in one assignment"""
+        count = len(self.variables)
+        entries = []
+        for mask in range(1 << count):
+            values = [bool((mask >> (count - 1 - k)) & 1) for k in range(count)]
+            body = self.json_provider.response(self.build_payload(*values)).get_data()
+            entries.append((body, hashlib.sha1(body).hexdigest()))
+        self.entries = tuple(entries)
+
+    def lookup(self, data: Dict) -> Tuple[bytes, str]:
+        """Return (body, etag) for a request body"""
+        return self.entries[input_mask(data, self.variables)]
+
+    def respond(self, data: Dict):
+        """
+        Serve the pre-encoded response for `data`
+
+        Sends `304 Not Modified` when the client already holds the same ETag.
+        """
+        body, etag = self.entries[input_mask(data, self.variables)]
+        if etag in request.if_none_match:
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(body, mimetype='application/json')
+        response.headers['ETag'] = f'"{etag}"'
+        return response
+
+
+def compress_variants(body: bytes, best: bool = False) -> Dict[str, bytes]:
+    """
+    {'identity', 'gzip', 'br'} encodings of `body`
+
+    `best` uses maximum compression (brotli quality 11 takes ~0.6 s for the
+    250 KB enhanced page: deploy time only); startup uses fast levels.
+    Brotli is optional: without the package only gzip is offered.
+    """
+    variants = {'identity': body, 'gzip': gzip.compress(body, 9 if best else 6, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        return variants
+    variants['br'] = brotli.compress(body, quality=11 if best else 5)
+    return variants
+
+
+class StaticPage:
+    """
+    A template rendered once and served pre-compressed
+
+    Variants are negotiated from Accept-Encoding (br, then gzip, then
+    identity). Each variant has its own strong ETag; a matching
+    If-None-Match gets `304 Not Modified`.
+
+    Args:
+        template: Template name; it must not depend on the request
+        name: Key of the page in a PrecomputedStore
+    """
+
+    # Preference order when the client accepts several encodings equally
+    ENCODINGS = ('br', 'gzip', 'identity')
+
+    def __init__(self, template: str, name: str = None, cache_control: str = PAGE_CACHE_CONTROL):
+        self.template = template
+        self.name = name or template
+        self.cache_control = cache_control
+        self.variants: Dict[str, Tuple[bytes, str]] = {}
+        self._encodings: Tuple[str, ...] = ()
+
+    def bind(self, app: Flask, store: 'PrecomputedStore' = None):
+        """Take the variants from `store` when it has them, else render now"""
+        variants = store.pages.get(self.name) if store is not None else None
+        if variants is None:
+            self.render(app)
+        else:
+            self._install(variants)
+
+    def render(self, app: Flask, best: bool = False):
+        """Render the template and rebuild every encoded variant"""
+        with app.app_context():
+            body = render_template(self.template).encode('utf-8')
+        digest = hashlib.sha1(body).hexdigest()
+        self._install({
+            encoding: (data, digest if encoding == 'identity' else f'{digest}-{encoding}')
+            for encoding, data in compress_variants(body, best).items()
+        })
+
+    def _install(self, variants: Dict[str, Tuple[bytes, str]]):
+        self.variants = variants
+        self._encodings = tuple(e for e in self.ENCODINGS if e in variants)
+
+    def respond(self):
+        """Serve the best variant for the request's Accept-Encoding"""
+        encoding = request.accept_encodings.best_match(self._encodings) or 'identity'
+        body, etag = self.variants[encoding]
+        if etag in request.if_none_match:
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(body, mimetype='text/html')
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.headers['ETag'] = f'"{etag}"'
+        response.headers['Cache-Control'] = self.cache_control
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+def fingerprint(paths: Iterable[str], environment: Iterable[str] = ()) -> str:
+    """SHA-1 over the contents of `paths` (order matters; missing files count too) and `environment`"""
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            digest.update(b'<missing>')
+        digest.update(b'\0')
+    for value in environment:
+        digest.update(value.encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+
+class PrecomputedStore:
+    """
+    Response tables and pages built ahead of time (at deploy), loaded at startup
+
+    Args:
+        path: Artifact file written by `save`
+        sources: Files the tables and pages are derived from (code, template
+            and rule files). The artifact is only used when it was built from
+            exactly these contents; otherwise they are computed as usual.
+        environment: Runtime details the encoded bytes depend on (such as
+            the JSON backend and its version), compared the same way.
+    """
+
+    def __init__(self, path: str, sources: Sequence[str], environment: Sequence[str] = ()):
+        self.path = path
+        self.fingerprint = fingerprint(sources, environment)
+        self.tables: Dict[str, Tuple[Tuple[bytes, str], ...]] = {}
+        self.pages: Dict[str, Dict[str, Tuple[bytes, str]]] = {}
+        self.loaded = self._load()
+
+    def _load(self) -> bool:
+        try:
+            with open(self.path, 'rb') as f:
+                document = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception:
+            logger.exception('Precomputed file %s unreadable, computing tables at startup', self.path)
+            return False
+        if document.get('fingerprint') != self.fingerprint:
+            logger.info('Precomputed file %s is stale, computing tables at startup', self.path)
+            return False
+        self.tables = document['tables']
+        self.pages = document.get('pages', {})
+        return True
+
+    def get(self, name: str, count: int) -> Optional[Tuple[Tuple[bytes, str], ...]]:
+        """Entries of table `name` over `count` variables, or None"""
+        entries = self.tables.get(name)
+        if entries is None or len(entries) != 1 << count:
+            return None
+        return entries
+
+    def save(self, tables: Iterable[ResponseTable], pages: Iterable[StaticPage] = ()):
+        """Write the entries of `tables` and `pages` (atomically replacing the artifact)"""
+        document = {
+            'fingerprint': self.fingerprint,
+            'tables': {table.name: table.entries for table in tables},
+            'pages': {page.name: page.variants for page in pages},
+        }
+        temp = f'{self.path}.tmp'
+        with open(temp, 'wb') as f:
+            pickle.dump(document, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, self.path)
+        self.tables = document['tables']
+        self.pages = document['pages']
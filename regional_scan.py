@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pemindaian Risiko Banjir Regional
+Menilai banyak wilayah sekaligus: cuaca tiap wilayah diambil paralel dengan
+batas konkurensi, p (curah hujan tinggi) bernilai TRUE bila tingkat
+flood_risk cuaca saat ini 'high' (ambang yang sama dengan /api/weather), q dan
+r diambil dari data wilayah (data/region_flags.csv), lalu formula banjir
+p ∧ (q ∨ r) dievaluasi. Hasil tiap wilayah dikirim segera setelah selesai,
+tidak menunggu wilayah paling lambat.
+
+CLI (NDJSON ke stdout, satu baris per wilayah + satu baris ringkasan):
+    python regional_scan.py --state Aceh --concurrency 8
+    python regional_scan.py "Aceh Barat" "Nagan Raya"
+"""
+
+import csv
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+from forecast_timeline import flood_risk_level
+from gazetteer import GazetteerIndex, normalize
+
+DEFAULT_REGION_FLAGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         'data', 'region_flags.csv')
+
+# Weather fetches running at once per scan, and the largest accepted scan
+SCAN_CONCURRENCY = int(os.getenv('SCAN_CONCURRENCY', '8'))
+MAX_SCAN_CONCURRENCY = 32
+MAX_SCAN_REGIONS = 1000
+
+
+def parse_flag(value: str = None):
+    """Optional boolean query parameter: None when absent"""
+    if value is None or value == '':
+        return None
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _request_flag(spec: Dict, name: str):
+    """q/r of a requested region: JSON boolean, 0/1 or a parse_flag string; None when absent"""
+    value = spec.get(name)
+    if isinstance(value, str):
+        return parse_flag(value.strip())
+    return None if value is None else bool(value)
+
+
+def load_region_flags(path: str = DEFAULT_REGION_FLAGS_FILE) -> Dict[str, Dict]:
+    """
+    Load stored per-region q/r flags (CSV: name,state,q,r)
+
+    Returns:
+        {normalized name: {'name', 'state', 'q', 'r'}}
+    """
+    flags = {}
+    with open(path, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            flags[normalize(row['name'])] = {
+                'name': row['name'],
+                'state': row.get('state', ''),
+                'q': row['q'].strip() in ('1', 'true', 'True'),
+                'r': row['r'].strip() in ('1', 'true', 'True'),
+            }
+    return flags
+
+
+def resolve_regions(requested: Sequence[Union[str, Dict]], flags: Dict[str, Dict],
+                    gazetteer: GazetteerIndex) -> List[Dict]:
+    """
+    Turn requested regions into scan targets with coordinates and q/r
+
+    Each item is a name (coordinates from the gazetteer, q/r from the stored
+    flags) or a dict {'name', 'lat'?, 'lon'?, 'q'?, 'r'?} overriding either.
+    Targets that cannot be located carry an 'error' instead of coordinates.
+    """
+    targets = []
+    for item in requested:
+        spec = {'name': item} if isinstance(item, str) else dict(item)
+        name = str(spec.get('name', '')).strip()
+        stored = flags.get(normalize(name)) if name else None
+        q, r = _request_flag(spec, 'q'), _request_flag(spec, 'r')
+        target = {
+            'name': name,
+            'state': spec.get('state') or (stored['state'] if stored else ''),
+            'q': q if q is not None else (stored['q'] if stored else False),
+            'r': r if r is not None else (stored['r'] if stored else False),
+            'flags': 'request' if q is not None or r is not None else ('stored' if stored else 'default'),
+        }
+        if spec.get('lat') is not None and spec.get('lon') is not None:
+            target['lat'], target['lon'] = float(spec['lat']), float(spec['lon'])
+        else:
+            place = gazetteer.lookup(name, target['state'] or None) if name else None
+            if place is None:
+                target['error'] = f'Wilayah "{name}" tidak ditemukan'
+            else:
+                target['lat'], target['lon'] = place['lat'], place['lon']
+        targets.append(target)
+    return targets
+
+
+def rainfall_p(weather: Dict) -> Tuple[bool, float]:
+    """
+    p (Curah Hujan Tinggi) from the /api/weather document: (p, rainfall mm/jam)
+
+    p is TRUE when the current weather's flood_risk level is 'high', so the
+    scan and /api/weather classify the same weather the same way.
+    """
+    current = weather['current']
+    rainfall = current.get('rain_1h', 0) or 0
+    return flood_risk_level(rainfall, current.get('humidity', 0) or 0) == 'high', rainfall
+
+
+def _scan_one(target: Dict, fetch_weather: Callable[..., Dict],
+              evaluate: Callable[[bool, bool, bool], Tuple[bool, bool]]) -> Dict:
+    result = dict(target)
+    q, r = target['q'], target['r']
+    q_or_r = q or r
+    result['q_or_r'] = q_or_r
+
+    weather = fetch_weather(lat=target['lat'], lon=target['lon'])
+    if not weather.get('success'):
+        # Without rainfall p is unknown, but p ∧ FALSE is FALSE whatever p is
+        result.update({'p': None, 'rainfall': None, 'result': False if not q_or_r else None,
+                       'weather': 'error', 'error': weather.get('error', 'Weather unavailable')})
+        return result
+
+    p, rainfall = rainfall_p(weather)
+    q_or_r, flood = evaluate(p, q, r)
+    result.update({'p': p, 'rainfall': rainfall, 'q_or_r': q_or_r, 'result': flood,
+                   'weather': 'partial' if weather.get('partial') else 'ok'})
+    return result
+
+
+def scan_regions(targets: Sequence[Dict], fetch_weather: Callable[..., Dict],
+                 evaluate: Callable[[bool, bool, bool], Tuple[bool, bool]],
+                 concurrency: int = SCAN_CONCURRENCY) -> Iterator[Dict]:
+    """
+    Evaluate flood risk for every target, yielding results as they complete
+
+    Args:
+        targets: From resolve_regions
+        fetch_weather: get_weather_data(lat=..., lon=...) (cached, coalesced)
+        evaluate: calculate_flood_risk(p, q, r) -> (q_or_r, result)
+        concurrency: Weather fetches in flight at once
+
+    Yields:
+        One dict per target (completion order), then {'summary': {...}}
+    """
+    start = time.monotonic()
+    counts = {'total': len(targets), 'at_risk': 0, 'unknown': 0, 'failed': 0}
+
+    def tally(item: Dict) -> Dict:
+        if item.get('result'):
+            counts['at_risk'] += 1
+        elif item.get('result') is None:
+            counts['unknown'] += 1
+        if 'error' in item:
+            counts['failed'] += 1
+        return item
+
+    located = []
+    for target in targets:
+        if 'error' in target:
+            q_or_r = target['q'] or target['r']
+            yield tally(dict(target, p=None, rainfall=None, q_or_r=q_or_r,
+                             result=False if not q_or_r else None, weather='skipped'))
+        else:
+            located.append(target)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(concurrency, MAX_SCAN_CONCURRENCY)),
+                              thread_name_prefix='region-scan')
+    try:
+        futures = {pool.submit(_scan_one, target, fetch_weather, evaluate): target
+                   for target in located}
+        for future in as_completed(futures):
+            try:
+                yield tally(future.result())
+            except Exception as e:
+                yield tally(dict(futures[future], p=None, rainfall=None, result=None,
+                                 weather='error', error=str(e)))
+    finally:
+        # A client that disconnects mid-stream cancels the regions not started yet
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    counts['elapsed_ms'] = round((time.monotonic() - start) * 1000)
+    yield {'summary': counts}
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Bulk regional flood risk scan (NDJSON output)')
+    parser.add_argument('regions', nargs='*', help='Region names (default: every stored region)')
+    parser.add_argument('--state', help='Only stored regions of this province, e.g. Aceh')
+    parser.add_argument('--concurrency', type=int, default=SCAN_CONCURRENCY)
+    parser.add_argument('--flags', default=DEFAULT_REGION_FLAGS_FILE, help='Region flags CSV')
+    args = parser.parse_args()
+
+    import web_app_enhanced as core
+
+    flags = load_region_flags(args.flags)
+    requested = args.regions or [f['name'] for f in flags.values()
+                                 if not args.state or f['state'].lower() == args.state.lower()]
+    targets = resolve_regions(requested, flags, core.GAZETTEER)
+    for item in scan_regions(targets, core.get_weather_data, core.calculate_flood_risk, args.concurrency):
+        print(json.dumps(item, ensure_ascii=False), flush=True)
+
+
+if __name__ == '__main__':
+    main()
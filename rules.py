@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabel Aturan Rekomendasi
+Rekomendasi dibaca dari file aturan berversi (data/recommendations.json)
+dan diekspansi saat dimuat menjadi tabel immutable yang diindeks bitmask
+input: aturan diperiksa berurutan (aturan pertama yang cocok menang) dan
+variabel yang tidak disebut berlaku sebagai wildcard. Lookup per request
+hanya satu indeks tuple. File dapat diubah saat server berjalan; tabel baru
+dibangun di samping tabel lama lalu ditukar dalam satu assignment, jadi
+request yang sedang berjalan tidak pernah menunggu.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  'data', 'recommendations.json')
+
+# Seconds between checks of the rule file's mtime (0 disables the watcher)
+RULES_RELOAD_INTERVAL = float(os.getenv('RULES_RELOAD_INTERVAL', '5'))
+
+logger = logging.getLogger(__name__)
+
+
+class RuleTable:
+    """
+    Recommendations of one rule set for every input combination
+
+    `entries[mask]` is the recommendation for the inputs whose bitmask is
+    `mask` (first variable = most significant bit, as in ResponseTable).
+    Entries are shared between requests and must not be mutated.
+    """
+
+    __slots__ = ('name', 'version', 'variables', 'entries')
+
+    def __init__(self, name: str, version, variables: Tuple[str, ...], entries: Tuple[Dict, ...]):
+        self.name = name
+        self.version = version
+        self.variables = variables
+        self.entries = entries
+
+    def lookup(self, *values: bool) -> Dict:
+        """Recommendation for one bool per variable, in variable order"""
+        mask = 0
+        for value in values:
+            mask = (mask << 1) | (1 if value else 0)
+        return self.entries[mask]
+
+
+def expand_rules(name: str, spec: Dict, version=None,
+                 outputs: Optional[Callable[..., Dict[str, bool]]] = None) -> RuleTable:
+    """
+    Expand a rule set into a RuleTable
+
+    Args:
+        spec: {'variables': [...], 'rules': [{'when': {...}, 'recommendation': {...}}, ...]}.
+            A condition on a variable is true/false; leaving it out (or '*')
+            matches both. Rules are tried in order, the first match wins.
+        outputs: Optional function of the inputs returning derived values
+            (e.g. {'result': ...}) that conditions may also test
+
+    Raises:
+        ValueError: Unknown condition names, or combinations no rule covers
+    """
+    variables = tuple(spec['variables'])
+    count = len(variables)
+    rows = []
+    for mask in range(1 << count):
+        values = [bool((mask >> (count - 1 - k)) & 1) for k in range(count)]
+        row = dict(zip(variables, values))
+        if outputs is not None:
+            row.update(outputs(*values))
+        rows.append(row)
+
+    entries: List[Optional[Dict]] = [None] * len(rows)
+    for index, rule in enumerate(spec['rules']):
+        when = {key: value for key, value in rule.get('when', {}).items() if value != '*'}
+        unknown = [key for key in when if key not in rows[0]]
+        if unknown:
+            raise ValueError(f"Rule set {name!r}, rule {index}: unknown condition {', '.join(unknown)}")
+        recommendation = rule['recommendation']
+        for mask, row in enumerate(rows):
+            if entries[mask] is None and all(row[key] == bool(value) for key, value in when.items()):
+                entries[mask] = recommendation
+
+    missing = [mask for mask, entry in enumerate(entries) if entry is None]
+    if missing:
+        raise ValueError(f'Rule set {name!r}: no rule covers input mask(s) {missing}')
+    return RuleTable(name, version, variables, tuple(entries))
+
+
+class RuleBook:
+    """
+    All rule sets of one versioned rule file, reloadable at runtime
+
+    Args:
+        path: JSON file {'version': ..., 'rulesets': {name: spec}}
+        rulesets: Names of the rule sets this app uses (default: all)
+        outputs: {rule set name: function of the inputs returning derived
+            values}, e.g. a hazard's result, for conditions on outputs
+
+    Readers call `table(name)` with no locking; a reload swaps the whole
+    {name: RuleTable} dict in one assignment and then runs the on_reload
+    callbacks (e.g. ResponseTable.rebuild). A broken file is logged and the
+    previous tables stay in service; so do they when a callback fails (the
+    callbacks then run again on the previous tables).
+    """
+
+    def __init__(self, path: str = DEFAULT_RULES_FILE, rulesets: Sequence[str] = None,
+                 outputs: Dict[str, Callable[..., Dict[str, bool]]] = None):
+        self.path = path
+        self.rulesets = tuple(rulesets) if rulesets is not None else None
+        self.outputs = dict(outputs or {})
+        self.version = None
+        self.loaded_at = None
+        self.tables: Dict[str, RuleTable] = {}
+        self._mtime = None
+        self._callbacks: List[Callable[[], None]] = []
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self.reload(force=True, strict=True)
+
+    def table(self, name: str) -> RuleTable:
+        return self.tables[name]
+
+    def on_reload(self, callback: Callable[[], None]):
+        """Run `callback` after every reload that installs new tables (and after a rollback)"""
+        self._callbacks.append(callback)
+
+    def _load(self) -> Tuple[object, Dict[str, RuleTable]]:
+        with open(self.path, encoding='utf-8') as f:
+            document = json.load(f)
+        version = document.get('version')
+        specs = document['rulesets']
+        names = self.rulesets if self.rulesets is not None else tuple(specs)
+        missing = [name for name in names if name not in specs]
+        if missing:
+            raise ValueError(f"Rule set(s) missing: {', '.join(missing)}")
+        tables = {name: expand_rules(name, specs[name], version, self.outputs.get(name)) for name in names}
+        return version, tables
+
+    def reload(self, force: bool = False, strict: bool = False) -> bool:
+        """
+        Reload the rule file if it changed (or always with force)
+
+        Returns:
+            True when new tables were installed
+        Raises:
+            Load errors only when `strict` (used for the first load)
+        """
+        with self._reload_lock:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if not force and mtime == self._mtime:
+                    return False
+                # A rejected file is not retried (or logged again) until it changes
+                self._mtime = mtime
+                version, tables = self._load()
+                missing = [name for name in self.tables if name not in tables]
+                if missing:
+                    raise ValueError(f"Rule set(s) removed: {', '.join(missing)}")
+            except Exception:
+                if strict:
+                    raise
+                logger.exception('Rule file %s rejected, keeping version %s', self.path, self.version)
+                return False
+
+            previous = (self.tables, self.version, self.loaded_at)
+            self.tables = tables
+            self.version = version
+            self.loaded_at = time.time()
+            if not self._run_callbacks():
+                # Put the previous tables back and rebuild from them, so every
+                # derived table agrees with the rules in service again
+                self.tables, self.version, self.loaded_at = previous
+                self._run_callbacks()
+                logger.error('Rule file %s version %s not applied, keeping version %s',
+                             self.path, version, self.version)
+                return False
+            logger.info('Loaded rule file %s version %s', self.path, version)
+            return True
+
+    def _run_callbacks(self) -> bool:
+        """Run every on_reload callback, logging failures; False when one failed"""
+        ok = True
+        for callback in self._callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception('Rule reload callback %r failed', callback)
+                ok = False
+        return ok
+
+    def watch(self, interval: float = RULES_RELOAD_INTERVAL):
+        """Poll the file's mtime from a daemon thread (no-op when interval <= 0)"""
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        def poll():
+            while True:
+                time.sleep(interval)
+                # Nothing may end the loop, or hot reload stops for good
+                try:
+                    self.reload()
+                except Exception:
+                    logger.exception('Rule watcher: reload of %s failed', self.path)
+
+        self._watcher = threading.Thread(target=poll, name='rule-watcher', daemon=True)
+        self._watcher.start()
+
+    def status(self) -> Dict:
+        return {
+            'version': self.version,
+            'loaded_at': self.loaded_at,
+            'path': os.path.relpath(self.path, os.path.dirname(os.path.abspath(__file__))),
+            'rulesets': {name: list(table.variables) for name, table in self.tables.items()},
+        }
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Single-Flight Request Coalescing
+Request bersamaan dengan key yang sama berbagi satu panggilan upstream yang
+sedang berjalan: satu thread (leader) memanggil, sisanya menunggu hasilnya.
+AsyncSingleFlight adalah versi asyncio untuk mode ASGI.
+"""
+
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ('event', 'value', 'error', 'waiters')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls per key
+
+    Example:
+        flights = SingleFlight('weather')
+        data = flights.do(('5.55', '95.32'), lambda: fetch(...))
+    """
+
+    def __init__(self, name: str = 'flight'):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._counters = {'calls': 0, 'coalesced': 0, 'errors': 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` once for all concurrent callers with the same `key`
+
+        Every caller receives the leader's return value (the same object, so
+        callers must not mutate it), or the leader's exception is re-raised.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._counters['coalesced'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._counters['calls'] += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._counters['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Upstream calls made, callers that shared one, and in-flight keys"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['in_flight'] = len(self._calls)
+        stats['name'] = self.name
+        return stats
+
+
+class AsyncSingleFlight:
+    """
+    Deduplicate concurrent coroutine calls per key (one event loop)
+
+    The shared call runs as its own task, so a caller that is cancelled
+    (e.g. the client disconnected) does not cancel it for the others.
+
+    Example:
+        flights = AsyncSingleFlight('weather')
+        data = await flights.do(key, lambda: fetch_async(...))
+    """
+
+    def __init__(self, name: str = 'flight'):
+        self.name = name
+        self._calls: Dict[Hashable, 'asyncio.Task'] = {}
+        self._counters = {'calls': 0, 'coalesced': 0, 'errors': 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `fn()` once for all concurrent callers with the same `key`"""
+        # Imported here so the WSGI app (SingleFlight only) starts without asyncio
+        import asyncio
+
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self._counters['calls'] += 1
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self._counters['coalesced'] += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: 'asyncio.Task'):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieving the exception also silences "never retrieved" warnings
+        if not task.cancelled() and task.exception() is not None:
+            self._counters['errors'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Upstream calls made, callers that shared one, and in-flight keys"""
+        stats = dict(self._counters)
+        stats['in_flight'] = len(self._calls)
+        stats['name'] = self.name
+        return stats
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lapisan HTTP Upstream (OpenWeatherMap)
+Satu connection pool bersama (keep-alive) untuk semua panggilan keluar,
+dengan retry ber-jitter untuk 5xx/timeout dan timeout per endpoint.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import METRICS
+
+# (connect, read) timeout per upstream endpoint, in seconds
+UPSTREAM_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    'weather': (3.05, float(os.getenv('WEATHER_TIMEOUT', '5'))),
+    'forecast': (3.05, float(os.getenv('WEATHER_TIMEOUT', '5'))),
+    'geo': (3.05, float(os.getenv('GEO_TIMEOUT', '3'))),
+}
+
+# Connections kept open per upstream host (more may be opened under load, but
+# only this many are kept), and how many retries a GET gets
+UPSTREAM_POOL_SIZE = int(os.getenv('UPSTREAM_POOL_SIZE', '20'))
+UPSTREAM_RETRIES = int(os.getenv('UPSTREAM_RETRIES', '2'))
+
+# Sleep before retry n: UPSTREAM_BACKOFF_FACTOR * 2^(n-1) plus up to
+# UPSTREAM_BACKOFF_JITTER (no sleep before the first retry, like urllib3)
+UPSTREAM_BACKOFF_FACTOR = 0.2
+UPSTREAM_BACKOFF_JITTER = 0.1
+
+# Statuses that are retried (the last response is returned if they persist)
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+# A retry is only started if at least this much of the deadline is left
+MIN_ATTEMPT_SECONDS = 0.1
+
+
+def retry_backoff(attempt: int) -> float:
+    """Sleep before retry number `attempt` (1-based)"""
+    if attempt <= 1:
+        return 0.0
+    return UPSTREAM_BACKOFF_FACTOR * (2 ** (attempt - 1)) + random.random() * UPSTREAM_BACKOFF_JITTER
+
+
+def _build_adapter() -> HTTPAdapter:
+    """Pooled adapter; retries are done by upstream_get so they can respect a deadline"""
+    return HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=UPSTREAM_POOL_SIZE,
+        # Never wait for a pooled connection: requests passes no pool timeout,
+        # so a blocked thread would wait outside its deadline
+        pool_block=False,
+        max_retries=0,
+    )
+
+
+# One adapter = one set of connection pools shared by every thread.
+# Sessions are per thread so cookie/header state is never shared.
+_adapter = _build_adapter()
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """Return this thread's Session, mounted on the shared connection pool"""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.mount('https://', _adapter)
+        session.mount('http://', _adapter)
+        _local.session = session
+    return session
+
+
+def retry_allowed(attempt: int, deadline: Optional[float]) -> bool:
+    """True if retry number `attempt` may run: retries left and, with a deadline, time left after the backoff"""
+    if attempt > UPSTREAM_RETRIES:
+        return False
+    return deadline is None or deadline - time.monotonic() - retry_backoff(attempt) >= MIN_ATTEMPT_SECONDS
+
+
+def attempt_timeout(endpoint: str, timeout, deadline: Optional[float]) -> Tuple[float, float]:
+    """(connect, read) timeout of one attempt, cut to what is left of `deadline`"""
+    connect, read = timeout or UPSTREAM_TIMEOUTS[endpoint]
+    if deadline is None:
+        return connect, read
+    # requests rejects a zero timeout
+    remaining = max(deadline - time.monotonic(), 0.01)
+    return min(connect, remaining), min(read, remaining)
+
+
+def upstream_get(endpoint: str, url: str, timeout=None, deadline: Optional[float] = None) -> requests.Response:
+    """
+    GET an upstream URL through the shared pool
+
+    5xx responses, connection errors and timeouts are retried up to
+    UPSTREAM_RETRIES times with jittered backoff. With a `deadline` every
+    attempt may use what is left of it (up to the endpoint timeout), and a
+    retry only starts if time remains after its backoff.
+
+    Args:
+        endpoint: Key of UPSTREAM_TIMEOUTS ('weather', 'forecast', 'geo')
+        url: Full URL
+        timeout: Optional override of the endpoint timeout
+        deadline: Optional time.monotonic() value the call must end by
+
+    Returns:
+        requests.Response (after retries; HTTP errors are not raised here)
+    """
+    session = get_session()
+    start = time.perf_counter()
+    attempt = 0
+    while True:
+        try:
+            response = session.get(url, timeout=attempt_timeout(endpoint, timeout, deadline))
+            if response.status_code not in RETRY_STATUSES or not retry_allowed(attempt + 1, deadline):
+                METRICS.observe_upstream(endpoint, time.perf_counter() - start, status=response.status_code)
+                return response
+            response.close()
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if not retry_allowed(attempt + 1, deadline):
+                METRICS.observe_upstream(endpoint, time.perf_counter() - start, error=e)
+                raise
+        except requests.RequestException as e:
+            METRICS.observe_upstream(endpoint, time.perf_counter() - start, error=e)
+            raise
+        attempt += 1
+        time.sleep(retry_backoff(attempt))
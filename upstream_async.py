@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lapisan HTTP Upstream Asinkron (mode ASGI)
+Padanan upstream.py berbasis aiohttp: satu pool koneksi keep-alive
+per proses, timeout per endpoint yang sama, dan retry ber-jitter untuk
+5xx/timeout. Butuh dependency opsional di requirements-async.txt.
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional
+
+import aiohttp
+
+from metrics import METRICS
+from upstream import RETRY_STATUSES, attempt_timeout, retry_allowed, retry_backoff
+
+# Connections kept open to the upstream host. Requests beyond this wait for a
+# free connection without holding a thread, so in-flight requests are not capped.
+UPSTREAM_ASYNC_CONNECTIONS = int(os.getenv('UPSTREAM_ASYNC_CONNECTIONS', '100'))
+
+_session = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide ClientSession, creating it on first use (inside the loop)"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=UPSTREAM_ASYNC_CONNECTIONS, limit_per_host=0),
+            # Waiting for a pooled connection is bounded by the caller's deadline
+            timeout=aiohttp.ClientTimeout(total=None),
+        )
+    return _session
+
+
+async def aclose():
+    """Close the shared session (ASGI lifespan shutdown)"""
+    global _session
+    if _session is not None:
+        session, _session = _session, None
+        await session.close()
+
+
+async def upstream_get_async(endpoint: str, url: str, timeout=None,
+                             deadline: Optional[float] = None) -> aiohttp.ClientResponse:
+    """
+    GET an upstream URL through the shared async pool
+
+    Same retries and deadline handling as upstream.upstream_get; with a
+    `deadline` each attempt also gets a total timeout of what is left of it.
+
+    Args:
+        endpoint: Key of UPSTREAM_TIMEOUTS ('weather', 'forecast', 'geo')
+        url: Full URL
+        timeout: Optional override of the endpoint (connect, read) timeout
+        deadline: Optional time.monotonic() value the call must end by
+
+    Returns:
+        aiohttp.ClientResponse with the body already read, so `await
+        response.json()` works after the connection went back to the pool
+        (after retries; HTTP errors are not raised here)
+    """
+    session = get_session()
+    start = time.perf_counter()
+    attempt = 0
+    while True:
+        connect, read = attempt_timeout(endpoint, timeout, deadline)
+        total = max(deadline - time.monotonic(), 0.01) if deadline is not None else None
+        timeouts = aiohttp.ClientTimeout(total=total, sock_connect=connect, sock_read=read)
+        try:
+            async with session.get(url, timeout=timeouts) as response:
+                await response.read()
+            if response.status not in RETRY_STATUSES or not retry_allowed(attempt + 1, deadline):
+                METRICS.observe_upstream(endpoint, time.perf_counter() - start, status=response.status)
+                return response
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if not retry_allowed(attempt + 1, deadline):
+                METRICS.observe_upstream(endpoint, time.perf_counter() - start, error=e)
+                raise
+        attempt += 1
+        await asyncio.sleep(retry_backoff(attempt))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache In-Process dengan TTL + Stale-While-Revalidate
+Dipakai untuk data cuaca OpenWeatherMap: entry yang masih segar langsung
+dikembalikan, entry kedaluwarsa (masih dalam jendela stale) dikembalikan
+seketika sambil satu thread (atau task asyncio) latar belakang memperbaruinya.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with TTL and stale-while-revalidate
+
+    Args:
+        ttl: Seconds an entry is fresh
+        stale_ttl: Extra seconds an expired entry may still be served while
+            a background refresh runs (0 disables stale serving)
+        max_size: Maximum number of entries (least recently used is evicted)
+        name: Label used in stats
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0, max_size: int = 256, name: str = 'cache'):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.name = name
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._refreshing = set()
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'evictions': 0,
+        }
+
+    def _store(self, key: Hashable, value: Any):
+        """Insert an entry (caller must hold the lock)"""
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _refresh(self, key: Hashable, load: Callable[[], Any], cacheable: Callable[[Any], bool]):
+        """Background refresh of a stale entry (`load` stores the value)"""
+        try:
+            stored = cacheable(load())
+        except Exception:
+            stored = False
+        self._refreshed(key, stored)
+
+    async def _arefresh(self, key: Hashable, load: Callable[[], Awaitable[Any]],
+                        cacheable: Callable[[Any], bool]):
+        """Background refresh of a stale entry (asyncio task)"""
+        try:
+            stored = cacheable(await load())
+        except Exception:
+            stored = False
+        self._refreshed(key, stored)
+
+    def _refreshed(self, key: Hashable, stored: bool):
+        with self._lock:
+            self._counters['refreshes' if stored else 'refresh_errors'] += 1
+            self._refreshing.discard(key)
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any, bool]:
+        """
+        Look `key` up and count the outcome
+
+        Returns:
+            (found, value, start_refresh): start_refresh is True for the one
+            caller that must schedule the refresh of a stale entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = time.monotonic() - stored_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return True, value, False
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._counters['stale_hits'] += 1
+                    start_refresh = key not in self._refreshing
+                    self._refreshing.add(key)
+                    return True, value, start_refresh
+            self._counters['misses'] += 1
+        return False, None, False
+
+    def _fresh(self, key: Hashable) -> Tuple[bool, Any]:
+        """(True, value) when `key` holds an entry within its ttl (not counted as a lookup)"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return True, entry[0]
+        return False, None
+
+    def _loaded(self, key: Hashable, value: Any, cacheable: Callable[[Any], bool]) -> Any:
+        if cacheable(value):
+            with self._lock:
+                self._store(key, value)
+        return value
+
+    def _fill(self, key: Hashable, loader: Callable[[], Any], cacheable: Callable[[Any], bool]) -> Any:
+        # Under single-flight this runs in the leader: the value is stored
+        # before the key is released, and a caller that missed just before
+        # the store but became the next leader finds it here
+        found, value = self._fresh(key)
+        if found:
+            return value
+        return self._loaded(key, loader(), cacheable)
+
+    async def _afill(self, key: Hashable, loader: Callable[[], Awaitable[Any]],
+                     cacheable: Callable[[Any], bool]) -> Any:
+        found, value = self._fresh(key)
+        if found:
+            return value
+        return self._loaded(key, await loader(), cacheable)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    cacheable: Callable[[Any], bool] = lambda value: True, flights=None) -> Any:
+        """
+        Return the cached value for `key`, loading it on a miss
+
+        Args:
+            key: Cache key
+            loader: Zero-argument function fetching a fresh value
+            cacheable: Predicate deciding whether a loaded value is stored
+                (e.g. skip error responses)
+            flights: Optional singleflight.SingleFlight: concurrent misses and
+                refreshes of `key` share one load, stored before it completes
+        """
+        def load():
+            if flights is None:
+                return self._fill(key, loader, cacheable)
+            return flights.do(key, lambda: self._fill(key, loader, cacheable))
+
+        found, value, start_refresh = self._lookup(key)
+        if found:
+            if start_refresh:
+                threading.Thread(target=self._refresh, args=(key, load, cacheable),
+                                 name=f'{self.name}-refresh', daemon=True).start()
+            return value
+        return load()
+
+    async def aget_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]],
+                           cacheable: Callable[[Any], bool] = lambda value: True, flights=None) -> Any:
+        """
+        Same as get_or_load for asyncio code: `loader` is a coroutine function,
+        `flights` an AsyncSingleFlight, and stale entries are refreshed by a
+        task on the running loop
+        """
+        def load():
+            if flights is None:
+                return self._afill(key, loader, cacheable)
+            return flights.do(key, lambda: self._afill(key, loader, cacheable))
+
+        found, value, start_refresh = self._lookup(key)
+        if found:
+            if start_refresh:
+                # Imported here so the WSGI app starts without asyncio
+                import asyncio
+
+                task = asyncio.get_running_loop().create_task(self._arefresh(key, load, cacheable))
+                # The loop only keeps weak references to tasks
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return value
+        return await load()
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus size and hit ratio"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats.update({
+            'name': self.name,
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'stale_ttl': self.stale_ttl,
+            'hit_ratio': round((stats['hits'] + stats['stale_hits']) / lookups, 4) if lookups else 0.0,
+        })
+        return stats
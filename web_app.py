@@ -5,32 +5,31 @@ Flask Web Application untuk Sistem Pakar Mitigasi Bencana Aceh
 Implementasi Logika Matematika (Tabel Kebenaran)
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from typing import Dict, Tuple
 import os
+from logic_engine import compile_program, build_truth_table
+from precomputed import ResponseTable, StaticPage
+from images import ImageManifest
+from articles import ArticleStore
+from fastjson import FastJSONProvider
+from metrics import CONTENT_TYPE, METRICS
+from rules import RuleBook
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson when installed
 CORS(app)  # Enable CORS for API requests
+METRICS.install(app)  # Request latency and in-flight gauges for /metrics
 
 # ============================================
 # PROPOSITIONAL LOGIC ENGINE
 # ============================================
 
-def AND(a: bool, b: bool) -> bool:
-    """
-    AND Gate (Conjunction)
-    Returns True only if both inputs are True
-    """
-    return a and b
-
-
-def OR(a: bool, b: bool) -> bool:
-    """
-    OR Gate (Disjunction)
-    Returns True if at least one input is True
-    """
-    return a or b
+# S = p ∧ (q ∨ r), compiled once into a flat function by logic_engine
+RISK_VARIABLES = ('p', 'q', 'r')
+RISK_STEPS = (('q_or_r', 'q | r'), ('result', 'p & q_or_r'))
+RISK_PROGRAM = compile_program(RISK_VARIABLES, RISK_STEPS)
 
 
 def calculate_risk(p: bool, q: bool, r: bool) -> Tuple[bool, bool]:
@@ -46,210 +45,93 @@ def calculate_risk(p: bool, q: bool, r: bool) -> Tuple[bool, bool]:
     Returns:
         Tuple of (q_or_r, result)
     """
-    q_or_r = OR(q, r)
-    result = AND(p, q_or_r)
-    return q_or_r, result
+    return RISK_PROGRAM.evaluate(p, q, r)
 
 
 # ============================================
 # RECOMMENDATION ENGINE
 # ============================================
 
+# Recommendations per p/q/r combination, from the "basic" rule set of the
+# versioned rule file (data/recommendations.json), reloaded when it changes
+RULES = RuleBook(rulesets=('basic',))
+
+
 def get_recommendation(p: bool, q: bool, r: bool, result: bool) -> Dict[str, str]:
     """
-    Generate specific mitigation recommendations based on input combination
+    Specific mitigation recommendation for an input combination (one table index)
     """
-    recommendations = {
-        (False, False, False): {
-            'icon': 'fa-sun',
-            'color': 'text-green-600',
-            'title': '✅ KONDISI IDEAL',
-            'text': 'Tidak ada hujan, hutan masih terjaga, dan sungai dalam kondisi baik.\n'
-                   'Rekomendasi: Lakukan pemantauan rutin dan jaga kelestarian lingkungan.'
-        },
-        (False, False, True): {
-            'icon': 'fa-tools',
-            'color': 'text-yellow-600',
-            'title': '⚠️ PERBAIKAN DRAINASE',
-            'text': 'Sungai dangkal/sempit memerlukan normalisasi.\n'
-                   'Rekomendasi: Lakukan pengerukan sedimen dan pelebaran aliran sungai\n'
-                   'untuk antisipasi hujan mendatang.'
-        },
-        (False, True, False): {
-            'icon': 'fa-seedling',
-            'color': 'text-yellow-600',
-            'title': '⚠️ REBOISASI LAHAN',
-            'text': 'Alih fungsi lahan sawit mengurangi daya serap air.\n'
-                   'Rekomendasi: Implementasikan program reboisasi dan sistem agroforestri\n'
-                   'untuk mencegah run-off tinggi.'
-        },
-        (False, True, True): {
-            'icon': 'fa-exclamation',
-            'color': 'text-orange-600',
-            'title': '⚠️ SIAGA ANTISIPASI',
-            'text': 'Kombinasi lahan rusak dan drainase buruk sangat berisiko.\n'
-                   'Rekomendasi: Meskipun belum hujan, segera lakukan perbaikan infrastruktur\n'
-                   'dan siapkan jalur evakuasi.'
-        },
-        (True, False, False): {
-            'icon': 'fa-umbrella',
-            'color': 'text-blue-600',
-            'title': '✅ HUJAN AMAN TERKENDALI',
-            'text': 'Hujan deras, namun hutan lebat menyerap air dengan baik dan sungai lancar.\n'
-                   'Rekomendasi: Kondisi aman, tetap pantau intensitas hujan dan\n'
-                   'ketinggian air sungai.'
-        },
-        (True, False, True): {
-            'icon': 'fa-water',
-            'color': 'text-red-600',
-            'title': '🚨 PERINGATAN BANJIR - DRAINASE BURUK',
-            'text': 'Hujan deras dengan sungai dangkal/sempit menyebabkan luapan air.\n'
-                   'TINDAKAN SEGERA:\n'
-                   '- Evakuasi warga di bantaran sungai\n'
-                   '- Tutup akses jalan rendah\n'
-                   '- Aktifkan posko bencana'
-        },
-        (True, True, False): {
-            'icon': 'fa-mountain',
-            'color': 'text-red-600',
-            'title': '🚨 PERINGATAN BANJIR - RUN-OFF TINGGI',
-            'text': 'Hujan deras pada lahan sawit memicu run-off ekstrem.\n'
-                   'TINDAKAN SEGERA:\n'
-                   '- Evakuasi warga di lereng bukit dan daerah aliran sungai\n'
-                   '- Waspadai banjir bandang dan tanah longsor'
-        },
-        (True, True, True): {
-            'icon': 'fa-exclamation-triangle',
-            'color': 'text-red-700',
-            'title': '🔴 BAHAYA MAKSIMAL - EVAKUASI DARURAT',
-            'text': 'KONDISI KRITIS! Kombinasi hujan deras, lahan rusak, dan drainase buruk.\n'
-                   'TINDAKAN DARURAT:\n'
-                   '- Evakuasi massal ke tempat tinggi\n'
-                   '- Aktifkan semua posko\n'
-                   '- Koordinasi dengan BNPB\n'
-                   '- Siapkan bantuan logistik'
-        }
-    }
-    
-    return recommendations.get((p, q, r), {
-        'icon': 'fa-question',
-        'color': 'text-gray-600',
-        'title': 'Unknown',
-        'text': 'No recommendation available'
-    })
+    return RULES.tables['basic'].lookup(p, q, r)
 
 
 def generate_truth_table() -> list:
     """
     Generate complete truth table with all 8 combinations
+    (bit-parallel: each column is one packed integer)
     """
-    table = []
-    for i in range(8):
-        p = bool(i & 4)
-        q = bool(i & 2)
-        r = bool(i & 1)
-        
-        q_or_r, result = calculate_risk(p, q, r)
-        
-        table.append({
-            'p': p,
-            'q': q,
-            'r': r,
-            'q_or_r': q_or_r,
-            'result': result
-        })
-    
-    return table
+    return list(build_truth_table(RISK_VARIABLES, RISK_STEPS).rows())
 
 
 # ============================================
 # ARTICLES DATA
 # ============================================
 
+# Loaded once from data/articles.json; pages are spliced from pre-encoded JSON
+ARTICLES = ArticleStore(app.json)
+
+
 def get_articles() -> list:
     """
-    Get list of disaster mitigation articles with photos
+    Get list of disaster mitigation articles with photos, newest first
     """
-    articles = [
-        {
-            'id': 1,
-            'category': 'Tips',
-            'title': 'Tips Mitigasi Banjir untuk Masyarakat Aceh',
-            'excerpt': 'Panduan lengkap untuk masyarakat dalam menghadapi ancaman banjir. Termasuk persiapan darurat, jalur evakuasi, dan perlengkapan yang harus disiapkan.',
-            'date': '2025-01-15',
-            'image': 'https://images.unsplash.com/photo-1741081288260-877057e3fa27?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTAwNDR8MHwxfHNlYXJjaHwyfHxDb21tdW5pdHklMjB2b2x1bnRlZXJzJTIwaGVscGluZyUyMGR1cmluZyUyMGZsb29kJTIwZGlzYXN0ZXIlMkMlMjBwZW9wbGUlMjBldmFjdWF0aW5nJTJDJTIwZW1lcmdlbmN5JTIwcmVzcG9uc2UlMjB0ZWFtJTIwcGVvcGxlfGVufDB8MHx8fDE3NjQ3MzIwNDZ8MA&ixlib=rb-4.1.0&q=85',
-            'image_alt': 'Tim relawan membantu evakuasi saat banjir - Photo by Iqro Rinaldi on Unsplash',
-            'author': 'BNPB Aceh'
-        },
-        {
-            'id': 2,
-            'category': 'Teknologi',
-            'title': 'Sistem Peringatan Dini Bencana di Aceh',
-            'excerpt': 'Teknologi terkini dalam sistem peringatan dini banjir menggunakan sensor cuaca, monitoring sungai, dan alert system berbasis SMS untuk masyarakat.',
-            'date': '2025-01-10',
-            'image': 'https://images.pexels.com/photos/29436201/pexels-photo-29436201.jpeg',
-            'image_alt': 'Stasiun cuaca untuk monitoring bencana - Photo by Charles Criscuolo on Pexels',
-            'author': 'BMKG Aceh'
-        },
-        {
-            'id': 3,
-            'category': 'Lingkungan',
-            'title': 'Program Reboisasi Hutan untuk Cegah Banjir',
-            'excerpt': 'Pentingnya reboisasi hutan dan konservasi lahan untuk mengurangi risiko banjir. Program penanaman 10,000 pohon di daerah rawan banjir Aceh.',
-            'date': '2025-01-05',
-            'image': 'https://images.unsplash.com/photo-1632397782627-29040fc97a4b?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTAwNDR8MHwxfHNlYXJjaHw5fHxGb3Jlc3QlMjByZWZvcmVzdGF0aW9uJTJDJTIwcGxhbnRpbmclMjB0cmVlcyUyQyUyMGdyZWVuJTIwbGFuZHNjYXBlJTJDJTIwZW52aXJvbm1lbnRhbCUyMGNvbnNlcnZhdGlvbnxlbnwwfDB8fGdyZWVufDE3NjQ3MzIwNDZ8MA&ixlib=rb-4.1.0&q=85',
-            'image_alt': 'Hutan hijau yang lebat - Photo by boris misevic on Unsplash',
-            'author': 'Dinas Lingkungan Hidup'
-        },
-        {
-            'id': 4,
-            'category': 'Infrastruktur',
-            'title': 'Normalisasi Sungai dan Perbaikan Drainase',
-            'excerpt': 'Proyek normalisasi sungai dan perbaikan sistem drainase di 15 titik rawan banjir. Target pengerukan 50,000 m³ sedimen untuk kelancaran aliran air.',
-            'date': '2024-12-28',
-            'image': 'https://images.unsplash.com/photo-1562544294-3484049612ce?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTAwNDR8MHwxfHNlYXJjaHwxfHxSaXZlciUyMGRyYWluYWdlJTIwc3lzdGVtJTJDJTIwd2F0ZXIlMjBtYW5hZ2VtZW50JTIwaW5mcmFzdHJ1Y3R1cmUlMkMlMjBmbG9vZCUyMGNvbnRyb2x8ZW58MHwwfHxibHVlfDE3NjQ3MzIwNDZ8MA&ixlib=rb-4.1.0&q=85',
-            'image_alt': 'Sistem drainase dan pengelolaan air - Photo by Chandler Cruttenden on Unsplash',
-            'author': 'Dinas Pekerjaan Umum'
-        },
-        {
-            'id': 5,
-            'category': 'Kesiapsiagaan',
-            'title': 'Kesiapsiagaan Menghadapi Musim Hujan 2025',
-            'excerpt': 'Persiapan menghadapi musim hujan dengan prediksi curah hujan tinggi. Checklist lengkap untuk keluarga dan komunitas dalam mengantisipasi banjir.',
-            'date': '2024-12-20',
-            'image': 'https://images.unsplash.com/photo-1705102659473-97da402ca422?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTAwNDR8MHwxfHNlYXJjaHwyM3x8SGVhdnklMjByYWluZmFsbCUyQyUyMHN0b3JtJTIwY2xvdWRzJTJDJTIwcmFpbnklMjB3ZWF0aGVyJTJDJTIwZmxvb2RpbmclMjB3YXRlcnxlbnwwfDB8fGJsdWV8MTc2NDczMjA0N3ww&ixlib=rb-4.1.0&q=85',
-            'image_alt': 'Awan badai menandakan hujan deras - Photo by Raychel Sanner on Unsplash',
-            'author': 'BPBD Aceh'
-        },
-        {
-            'id': 6,
-            'category': 'Edukasi',
-            'title': 'Pelatihan Tanggap Darurat untuk Relawan',
-            'excerpt': 'Program pelatihan tanggap darurat bencana untuk relawan komunitas. Materi meliputi pertolongan pertama, evakuasi, dan koordinasi tim respons cepat.',
-            'date': '2024-12-15',
-            'image': 'https://images.unsplash.com/photo-1581094373271-1fa59e2ab263?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTAwNDR8MHwxfHNlYXJjaHwxfHxFbWVyZ2VuY3klMjBwcmVwYXJlZG5lc3MlMjB0cmFpbmluZyUyQyUyMGRpc2FzdGVyJTIwcmVzcG9uc2UlMjB0ZWFtJTJDJTIwY29tbXVuaXR5JTIwbWVldGluZyUyMHBlb3BsZXxlbnwwfDB8fHwxNzY0NzMyMDQ2fDA&ixlib=rb-4.1.0&q=85',
-            'image_alt': 'Pelatihan tim tanggap darurat - Photo by ThisisEngineering on Unsplash',
-            'author': 'PMI Aceh'
-        }
-    ]
-    
-    return articles
+    return ARTICLES.articles
 
 
 # ============================================
 # FLASK ROUTES
 # ============================================
 
+# Both pages are request-independent: rendered once, served pre-compressed,
+# with team photos picked from the built variants (images.py) through srcset
+ImageManifest().install(app)
+INDEX_PAGE = StaticPage('index.html')
+ENHANCED_PAGE = StaticPage('index_enhanced.html')
+for _page in (INDEX_PAGE, ENHANCED_PAGE):
+    _page.bind(app)
+
+
 @app.route('/')
 def index():
-    """Serve the main web interface"""
-    return render_template('index.html')
+    """Serve the main web interface (gzip/brotli, ETag, Cache-Control)"""
+    return INDEX_PAGE.respond()
 
 
 @app.route('/enhanced')
 def index_enhanced():
     """Serve the enhanced web interface with advanced features"""
-    return render_template('index_enhanced.html')
+    return ENHANCED_PAGE.respond()
+
+
+def build_calculate_payload(p: bool, q: bool, r: bool) -> Dict:
+    """Build the /api/calculate response body for one input combination"""
+    q_or_r, result = calculate_risk(p, q, r)
+    recommendation = get_recommendation(p, q, r, result)
+    
+    return {
+        'success': True,
+        'p': p,
+        'q': q,
+        'r': r,
+        'q_or_r': q_or_r,
+        'result': result,
+        'recommendation': recommendation
+    }
+
+
+# All 8 responses are encoded once at startup, indexed by the p/q/r bitmask
+CALCULATE_RESPONSES = ResponseTable(RISK_VARIABLES, build_calculate_payload, app.json)
+RULES.on_reload(CALCULATE_RESPONSES.rebuild)
+RULES.watch()
 
 
 @app.route('/api/calculate', methods=['POST'])
@@ -276,23 +158,7 @@ def api_calculate():
     """
     try:
         data = request.get_json()
-        
-        p = bool(data.get('p', False))
-        q = bool(data.get('q', False))
-        r = bool(data.get('r', False))
-        
-        q_or_r, result = calculate_risk(p, q, r)
-        recommendation = get_recommendation(p, q, r, result)
-        
-        return jsonify({
-            'success': True,
-            'p': p,
-            'q': q,
-            'r': r,
-            'q_or_r': q_or_r,
-            'result': result,
-            'recommendation': recommendation
-        })
+        return CALCULATE_RESPONSES.respond(data)
     
     except Exception as e:
         return jsonify({
@@ -328,19 +194,25 @@ def api_truth_table():
 @app.route('/api/articles', methods=['GET'])
 def api_articles():
     """
-    API endpoint to get all articles
-    
+    API endpoint to get articles, newest first, one page at a time
+
+    Query parameters (all optional):
+        limit: articles per page (default 20, max 100)
+        cursor: next_cursor from the previous page
+        category: only this category (case-insensitive)
+        q: keywords matched against title and excerpt (every word, prefixes ok)
+
     Returns:
     {
-        "articles": [...]
+        "articles": [...],
+        "count": 20,
+        "next_cursor": "..." or null,
+        "total": 57
     }
+    Sends an ETag; a matching If-None-Match gets 304 Not Modified.
     """
     try:
-        articles = get_articles()
-        return jsonify({
-            'success': True,
-            'articles': articles
-        })
+        return ARTICLES.respond(request.args)
     
     except Exception as e:
         return jsonify({
@@ -359,6 +231,12 @@ def health_check():
     })
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics: request latency per route and in-flight requests"""
+    return Response(METRICS.render(), content_type=CONTENT_TYPE)
+
+
 # ============================================
 # ERROR HANDLERS
 # ============================================
@@ -399,6 +277,7 @@ if __name__ == '__main__':
     print("   - GET  /api/truth-table - Get complete truth table")
     print("   - GET  /api/articles - Get disaster mitigation articles")
     print("   - GET  /api/health - Health check")
+    print("   - GET  /metrics - Prometheus metrics")
     print()
     print("Press CTRL+C to stop the server")
     print("=" * 70)
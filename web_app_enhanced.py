@@ -6,50 +6,166 @@ Implementasi Logika Matematika dengan Multiple Variables
 Mendukung: Banjir, Gempa, Status Air, dan lainnya
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Blueprint, Flask, Response, current_app, jsonify, request, stream_with_context
 from flask_cors import CORS
 from typing import Dict, Tuple, List
+from functools import lru_cache
+import logging
 import os
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Debug: Print environment variable status
-api_key_debug = os.getenv('OPENWEATHER_API_KEY')
-print("\n" + "="*60)
-print("🔍 DEBUG: Environment Variables")
-print("="*60)
-print(f"Current Working Directory: {os.getcwd()}")
-print(f"API Key Status: {'✅ SET' if api_key_debug else '❌ NOT SET'}")
-if api_key_debug:
-    print(f"API Key Length: {len(api_key_debug)} characters")
-    print(f"API Key Preview: {api_key_debug[:10]}...{api_key_debug[-10:]}")
-else:
-    print("⚠️  WARNING: OPENWEATHER_API_KEY not found in environment!")
-    print("   Check if .env file exists in current directory")
-print("="*60 + "\n")
-
-app = Flask(__name__)
-CORS(app)
+from logic_engine import compile_program, build_truth_table, evaluate_batch, parse, variables_of
+from bdd import BDD, analyze
+from minimize import minimize, minimize_steps, minimize_table
+from mitigation import MitigationSolver
+from rules import RuleBook
+from hazards import Hazard, HazardRegistry
+from precomputed import PrecomputedStore, ResponseTable, StaticPage
+from fastjson import FastJSONProvider, FragmentCache
+from images import ImageManifest
+from weather_cache import TTLCache
+from gazetteer import SCORE_PREFIX, GazetteerIndex, normalize
+from forecast_timeline import build_timeline, evaluate_timeline, flood_risk_level
+from singleflight import SingleFlight
+from metrics import CONTENT_TYPE, METRICS, lru_cache_stats
+from regional_scan import (MAX_SCAN_CONCURRENCY, MAX_SCAN_REGIONS, SCAN_CONCURRENCY,
+                           load_region_flags, parse_flag, resolve_regions, scan_regions)
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def load_env():
+    """
+    Load a local .env file (development)
+
+    Serverless platforms inject the environment directly, so python-dotenv
+    is only imported when a .env file actually exists.
+    """
+    for folder in (os.getcwd(), BASE_DIR):
+        path = os.path.join(folder, '.env')
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+
+# Before any module-level os.getenv below
+load_env()
+
+# Routes live on a blueprint; create_app() at the bottom builds the app
+api = Blueprint('api', __name__)
 
 # ============================================
 # ENHANCED PROPOSITIONAL LOGIC ENGINE
 # ============================================
 
-def AND(*args: bool) -> bool:
-    """AND Gate - Returns True only if all inputs are True"""
-    return all(args)
+# Hazard registry: each hazard declares its input variables, ordered
+# (name, formula) steps (the last step is the result), and the combined alert
+# used when it is the only active hazard. All registered hazards are compiled
+# into one program over the shared variable vector (see hazards.py).
+HAZARDS = HazardRegistry()
+HAZARDS.register(Hazard(
+    'flood', 'banjir', ('p', 'q', 'r'),
+    (('q_or_r', 'q | r'), ('result', 'p & q_or_r')),
+    alert={
+        'level': 'HIGH',
+        'severity': 4,
+        'color': 'red-600',
+        'icon': 'fa-water',
+        'title': '🚨 PERINGATAN BANJIR',
+        'description': 'Risiko banjir tinggi terdeteksi'
+    },
+))
+HAZARDS.register(Hazard(
+    'earthquake', 'gempa', ('e', 'b', 'l'),
+    (('b_or_l', 'b | l'), ('result', 'e & b_or_l')),
+    alert={
+        'level': 'HIGH',
+        'severity': 4,
+        'color': 'orange-600',
+        'icon': 'fa-house-crack',
+        'title': '⚠️ PERINGATAN GEMPA',
+        'description': 'Risiko gempa bumi terdeteksi'
+    },
+))
+HAZARDS.register(Hazard(
+    'landslide', 'tanah longsor', ('s', 'p', 'e'),
+    (('trigger', 'p | e'), ('result', 's & trigger')),
+    alert={
+        'level': 'HIGH',
+        'severity': 4,
+        'color': 'amber-700',
+        'icon': 'fa-mountain',
+        'title': '⚠️ PERINGATAN TANAH LONGSOR',
+        'description': 'Risiko tanah longsor terdeteksi'
+    },
+))
+HAZARDS.register(Hazard(
+    'tsunami', 'tsunami', ('e', 'm', 'c'),
+    (('undersea', 'e & m'), ('result', 'undersea & c')),
+    alert={
+        'level': 'CRITICAL',
+        'severity': 5,
+        'color': 'blue-800',
+        'icon': 'fa-house-flood-water',
+        'title': '🌊 PERINGATAN TSUNAMI',
+        'description': 'Potensi tsunami terdeteksi, segera menjauh dari pantai'
+    },
+))
+
+# Per-hazard {'variables', 'steps'} view of the registry
+HAZARD_FORMULAS = HAZARDS.formulas
+
+# Each step in its minimal two-level form when that needs fewer gates
+# (gate counts before/after are served by /api/minimize)
+HAZARD_MINIMIZED = {name: minimize_steps(spec['steps']) for name, spec in HAZARD_FORMULAS.items()}
+
+HAZARD_PROGRAMS = {
+    name: compile_program(spec['variables'], HAZARD_MINIMIZED[name][0])
+    for name, spec in HAZARD_FORMULAS.items()
+}
+
+# The same formulas as BDDs over one shared node table: scenario counts,
+# satisfiability and restriction without enumerating truth-table rows
+HAZARD_BDD = BDD()
+HAZARD_BDD_NODES = {
+    name: HAZARD_BDD.compile_program(spec['variables'], spec['steps'])['result']
+    for name, spec in HAZARD_FORMULAS.items()
+}
 
-def OR(*args: bool) -> bool:
-    """OR Gate - Returns True if at least one input is True"""
-    return any(args)
+# Inputs planners can change, with the default relative cost of changing them
+MITIGATION_COSTS = {
+    'flood': {'q': 5.0, 'r': 3.0},        # reforestation vs. river/drainage works
+    'earthquake': {'b': 4.0, 'l': 6.0},   # retrofitting vs. moving out of landslide zones
+    'landslide': {'s': 5.0},              # slope stabilization (terracing, retaining walls)
+    'tsunami': {},                        # nothing controllable: early warning and evacuation
+}
 
-def NOT(a: bool) -> bool:
-    """NOT Gate - Returns opposite of input"""
-    return not a
+VARIABLE_LABELS = {
+    'p': 'Curah Hujan Tinggi',
+    'q': 'Alih Fungsi Lahan Sawit',
+    'r': 'Sungai Dangkal/Sempit',
+    'e': 'Aktivitas Seismik',
+    'b': 'Kualitas Bangunan Buruk',
+    'l': 'Daerah Rawan Longsor',
+    's': 'Lereng Curam/Tanah Labil',
+    'm': 'Gempa Bawah Laut Besar',
+    'c': 'Wilayah Pesisir',
+}
+
+@lru_cache(maxsize=64)
+def mitigation_solver(hazard: str, costs: Tuple[Tuple[str, float], ...]) -> MitigationSolver:
+    """Precomputed solver of a hazard for one cost configuration (cached)"""
+    spec = HAZARD_FORMULAS[hazard]
+    return MitigationSolver(spec['variables'], spec['steps'], dict(costs))
+
+# Default-cost tables are built at startup
+for _hazard, _costs in MITIGATION_COSTS.items():
+    mitigation_solver(_hazard, tuple(sorted(_costs.items())))
+
+_evaluate_flood = HAZARD_PROGRAMS['flood'].evaluate
+_evaluate_earthquake = HAZARD_PROGRAMS['earthquake'].evaluate
 
 def calculate_flood_risk(p: bool, q: bool, r: bool) -> Tuple[bool, bool]:
     """
@@ -64,9 +180,7 @@ def calculate_flood_risk(p: bool, q: bool, r: bool) -> Tuple[bool, bool]:
     Returns:
         Tuple of (q_or_r, flood_result)
     """
-    q_or_r = OR(q, r)
-    flood_result = AND(p, q_or_r)
-    return q_or_r, flood_result
+    return _evaluate_flood(p, q, r)
 
 def calculate_earthquake_risk(e: bool, b: bool, l: bool) -> Tuple[bool, bool]:
     """
@@ -81,218 +195,142 @@ def calculate_earthquake_risk(e: bool, b: bool, l: bool) -> Tuple[bool, bool]:
     Returns:
         Tuple of (b_or_l, quake_result)
     """
-    b_or_l = OR(b, l)
-    quake_result = AND(e, b_or_l)
-    return b_or_l, quake_result
+    return _evaluate_earthquake(e, b, l)
 
 def calculate_combined_risk(flood: bool, quake: bool) -> Dict[str, any]:
     """
-    Calculate combined disaster risk
-    
+    Calculate combined disaster risk of flood and earthquake
+
+    One lookup in the registry's severity table; other hazards count as
+    inactive. HAZARDS.assess evaluates every registered hazard at once.
+
     Returns:
         Dictionary with risk levels and recommendations
     """
-    if flood and quake:
-        return {
-            'level': 'CRITICAL',
-            'severity': 5,
-            'color': 'red-900',
-            'icon': 'fa-skull-crossbones',
-            'title': '🔴 BAHAYA EKSTREM - MULTI BENCANA',
-            'description': 'Risiko banjir DAN gempa terdeteksi bersamaan!'
-        }
-    elif flood:
-        return {
-            'level': 'HIGH',
-            'severity': 4,
-            'color': 'red-600',
-            'icon': 'fa-water',
-            'title': '🚨 PERINGATAN BANJIR',
-            'description': 'Risiko banjir tinggi terdeteksi'
-        }
-    elif quake:
-        return {
-            'level': 'HIGH',
-            'severity': 4,
-            'color': 'orange-600',
-            'icon': 'fa-house-crack',
-            'title': '⚠️ PERINGATAN GEMPA',
-            'description': 'Risiko gempa bumi terdeteksi'
-        }
-    else:
-        return {
-            'level': 'SAFE',
-            'severity': 1,
-            'color': 'green-600',
-            'icon': 'fa-shield-alt',
-            'title': '✅ KONDISI AMAN',
-            'description': 'Tidak ada risiko bencana terdeteksi'
-        }
+    return HAZARDS.severity({'flood': flood, 'earthquake': quake})
 
 # ============================================
 # RECOMMENDATION ENGINE
 # ============================================
 
+# Recommendations come from the versioned rule file data/recommendations.json,
+# expanded into tables indexed by the input bitmask; rules may also test the
+# formula result. The file is re-read when it changes (see rules.RuleBook).
+def _hazard_result(hazard: str):
+    """Function of a hazard's inputs returning {'result': ...} for rule conditions"""
+    outputs = HAZARD_PROGRAMS[hazard].outputs
+    evaluate = HAZARD_PROGRAMS[hazard].evaluate
+    if len(outputs) == 1:
+        return lambda *values: {'result': evaluate(*values)}
+    return lambda *values: {'result': evaluate(*values)[-1]}
+
+RULES = RuleBook(rulesets=HAZARDS.names, outputs={name: _hazard_result(name) for name in HAZARDS.names})
+
+def get_hazard_recommendation(hazard: str, *values: bool) -> Dict[str, str]:
+    """Recommendation of any registered hazard, one bool per hazard variable"""
+    return RULES.tables[hazard].lookup(*values)
+
 def get_flood_recommendation(p: bool, q: bool, r: bool, result: bool) -> Dict[str, str]:
-    """Generate flood-specific recommendations"""
-    if not result:
-        return {
-            'icon': 'fa-check-circle',
-            'color': 'text-green-600',
-            'title': '✅ Tidak Ada Risiko Banjir',
-            'text': 'Kondisi saat ini aman dari risiko banjir.\nTetap lakukan pemantauan rutin.'
-        }
-    
-    # All three factors active (p=T, q=T, r=T)
-    if p and q and r:
-        return {
-            'icon': 'fa-exclamation-triangle',
-            'color': 'text-red-700',
-            'title': '🔴 BAHAYA BANJIR MAKSIMAL',
-            'text': 'Semua faktor risiko aktif!\n'
-                   'TINDAKAN:\n'
-                   '- Evakuasi segera ke tempat tinggi\n'
-                   '- Matikan listrik dan gas\n'
-                   '- Bawa dokumen penting\n'
-                   '- Ikuti instruksi petugas'
-        }
-    # High rainfall with land damage (p=T, q=T, r=F)
-    elif p and q and not r:
-        return {
-            'icon': 'fa-tree',
-            'color': 'text-orange-600',
-            'title': '⚠️ RISIKO BANJIR - FAKTOR LAHAN',
-            'text': 'Curah hujan tinggi dengan kerusakan lahan.\n'
-                   'TINDAKAN:\n'
-                   '- Siaga evakuasi\n'
-                   '- Pantau daerah deforestasi\n'
-                   '- Hindari area rawan longsor'
-        }
-    # High rainfall with bad drainage (p=T, q=F, r=T)
-    elif p and not q and r:
-        return {
-            'icon': 'fa-water',
-            'color': 'text-orange-600',
-            'title': '⚠️ RISIKO BANJIR - FAKTOR DRAINASE',
-            'text': 'Curah hujan tinggi dengan drainase buruk.\n'
-                   'TINDAKAN:\n'
-                   '- Siaga evakuasi\n'
-                   '- Pantau ketinggian sungai\n'
-                   '- Siapkan jalur evakuasi'
-        }
-    else:
-        return {
-            'icon': 'fa-exclamation',
-            'color': 'text-yellow-600',
-            'title': '⚠️ WASPADA BANJIR',
-            'text': 'Beberapa faktor risiko terdeteksi.\n'
-                   'Tingkatkan kewaspadaan dan siapkan rencana evakuasi.'
-        }
+    """Flood recommendation from the rule table (`result` follows from p, q, r)"""
+    return get_hazard_recommendation('flood', p, q, r)
 
 def get_earthquake_recommendation(e: bool, b: bool, l: bool, result: bool) -> Dict[str, str]:
-    """Generate earthquake-specific recommendations"""
-    if not result:
-        return {
-            'icon': 'fa-check-circle',
-            'color': 'text-green-600',
-            'title': '✅ Tidak Ada Risiko Gempa',
-            'text': 'Tidak ada aktivitas seismik signifikan.\nTetap siaga dan waspada.'
-        }
-    
-    if e and b and l:
-        return {
-            'icon': 'fa-house-crack',
-            'color': 'text-red-700',
-            'title': '🔴 BAHAYA GEMPA MAKSIMAL',
-            'text': 'Aktivitas seismik tinggi dengan bangunan rentan.\n'
-                   'TINDAKAN:\n'
-                   '- Keluar dari bangunan\n'
-                   '- Hindari area longsor\n'
-                   '- Ke tempat terbuka\n'
-                   '- Siaga tsunami jika dekat pantai'
-        }
-    elif e and b:
-        return {
-            'icon': 'fa-building',
-            'color': 'text-orange-600',
-            'title': '⚠️ RISIKO KERUSAKAN BANGUNAN',
-            'text': 'Gempa dengan bangunan berkualitas buruk.\n'
-                   'TINDAKAN:\n'
-                   '- Evakuasi dari bangunan\n'
-                   '- Hindari struktur tinggi\n'
-                   '- Ke area terbuka'
-        }
-    elif e and l:
-        return {
-            'icon': 'fa-mountain',
-            'color': 'text-orange-600',
-            'title': '⚠️ RISIKO TANAH LONGSOR',
-            'text': 'Gempa di area rawan longsor.\n'
-                   'TINDAKAN:\n'
-                   '- Jauhi lereng bukit\n'
-                   '- Hindari jurang\n'
-                   '- Evakuasi ke dataran'
-        }
-    else:
-        return {
-            'icon': 'fa-exclamation',
-            'color': 'text-yellow-600',
-            'title': '⚠️ WASPADA GEMPA',
-            'text': 'Aktivitas seismik terdeteksi.\nTingkatkan kewaspadaan.'
-        }
+    """Earthquake recommendation from the rule table (`result` follows from e, b, l)"""
+    return get_hazard_recommendation('earthquake', e, b, l)
 
 # ============================================
 # TRUTH TABLE GENERATION
 # ============================================
 
+@lru_cache(maxsize=None)
+def generate_hazard_truth_table(hazard: str):
+    """
+    Build the bit-parallel truth table for a registered hazard (cached)
+
+    Columns are packed integers; rows are only materialized on iteration.
+    """
+    spec = HAZARD_FORMULAS[hazard]
+    return build_truth_table(spec['variables'], spec['steps'])
+
 def generate_flood_truth_table() -> list:
     """Generate complete flood truth table (8 combinations for 3 variables)"""
-    table = []
-    for i in range(8):
-        p = bool(i & 4)
-        q = bool(i & 2)
-        r = bool(i & 1)
-        
-        q_or_r, result = calculate_flood_risk(p, q, r)
-        
-        table.append({
-            'p': p, 'q': q, 'r': r,
-            'q_or_r': q_or_r,
-            'result': result
-        })
-    
-    return table
+    return list(generate_hazard_truth_table('flood').rows())
 
 def generate_earthquake_truth_table() -> list:
     """Generate earthquake truth table (8 combinations for 3 variables)"""
-    table = []
-    for i in range(8):
-        e = bool(i & 4)
-        b = bool(i & 2)
-        l = bool(i & 1)
-        
-        b_or_l, result = calculate_earthquake_risk(e, b, l)
-        
-        table.append({
-            'e': e, 'b': b, 'l': l,
-            'b_or_l': b_or_l,
-            'result': result
-        })
-    
-    return table
+    return list(generate_hazard_truth_table('earthquake').rows())
 
 # ============================================
 # WEATHER API INTEGRATION
 # ============================================
 
-def get_weather_data(city: str = None, lat: float = None, lon: float = None) -> Dict:
+WEATHER_UNITS = 'metric'
+WEATHER_LANG = 'id'
+
+# Weather cache: entries are fresh for WEATHER_CACHE_TTL seconds, then served
+# stale (with one background refresh) for another WEATHER_CACHE_STALE seconds
+WEATHER_CACHE = TTLCache(
+    ttl=float(os.getenv('WEATHER_CACHE_TTL', '600')),
+    stale_ttl=float(os.getenv('WEATHER_CACHE_STALE', '1800')),
+    max_size=int(os.getenv('WEATHER_CACHE_SIZE', '512')),
+    name='weather'
+)
+
+WEATHER_FLIGHTS = SingleFlight('weather')
+
+# Encoded JSON of payload parts shared by many responses: the per-entry parts
+# of cached weather (WEATHER_SHARED_PARTS), hazard truth tables, health status
+SHARED_FRAGMENTS = FragmentCache(max_size=4 * WEATHER_CACHE.max_size)
+
+# Keys of a weather result that localize_weather() passes through unchanged
+WEATHER_SHARED_PARTS = ('current', 'forecast', 'flood_risk')
+
+# Coordinates are rounded to this many decimals for the cache key (2 ≈ 1 km)
+WEATHER_CACHE_PRECISION = int(os.getenv('WEATHER_CACHE_PRECISION', '2'))
+
+WEATHER_KEY_ERROR = 'API key not configured. Please set OPENWEATHER_API_KEY in .env file'
+
+def resolve_weather_location(city: str = None, lat: float = None, lon: float = None) -> Tuple[float, float]:
+    """Requested coordinates, or the default city (Banda Aceh) when incomplete"""
+    if not lat or not lon:
+        lat = float(os.getenv('DEFAULT_LAT', '5.5483'))
+        lon = float(os.getenv('DEFAULT_LON', '95.3238'))
+    return lat, lon
+
+def weather_cache_key(lat: float, lon: float) -> Tuple:
+    """Cache/coalescing key: coordinates rounded to WEATHER_CACHE_PRECISION"""
+    return (round(lat, WEATHER_CACHE_PRECISION), round(lon, WEATHER_CACHE_PRECISION), WEATHER_UNITS, WEATHER_LANG)
+
+def is_cacheable_weather(result: Dict) -> bool:
+    """Partial results are served but not cached, so the next request retries"""
+    return result.get('success', False) and not result.get('partial')
+
+def localize_weather(data: Dict, lat: float, lon: float, q: bool = None, r: bool = None) -> Dict:
+    """
+    Cached entries are shared: report the requested coordinates on a copy,
+    and evaluate the flood formula over the forecast timeline with this
+    location's q/r (None = unknown, evaluated as TRUE)
     """
-    Get weather data from OpenWeatherMap API
+    if not data.get('success'):
+        return data
+    data = dict(data)
+    data['location'] = dict(data['location'], lat=lat, lon=lon)
+    if data.get('timeline'):
+        flood = HAZARD_FORMULAS['flood']
+        data['timeline'] = evaluate_timeline(data['timeline'], flood['variables'], flood['steps'],
+                                             {'q': q, 'r': r})
+    return data
+
+def get_weather_data(city: str = None, lat: float = None, lon: float = None,
+                     q: bool = None, r: bool = None) -> Dict:
+    """
+    Get weather data from OpenWeatherMap API (cached)
     
     Args:
         city: City name (optional)
         lat: Latitude (optional)
         lon: Longitude (optional)
+        q, r: Flood inputs of the location for the risk timeline (optional)
     
     Returns:
         Dictionary with weather data
@@ -302,102 +340,205 @@ def get_weather_data(city: str = None, lat: float = None, lon: float = None) ->
     if not api_key:
         return {
             'success': False,
-            'error': 'API key not configured. Please set OPENWEATHER_API_KEY in .env file'
+            'error': WEATHER_KEY_ERROR
         }
     
     # Use provided coordinates or default to Banda Aceh
-    if not lat or not lon:
-        if not city:
-            city = os.getenv('DEFAULT_CITY', 'Banda Aceh')
-        lat = float(os.getenv('DEFAULT_LAT', '5.5483'))
-        lon = float(os.getenv('DEFAULT_LON', '95.3238'))
+    lat, lon = resolve_weather_location(city, lat, lon)
+    key = weather_cache_key(lat, lon)
+    data = WEATHER_CACHE.get_or_load(
+        key,
+        lambda: fetch_weather_data(key[0], key[1], api_key),
+        cacheable=is_cacheable_weather,
+        # Concurrent misses/refreshes for the same key share one upstream fetch
+        flights=WEATHER_FLIGHTS
+    )
+    return localize_weather(data, lat, lon, q, r)
+
+def weather_json(data: Dict) -> Dict:
+    """
+    /api/weather body with the cached entry's shared parts as pre-encoded fragments
+
+    Partial and failed results are not cached, so they are encoded as usual.
+    """
+    if not is_cacheable_weather(data):
+        return data
+    return {key: SHARED_FRAGMENTS.get(value) if key in WEATHER_SHARED_PARTS else value
+            for key, value in data.items()}
+
+OPENWEATHER_BASE_URL = os.getenv('OPENWEATHER_BASE_URL', 'https://api.openweathermap.org').rstrip('/')
+
+# Shared deadline for the current + forecast pair (per-call timeouts live in upstream.py)
+WEATHER_DEADLINE = float(os.getenv('WEATHER_DEADLINE', '6'))
+
+# The forecast is fetched here while the request thread fetches the current
+# weather. Both calls end by the request's deadline (retries only use the time
+# left), so a worker is never held past the deadline of its request.
+WEATHER_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv('WEATHER_FETCH_WORKERS', '16')),
+    thread_name_prefix='weather-fetch'
+)
+
+def upstream_get(endpoint: str, url: str, timeout=None, deadline: float = None):
+    """upstream.upstream_get, imported on first use so requests/urllib3 stay out of cold start"""
+    from upstream import upstream_get as get
+    return get(endpoint, url, timeout, deadline)
+
+def _fetch_json(endpoint: str, url: str, deadline: float = None) -> Dict:
+    """GET a JSON document through the pooled upstream session, raising on HTTP errors"""
+    response = upstream_get(endpoint, url, deadline=deadline)
+    response.raise_for_status()
+    return response.json()
+
+def _assess_flood_risk(rainfall: float, humidity: float) -> Dict:
+    """Simple flood risk assessment based on weather (thresholds shared with the regional scan)"""
+    level = flood_risk_level(rainfall, humidity)
+    return {
+        'level': level,
+        'rainfall': rainfall,
+        'message': get_flood_risk_message(level, rainfall)
+    }
+
+def _process_current(current_data: Dict) -> Dict:
+    """Current conditions block of the /api/weather response"""
+    return {
+        'temp': round(current_data['main']['temp']),
+        'feels_like': round(current_data['main']['feels_like']),
+        'temp_min': round(current_data['main']['temp_min']),
+        'temp_max': round(current_data['main']['temp_max']),
+        'pressure': current_data['main']['pressure'],
+        'humidity': current_data['main']['humidity'],
+        'description': current_data['weather'][0]['description'].capitalize(),
+        'icon': current_data['weather'][0]['icon'],
+        'wind_speed': round(current_data['wind']['speed'] * 3.6, 1),  # Convert m/s to km/h
+        'wind_deg': current_data['wind'].get('deg', 0),
+        'clouds': current_data['clouds']['all'],
+        'visibility': current_data.get('visibility', 10000) / 1000,  # Convert to km
+        'rain_1h': current_data.get('rain', {}).get('1h', 0),
+        'rain_3h': current_data.get('rain', {}).get('3h', 0),
+        'sunrise': datetime.fromtimestamp(current_data['sys']['sunrise']).strftime('%H:%M'),
+        'sunset': datetime.fromtimestamp(current_data['sys']['sunset']).strftime('%H:%M'),
+        'timestamp': datetime.fromtimestamp(current_data['dt']).strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def _current_from_forecast(item: Dict, city: Dict) -> Dict:
+    """Current-conditions block built from a forecast slot (same keys as _process_current)"""
+    rain_3h = item.get('rain', {}).get('3h', 0)
+    return {
+        'temp': round(item['main']['temp']),
+        'feels_like': round(item['main'].get('feels_like', item['main']['temp'])),
+        'temp_min': round(item['main']['temp_min']),
+        'temp_max': round(item['main']['temp_max']),
+        'pressure': item['main'].get('pressure', 0),
+        'humidity': item['main']['humidity'],
+        'description': item['weather'][0]['description'].capitalize(),
+        'icon': item['weather'][0]['icon'],
+        'wind_speed': round(item['wind']['speed'] * 3.6, 1),  # Convert m/s to km/h
+        'wind_deg': item['wind'].get('deg', 0),
+        'clouds': item.get('clouds', {}).get('all', 0),
+        'visibility': item.get('visibility', 10000) / 1000,  # Convert to km
+        'rain_1h': round(rain_3h / 3, 1),
+        'rain_3h': rain_3h,
+        'sunrise': datetime.fromtimestamp(city['sunrise']).strftime('%H:%M') if 'sunrise' in city else '-',
+        'sunset': datetime.fromtimestamp(city['sunset']).strftime('%H:%M') if 'sunset' in city else '-',
+        'timestamp': datetime.fromtimestamp(item['dt']).strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def fetch_weather_data(lat: float, lon: float, api_key: str) -> Dict:
+    """
+    Fetch current weather + forecast from OpenWeatherMap (uncached)
+    
+    Both calls run concurrently (the forecast in WEATHER_POOL, the current
+    weather in this thread) and share one WEATHER_DEADLINE. If only one
+    side arrives in time the result is partial: `forecast` is empty, or
+    `current` is derived from the next forecast slot; `partial` is True and
+    `errors` names the failed side.
+    
+    Returns:
+        Dictionary with weather data, or {'success': False, 'error': ...}
+    """
+    import requests
+
+    query = weather_query(lat, lon, api_key)
+    deadline = time.monotonic() + WEATHER_DEADLINE
+    forecast = WEATHER_POOL.submit(_fetch_json, 'forecast', f'{OPENWEATHER_BASE_URL}/data/2.5/forecast?{query}',
+                                   deadline)
+    calls = {
+        'current': lambda: _fetch_json('weather', f'{OPENWEATHER_BASE_URL}/data/2.5/weather?{query}', deadline),
+        'forecast': lambda: forecast.result(timeout=max(deadline - time.monotonic(), 0)),
+    }
+    
+    fetched = {}
+    errors = {}
+    for name, call in calls.items():
+        try:
+            fetched[name] = call()
+        except FutureTimeoutError:
+            # Still queued behind other fetches: drop it
+            forecast.cancel()
+            errors[name] = f'Timeout after {WEATHER_DEADLINE}s'
+        except requests.exceptions.RequestException as e:
+            errors[name] = str(e)
+        except ValueError as e:
+            errors[name] = f'Invalid JSON: {str(e)}'
+    
+    return assemble_weather_result(lat, lon, fetched, errors)
+
+def weather_query(lat: float, lon: float, api_key: str) -> str:
+    """Query string shared by the /weather and /forecast calls"""
+    return f'lat={lat}&lon={lon}&appid={api_key}&units={WEATHER_UNITS}&lang={WEATHER_LANG}'
+
+def assemble_weather_result(lat: float, lon: float, fetched: Dict, errors: Dict) -> Dict:
+    """
+    Build the /api/weather document from the raw upstream documents
+    
+    Args:
+        fetched: {'current': ..., 'forecast': ...} documents that arrived
+        errors: {'current'|'forecast': message} for the sides that failed
+    """
+    if not fetched:
+        return {
+            'success': False,
+            'error': f"Failed to fetch weather data: {'; '.join(f'{k}: {v}' for k, v in errors.items())}"
+        }
     
     try:
-        # Current weather - reduced timeout
-        current_url = f'https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}&units=metric&lang=id'
-        current_response = requests.get(current_url, timeout=5)
-        current_response.raise_for_status()
-        current_data = current_response.json()
-        
-        # 5-day forecast - reduced timeout
-        forecast_url = f'https://api.openweathermap.org/data/2.5/forecast?lat={lat}&lon={lon}&appid={api_key}&units=metric&lang=id'
-        forecast_response = requests.get(forecast_url, timeout=5)
-        forecast_response.raise_for_status()
-        forecast_data = forecast_response.json()
+        current_data = fetched.get('current')
+        forecast_data = fetched.get('forecast')
         
-        # Process forecast data (get daily forecast)
-        daily_forecast = []
-        processed_dates = set()
+        # One pass over the forecast slots: daily cards + per-slot risk timeline
+        daily_forecast, timeline = build_timeline(forecast_data) if forecast_data else ([], None)
         
-        for item in forecast_data['list'][:40]:  # 5 days * 8 (3-hour intervals)
-            date = datetime.fromtimestamp(item['dt']).strftime('%Y-%m-%d')
-            
-            if date not in processed_dates and len(daily_forecast) < 5:
-                daily_forecast.append({
-                    'date': date,
-                    'day': datetime.fromtimestamp(item['dt']).strftime('%A'),
-                    'temp': round(item['main']['temp']),
-                    'temp_min': round(item['main']['temp_min']),
-                    'temp_max': round(item['main']['temp_max']),
-                    'description': item['weather'][0]['description'].capitalize(),
-                    'icon': item['weather'][0]['icon'],
-                    'humidity': item['main']['humidity'],
-                    'wind_speed': round(item['wind']['speed'] * 3.6, 1),  # Convert m/s to km/h
-                    'rain': item.get('rain', {}).get('3h', 0)
-                })
-                processed_dates.add(date)
-        
-        # Calculate flood risk based on weather
-        rainfall = current_data.get('rain', {}).get('1h', 0)
-        humidity = current_data['main']['humidity']
-        
-        # Simple flood risk assessment based on weather
-        flood_risk_level = 'low'
-        if rainfall > 50 or humidity > 90:
-            flood_risk_level = 'high'
-        elif rainfall > 20 or humidity > 80:
-            flood_risk_level = 'medium'
+        if current_data:
+            location = {
+                'name': current_data['name'],
+                'country': current_data['sys']['country']
+            }
+            current = _process_current(current_data)
+            # Calculate flood risk based on weather
+            flood_risk = _assess_flood_risk(current_data.get('rain', {}).get('1h', 0),
+                                            current_data['main']['humidity'])
+        else:
+            # Forecast only: the next 3-hour slot stands in for current conditions
+            city = forecast_data.get('city', {})
+            location = {'name': city.get('name', ''), 'country': city.get('country', '')}
+            current = _current_from_forecast(forecast_data['list'][0], city)
+            flood_risk = _assess_flood_risk(current['rain_1h'], current['humidity'])
         
-        return {
+        location.update({'lat': lat, 'lon': lon})
+        result = {
             'success': True,
-            'location': {
-                'name': current_data['name'],
-                'country': current_data['sys']['country'],
-                'lat': lat,
-                'lon': lon
-            },
-            'current': {
-                'temp': round(current_data['main']['temp']),
-                'feels_like': round(current_data['main']['feels_like']),
-                'temp_min': round(current_data['main']['temp_min']),
-                'temp_max': round(current_data['main']['temp_max']),
-                'pressure': current_data['main']['pressure'],
-                'humidity': current_data['main']['humidity'],
-                'description': current_data['weather'][0]['description'].capitalize(),
-                'icon': current_data['weather'][0]['icon'],
-                'wind_speed': round(current_data['wind']['speed'] * 3.6, 1),  # Convert m/s to km/h
-                'wind_deg': current_data['wind'].get('deg', 0),
-                'clouds': current_data['clouds']['all'],
-                'visibility': current_data.get('visibility', 10000) / 1000,  # Convert to km
-                'rain_1h': current_data.get('rain', {}).get('1h', 0),
-                'rain_3h': current_data.get('rain', {}).get('3h', 0),
-                'sunrise': datetime.fromtimestamp(current_data['sys']['sunrise']).strftime('%H:%M'),
-                'sunset': datetime.fromtimestamp(current_data['sys']['sunset']).strftime('%H:%M'),
-                'timestamp': datetime.fromtimestamp(current_data['dt']).strftime('%Y-%m-%d %H:%M:%S')
-            },
+            'location': location,
+            'current': current,
             'forecast': daily_forecast,
-            'flood_risk': {
-                'level': flood_risk_level,
-                'rainfall': rainfall,
-                'message': get_flood_risk_message(flood_risk_level, rainfall)
-            }
+            'timeline': timeline,
+            'flood_risk': flood_risk
         }
+        if errors:
+            result['partial'] = True
+            result['errors'] = errors
+        return result
         
-    except requests.exceptions.RequestException as e:
-        return {
-            'success': False,
-            'error': f'Failed to fetch weather data: {str(e)}'
-        }
     except Exception as e:
         return {
             'success': False,
@@ -417,144 +558,721 @@ def get_flood_risk_message(level: str, rainfall: float) -> str:
 # FLASK ROUTES
 # ============================================
 
-@app.route('/')
+# The page does not depend on the request: rendered once, served pre-compressed.
+# Team photos are picked from the built variants (images.py) through srcset.
+INDEX_PAGE = StaticPage('index_enhanced.html', name='index')
+STATIC_PAGES = (INDEX_PAGE,)
+IMAGES = ImageManifest()
+
+@api.route('/')
 def index():
-    """Serve the main web interface"""
-    return render_template('index_enhanced.html')
+    """Serve the main web interface (gzip/brotli, ETag, Cache-Control)"""
+    return INDEX_PAGE.respond()
 
-@app.route('/api/calculate-flood', methods=['POST'])
+def build_flood_payload(p: bool, q: bool, r: bool) -> Dict:
+    """Build the /api/calculate-flood response body"""
+    q_or_r, result = calculate_flood_risk(p, q, r)
+    recommendation = get_flood_recommendation(p, q, r, result)
+    
+    return {
+        'success': True,
+        'variables': {'p': p, 'q': q, 'r': r},
+        'steps': {
+            'q_or_r': q_or_r
+        },
+        'result': result,
+        'recommendation': recommendation
+    }
+
+def build_earthquake_payload(e: bool, b: bool, l: bool) -> Dict:
+    """Build the /api/calculate-earthquake response body"""
+    b_or_l, result = calculate_earthquake_risk(e, b, l)
+    recommendation = get_earthquake_recommendation(e, b, l, result)
+    
+    return {
+        'success': True,
+        'variables': {'e': e, 'b': b, 'l': l},
+        'steps': {'b_or_l': b_or_l},
+        'result': result,
+        'recommendation': recommendation
+    }
+
+def build_combined_payload(*values: bool) -> Dict:
+    """Build the /api/calculate-combined response body (one bool per HAZARDS.variables)"""
+    # Every registered hazard in one evaluation, severity from the lookup table
+    outputs, mask = HAZARDS.evaluate(*values)
+    inputs = dict(zip(HAZARDS.variables, values))
+
+    payload = {'success': True}
+    for name, hazard in HAZARDS.hazards.items():
+        hazard_values = [inputs[v] for v in hazard.variables]
+        result = outputs[HAZARDS.outputs.index(f'{name}_result')]
+        payload[name] = {
+            'variables': dict(zip(hazard.variables, hazard_values)),
+            'result': result,
+            'recommendation': get_hazard_recommendation(name, *hazard_values)
+        }
+    payload['combined_risk'] = HAZARDS.severity_table[mask]
+    return payload
+
+# Every input combination (8 + 8 + 2^len(HAZARDS.variables)) is JSON-encoded
+# once, by create_app() or at deploy time (build_precomputed.py); the
+# endpoints below only look up the bitmask and write the bytes.
+FLOOD_RESPONSES = ResponseTable(('p', 'q', 'r'), build_flood_payload, name='flood')
+EARTHQUAKE_RESPONSES = ResponseTable(('e', 'b', 'l'), build_earthquake_payload, name='earthquake')
+COMBINED_RESPONSES = ResponseTable(HAZARDS.variables, build_combined_payload, name='combined')
+RESPONSE_TABLES = (FLOOD_RESPONSES, EARTHQUAKE_RESPONSES, COMBINED_RESPONSES)
+
+# Deploy-time artifact of RESPONSE_TABLES and STATIC_PAGES, used only while
+# it matches the files they are derived from and the JSON backend that
+# encoded them (see precomputed_store)
+PRECOMPUTED_FILE = os.getenv('PRECOMPUTED_FILE', os.path.join(BASE_DIR, 'data', 'precomputed.pickle'))
+PRECOMPUTED_SOURCES = tuple(os.path.join(BASE_DIR, name) for name in (
+    'web_app_enhanced.py', 'hazards.py', 'logic_engine.py', 'minimize.py', 'rules.py', 'precomputed.py',
+    'fastjson.py', 'images.py',
+    os.path.join('templates', 'index_enhanced.html')
+)) + (RULES.path, IMAGES.path)
+
+# A rule file change re-encodes the responses that embed recommendations
+for _responses in RESPONSE_TABLES:
+    RULES.on_reload(_responses.rebuild)
+
+@api.route('/api/rules', methods=['GET'])
+def api_rules():
+    """Version and rule sets of the loaded recommendation file"""
+    return jsonify({'success': True, **RULES.status()})
+
+@api.route('/api/rules/reload', methods=['POST'])
+def api_rules_reload():
+    """Re-read the rule file now; an invalid file keeps the current rules"""
+    reloaded = RULES.reload(force=True)
+    status = RULES.status()
+    if not reloaded:
+        return jsonify({'success': False, 'error': 'File aturan tidak valid, aturan lama tetap dipakai',
+                        **status}), 400
+    return jsonify({'success': True, **status})
+
+@api.route('/api/calculate-flood', methods=['POST'])
 def api_calculate_flood():
-    """Calculate flood risk"""
+    """Calculate flood risk (pre-encoded response, supports If-None-Match)"""
     try:
         data = request.get_json()
-        p = bool(data.get('p', False))
-        q = bool(data.get('q', False))
-        r = bool(data.get('r', False))
-        
-        q_or_r, result = calculate_flood_risk(p, q, r)
-        recommendation = get_flood_recommendation(p, q, r, result)
-        
-        return jsonify({
-            'success': True,
-            'variables': {'p': p, 'q': q, 'r': r},
-            'steps': {
-                'q_or_r': q_or_r
-            },
-            'result': result,
-            'recommendation': recommendation
-        })
+        return FLOOD_RESPONSES.respond(data)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
-@app.route('/api/calculate-earthquake', methods=['POST'])
+@api.route('/api/calculate-earthquake', methods=['POST'])
 def api_calculate_earthquake():
-    """Calculate earthquake risk"""
+    """Calculate earthquake risk (pre-encoded response, supports If-None-Match)"""
     try:
         data = request.get_json()
-        e = bool(data.get('e', False))
-        b = bool(data.get('b', False))
-        l = bool(data.get('l', False))
-        
-        b_or_l, result = calculate_earthquake_risk(e, b, l)
-        recommendation = get_earthquake_recommendation(e, b, l, result)
-        
-        return jsonify({
-            'success': True,
-            'variables': {'e': e, 'b': b, 'l': l},
-            'steps': {'b_or_l': b_or_l},
-            'result': result,
-            'recommendation': recommendation
-        })
+        return EARTHQUAKE_RESPONSES.respond(data)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
-@app.route('/api/calculate-combined', methods=['POST'])
+@api.route('/api/calculate-combined', methods=['POST'])
 def api_calculate_combined():
-    """Calculate combined disaster risk"""
+    """Calculate combined disaster risk (pre-encoded response, supports If-None-Match)"""
     try:
         data = request.get_json()
-        
-        # Flood variables
-        p = bool(data.get('p', False))
-        q = bool(data.get('q', False))
-        r = bool(data.get('r', False))
-        
-        # Earthquake variables
-        e = bool(data.get('e', False))
-        b = bool(data.get('b', False))
-        l = bool(data.get('l', False))
-        
-        # Calculate both risks
-        q_or_r, flood_result = calculate_flood_risk(p, q, r)
-        b_or_l, quake_result = calculate_earthquake_risk(e, b, l)
-        
-        # Get combined risk assessment
-        combined_risk = calculate_combined_risk(flood_result, quake_result)
-        
-        # Get specific recommendations
-        flood_rec = get_flood_recommendation(p, q, r, flood_result)
-        quake_rec = get_earthquake_recommendation(e, b, l, quake_result)
-        
+        return COMBINED_RESPONSES.respond(data)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+# Upper bound on scenarios per /api/calculate-batch request
+MAX_BATCH_SCENARIOS = 200000
+
+# Values a column may hold (0/1 hash equal to False/True)
+_BATCH_VALUES = frozenset({False, True})
+
+def _check_batch_columns(columns: Dict[str, List]):
+    """Raise ValueError unless every column holds only booleans or 0/1"""
+    for name, column in columns.items():
+        try:
+            valid = _BATCH_VALUES.issuperset(column)
+        except TypeError:
+            valid = False
+        if not valid:
+            raise ValueError(f'Kolom "{name}" hanya boleh berisi true/false atau 0/1')
+
+def _batch_columns(data: Dict, variables: Tuple[str, ...]) -> Tuple[Dict[str, List[bool]], int, bool]:
+    """
+    Read scenarios from either row form or columnar form
+
+    Returns:
+        (columns, size, columnar)
+    """
+    if 'columns' in data:
+        raw = data['columns'] or {}
+        if not isinstance(raw, dict):
+            raise ValueError('"columns" harus berupa object {variabel: array}')
+        columns = {}
+        for v in variables:
+            if v in raw:
+                if not isinstance(raw[v], list):
+                    raise ValueError(f'Kolom "{v}" harus berupa array boolean')
+                columns[v] = raw[v]
+        sizes = {len(c) for c in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError('Semua kolom harus memiliki panjang yang sama')
+        size = data.get('size', sizes.pop() if sizes else 0)
+        if isinstance(size, bool) or not isinstance(size, int) or size < 0:
+            raise ValueError('"size" harus bilangan bulat tidak negatif')
+        if columns and size != len(next(iter(columns.values()))):
+            raise ValueError('"size" harus sama dengan panjang kolom')
+        return columns, size, True
+
+    scenarios = data.get('scenarios')
+    if not isinstance(scenarios, list):
+        raise ValueError('Body harus berisi "scenarios" (array) atau "columns" (object)')
+    # Values only need to be truthy/falsy: pack_bits does the bool conversion
+    columns = {v: [s.get(v) for s in scenarios] for v in variables}
+    return columns, len(scenarios), False
+
+@api.route('/api/calculate-batch', methods=['POST'])
+def api_calculate_batch():
+    """
+    Evaluate many scenarios in one vectorized (bit-parallel) pass
+
+    Expected JSON body, row form:
+        {"hazard": "flood", "scenarios": [{"p": true, "q": false, "r": true}, ...]}
+    or columnar form:
+        {"hazard": "combined", "columns": {"p": [...], "q": [...], ..., "l": [...]}}
+
+    hazard: a registered hazard ('flood', 'earthquake', 'landslide', 'tsunami')
+    or 'combined' (default 'flood'). 'combined' evaluates every registered
+    hazard in one pass; inputs left out count as False.
+    Results keep the request order and use the same shape (rows or columns)
+    as the input. Full recommendation texts are served by the single-scenario
+    endpoints.
+    """
+    try:
+        data = request.get_json()
+        hazard = data.get('hazard', 'flood')
+        if hazard == 'combined':
+            variables = HAZARDS.variables
+        elif hazard in HAZARD_FORMULAS:
+            variables = HAZARD_FORMULAS[hazard]['variables']
+        else:
+            return jsonify({'success': False, 'error': f'Hazard tidak dikenal: {hazard}'}), 400
+
+        columns, size, columnar = _batch_columns(data, variables)
+        if size > MAX_BATCH_SCENARIOS:
+            return jsonify({
+                'success': False,
+                'error': f'Maksimal {MAX_BATCH_SCENARIOS} skenario per request'
+            }), 413
+        if columnar:
+            _check_batch_columns(columns)
+
+        if hazard == 'combined':
+            results, index = HAZARDS.evaluate_batch(columns, size)
+            levels = [c['level'] for c in HAZARDS.severity_table]
+            severities = [c['severity'] for c in HAZARDS.severity_table]
+            results['level'] = [levels[i] for i in index]
+            results['severity'] = [severities[i] for i in index]
+        else:
+            spec = HAZARD_FORMULAS[hazard]
+            results = evaluate_batch(spec['variables'], spec['steps'], columns, size)
+
+        if not columnar:
+            names = list(results)
+            results = [dict(zip(names, row)) for row in zip(*results.values())]
+
+        return jsonify({'success': True, 'hazard': hazard, 'count': size, 'results': results})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+# Tables up to this many rows are returned with a single jsonify call;
+# larger ones are streamed row by row so the full list is never built
+TRUTH_TABLE_INLINE_ROWS = 4096
+
+def _truth_table_query() -> Dict:
+    """Read offset/limit/only_true/format query parameters"""
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', type=int)
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError('offset dan limit tidak boleh negatif')
+    return {
+        'offset': offset,
+        'limit': limit,
+        'only_true': request.args.get('only_true', '').lower() in ('1', 'true', 'yes'),
+        'format': request.args.get('format', 'json').lower(),
+    }
+
+def truth_table_response(table, shared: bool = False):
+    """
+    Serve a TruthTable as JSON, chunked JSON, or NDJSON
+
+    shared: the table object is reused across requests, so its full row
+    list is encoded once and spliced into later responses.
+
+    Query parameters:
+        offset, limit: Pagination over (filtered) rows
+        only_true: Only rows where result is true
+        format: 'json' (default) or 'ndjson' (one row per line, streamed)
+    """
+    query = _truth_table_query()
+    rows = table.rows(query['offset'], query['limit'], query['only_true'])
+    total = table.count() if query['only_true'] else len(table)
+    headers = {'X-Total-Rows': str(total)}
+    dumps = current_app.json.dumps
+
+    if query['format'] == 'ndjson':
+        def generate_ndjson():
+            for row in rows:
+                yield dumps(row) + '\n'
+        return Response(stream_with_context(generate_ndjson()),
+                        mimetype='application/x-ndjson', headers=headers)
+
+    if query['format'] != 'json':
+        raise ValueError(f"Format tidak dikenal: {query['format']}")
+
+    returned = max(total - query['offset'], 0)
+    if query['limit'] is not None:
+        returned = min(returned, query['limit'])
+
+    # Same keys whether the body is built inline or streamed
+    page = {'offset': query['offset'], 'limit': query['limit'], 'total': total}
+
+    if returned <= TRUTH_TABLE_INLINE_ROWS:
+        if shared and not request.args:
+            # Whole table of a cached hazard: encoded once, then spliced
+            payload = {'success': True, 'table': SHARED_FRAGMENTS.get(table, lambda t: list(t.rows()))}
+        else:
+            payload = {'success': True, 'table': list(rows)}
+        payload.update(page)
+        response = jsonify(payload)
+        response.headers.update(headers)
+        return response
+
+    def generate_json():
+        yield dumps({'success': True, **page})[:-1] + ',"table":['
+        first = True
+        for row in rows:
+            yield ('' if first else ',') + dumps(row)
+            first = False
+        yield ']}\n'
+    return Response(stream_with_context(generate_json()),
+                    mimetype='application/json', headers=headers)
+
+@api.route('/api/truth-table/flood', methods=['GET'])
+def api_flood_truth_table():
+    """Get flood truth table (supports offset, limit, only_true, format=ndjson)"""
+    try:
+        return truth_table_response(generate_hazard_truth_table('flood'), shared=True)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@api.route('/api/truth-table/earthquake', methods=['GET'])
+def api_earthquake_truth_table():
+    """Get earthquake truth table (supports offset, limit, only_true, format=ndjson)"""
+    try:
+        return truth_table_response(generate_hazard_truth_table('earthquake'), shared=True)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+# Custom formulas accepted by the public truth-table endpoint. logic_engine
+# builds tables up to MAX_TRUTH_TABLE_VARIABLES (26), but one such request
+# peaks near 300 MB; 20 variables stay at a few MB.
+MAX_CUSTOM_TABLE_VARIABLES = 20
+
+@api.route('/api/truth-table/custom', methods=['GET'])
+def api_custom_truth_table():
+    """
+    Truth table for an arbitrary formula, e.g. ?formula=p %26 (q | r) %26 ~s
+
+    Variables are ordered by first appearance (first = most significant).
+    """
+    try:
+        formula = request.args.get('formula', '').strip()
+        if not formula:
+            return jsonify({'success': False, 'error': 'Parameter formula diperlukan'}), 400
+        variables = variables_of(parse(formula))
+        if len(variables) > MAX_CUSTOM_TABLE_VARIABLES:
+            raise ValueError(f'Maksimal {MAX_CUSTOM_TABLE_VARIABLES} variabel, formula memiliki {len(variables)}')
+        return truth_table_response(build_truth_table(variables, [('result', formula)]))
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@api.route('/api/truth-table/<hazard>', methods=['GET'])
+def api_hazard_truth_table(hazard: str):
+    """Truth table of any registered hazard, e.g. /api/truth-table/landslide"""
+    if hazard not in HAZARD_FORMULAS:
+        return jsonify({'success': False, 'error': f'Hazard tidak dikenal: {hazard}'}), 404
+    try:
+        return truth_table_response(generate_hazard_truth_table(hazard), shared=True)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+def _int_list(value) -> List[int]:
+    """Minterm list from JSON ([1, 3]) or a query string ('1,3')"""
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [int(item) for item in value]
+
+@api.route('/api/minimize', methods=['GET', 'POST'])
+def api_minimize():
+    """
+    Minimal form of a rule, given as ?formula=... or as truth-table rows
+    (variables=a,b,c&minterms=1,3,5&dont_cares=7; JSON body also accepted).
+    Without parameters, reports the hazard formulas used by the evaluator.
+    """
+    try:
+        data = request.get_json(silent=True) or request.args
+        formula = (data.get('formula') or '').strip()
+        if formula:
+            return jsonify({'success': True, **minimize(formula).as_dict()})
+        if data.get('minterms') is not None:
+            variables = data.get('variables') or ''
+            if isinstance(variables, str):
+                variables = [v.strip() for v in variables.split(',') if v.strip()]
+            if not variables:
+                raise ValueError('Parameter variables diperlukan bersama minterms')
+            rule = minimize_table(variables, _int_list(data.get('minterms')), _int_list(data.get('dont_cares')))
+            return jsonify({'success': True, **rule.as_dict()})
         return jsonify({
             'success': True,
-            'flood': {
-                'variables': {'p': p, 'q': q, 'r': r},
-                'result': flood_result,
-                'recommendation': flood_rec
-            },
-            'earthquake': {
-                'variables': {'e': e, 'b': b, 'l': l},
-                'result': quake_result,
-                'recommendation': quake_rec
+            'hazards': {
+                name: {step: rule.as_dict() for step, rule in report.items()}
+                for name, (_, report) in HAZARD_MINIMIZED.items()
             },
-            'combined_risk': combined_risk
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
-@app.route('/api/truth-table/flood', methods=['GET'])
-def api_flood_truth_table():
-    """Get flood truth table"""
+@lru_cache(maxsize=32)
+def _custom_mitigation_solver(formula: str, costs: Tuple[Tuple[str, float], ...]) -> MitigationSolver:
+    variables = variables_of(parse(formula))
+    if len(variables) > MAX_ANALYZE_VARIABLES:
+        raise ValueError(f'Maksimal {MAX_ANALYZE_VARIABLES} variabel, formula memiliki {len(variables)}')
+    return MitigationSolver(variables, [('result', formula)], dict(costs), max_nodes=MAX_ANALYZE_NODES)
+
+@api.route('/api/mitigation/<hazard>', methods=['GET'])
+def api_mitigation(hazard):
+    """
+    Cheapest set of controllable inputs to change so the risk becomes FALSE
+
+    Inputs as query flags (missing = false), e.g. /api/mitigation/flood?p=1&q=1&r=1.
+    Costs default to MITIGATION_COSTS and are overridden with cost_<name>=...;
+    for custom formulas (?formula=...) the cost_ parameters also say which
+    inputs are controllable.
+    """
     try:
-        table = generate_flood_truth_table()
-        return jsonify({'success': True, 'table': table})
+        args = request.args
+        costs = {key[5:]: float(value) for key, value in args.items() if key.startswith('cost_')}
+        if hazard == 'custom':
+            formula = args.get('formula', '').strip()
+            if not formula:
+                return jsonify({'success': False, 'error': 'Parameter formula diperlukan'}), 400
+            if not costs:
+                raise ValueError('Tentukan variabel terkendali dengan cost_<nama>=biaya')
+            solver = _custom_mitigation_solver(formula, tuple(sorted(costs.items())))
+        elif hazard in HAZARD_FORMULAS:
+            costs = dict(MITIGATION_COSTS.get(hazard, {}), **costs)
+            solver = mitigation_solver(hazard, tuple(sorted(costs.items())))
+        else:
+            return jsonify({'success': False, 'error': f'Hazard tidak dikenal: {hazard}'}), 404
+
+        inputs = {name: bool(parse_flag(args.get(name))) for name in solver.variables}
+        result = solver.solve(inputs)
+        for change in result['changes']:
+            change['label'] = VARIABLE_LABELS.get(change['variable'], change['variable'])
+        return jsonify({'success': True, 'hazard': hazard, 'inputs': inputs, 'costs': solver.costs, **result})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
-@app.route('/api/truth-table/earthquake', methods=['GET'])
-def api_earthquake_truth_table():
-    """Get earthquake truth table"""
+# Custom formulas accepted by /api/analyze and /api/mitigation/custom. BDDs
+# scale far past truth tables, but some formulas still grow exponentially:
+# a request stops with a 400 once its diagram needs MAX_ANALYZE_NODES nodes
+# (a fraction of a second, a few MB per cached manager)
+MAX_ANALYZE_VARIABLES = 64
+MAX_ANALYZE_NODES = 20000
+
+@lru_cache(maxsize=32)
+def _custom_bdd(formula: str) -> Tuple[BDD, int, Tuple[str, ...]]:
+    """Own manager per custom formula, so requests never grow the shared table"""
+    variables = variables_of(parse(formula))
+    if len(variables) > MAX_ANALYZE_VARIABLES:
+        raise ValueError(f'Maksimal {MAX_ANALYZE_VARIABLES} variabel, formula memiliki {len(variables)}')
+    bdd = BDD(variables, max_nodes=MAX_ANALYZE_NODES)
+    node = bdd.compile(formula)
+    # Only the nodes are needed by later requests
+    bdd.clear_caches()
+    return bdd, node, variables
+
+@api.route('/api/analyze/<hazard>', methods=['GET'])
+def api_analyze(hazard):
+    """
+    Scenario analysis without enumeration (flood, earthquake or custom)
+
+    Known inputs come as query parameters, e.g. /api/analyze/flood?p=1 or
+    /api/analyze/custom?formula=a %26 (b | c)&a=1; the response counts the
+    combinations of the remaining inputs that give TRUE.
+    """
     try:
-        table = generate_earthquake_truth_table()
-        return jsonify({'success': True, 'table': table})
+        args = request.args
+        if hazard == 'custom':
+            formula = args.get('formula', '').strip()
+            if not formula:
+                return jsonify({'success': False, 'error': 'Parameter formula diperlukan'}), 400
+            bdd, node, variables = _custom_bdd(formula)
+        elif hazard in HAZARD_FORMULAS:
+            formula = None
+            bdd, node = HAZARD_BDD, HAZARD_BDD_NODES[hazard]
+            variables = HAZARD_FORMULAS[hazard]['variables']
+        else:
+            return jsonify({'success': False, 'error': f'Hazard tidak dikenal: {hazard}'}), 404
+
+        unknown = [name for name in args if name != 'formula' and name not in variables]
+        if unknown:
+            raise ValueError(f"Variabel tidak dikenal: {', '.join(unknown)}")
+        known = {name: parse_flag(args.get(name)) for name in variables if name in args}
+        known = {name: value for name, value in known.items() if value is not None}
+
+        payload = {'success': True, 'hazard': hazard, 'variables': list(variables)}
+        if formula is not None:
+            payload['formula'] = formula
+        payload.update(analyze(bdd, node, variables, known))
+        return jsonify(payload)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
-@app.route('/api/weather', methods=['GET'])
+@api.route('/api/weather', methods=['GET'])
 def api_weather():
-    """Get current weather and forecast"""
+    """
+    Get current weather and forecast
+    
+    Optional ?q=1&r=0 set the location's flood inputs for the per-slot risk
+    timeline; omitted ones are treated as TRUE (worst case).
+    """
     try:
         city = request.args.get('city')
         lat = request.args.get('lat', type=float)
         lon = request.args.get('lon', type=float)
+        q = parse_flag(request.args.get('q'))
+        r = parse_flag(request.args.get('r'))
         
-        weather_data = get_weather_data(city=city, lat=lat, lon=lon)
-        return jsonify(weather_data)
+        weather_data = get_weather_data(city=city, lat=lat, lon=lon, q=q, r=r)
+        return jsonify(weather_json(weather_data))
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
-@app.route('/api/weather/search', methods=['GET'])
+@api.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics: request latency per route, in-flight requests, upstream calls, caches"""
+    return Response(METRICS.render(), content_type=CONTENT_TYPE)
+
+@api.route('/api/weather/cache-stats', methods=['GET'])
+def api_weather_cache_stats():
+    """Weather cache counters (hits, stale hits, misses, refreshes, ...) and coalescing counters"""
+    return jsonify({
+        'success': True,
+        'weather_cache': WEATHER_CACHE.stats(),
+        'weather_flights': WEATHER_FLIGHTS.stats(),
+        'geocode_flights': GEOCODE_FLIGHTS.stats()
+    })
+
+# Remote geocoding results written back into the offline gazetteer: only
+# places in its country, and at most GAZETTEER_MAX_ADDED of them per process
+GAZETTEER_COUNTRY = 'ID'
+GAZETTEER_MAX_ADDED = int(os.getenv('GAZETTEER_MAX_ADDED', '2000'))
+GAZETTEER = GazetteerIndex.from_csv(max_added=GAZETTEER_MAX_ADDED)
+
+def remember_places(cities: List[Dict]) -> int:
+    """Write remote geocoding results back so the next search stays offline"""
+    return GAZETTEER.add_many([city for city in cities if city['country'] == GAZETTEER_COUNTRY])
+
+def gazetteer_search(city: str) -> Tuple[List[Dict], bool]:
+    """
+    Offline matches of /api/weather/search and whether they answer it
+
+    Exact and prefix matches are final. Fuzzy-only matches may be a typo or
+    a different place than the one typed (the gazetteer does not list every
+    kecamatan), so remote geocoding still runs and they are merged after it.
+    """
+    local = GAZETTEER.search(city, limit=5)
+    final = bool(local) and local[0][1] >= SCORE_PREFIX
+    METRICS.cache_lookup('gazetteer', final)
+    return [place for place, _ in local], final
+
+GEOCODE_FLIGHTS = SingleFlight('geocode')
+
+# Single-flight groups reported on /metrics (asgi_app adds its async ones)
+FLIGHTS = [WEATHER_FLIGHTS, GEOCODE_FLIGHTS]
+
+def weather_cache_stats() -> Dict:
+    """Weather cache counters for /metrics (a stale hit is still a hit)"""
+    stats = WEATHER_CACHE.stats()
+    return {'hits': stats['hits'] + stats['stale_hits'], 'misses': stats['misses'], 'size': stats['size']}
+
+# /metrics: caches report their own counters at scrape time; the gazetteer
+# (local search answered vs remote geocoding needed) is counted per lookup
+METRICS.add_cache('weather', weather_cache_stats)
+METRICS.add_cache('json_fragments', SHARED_FRAGMENTS.stats)
+for _name, _cached in (('truth_tables', generate_hazard_truth_table), ('mitigation_solvers', mitigation_solver),
+                       ('custom_mitigation_solvers', _custom_mitigation_solver), ('custom_bdds', _custom_bdd),
+                       ('minimize', minimize), ('formula_parse', parse)):
+    METRICS.add_cache(_name, lru_cache_stats(_cached))
+METRICS.add_collector('singleflight_calls_total', 'counter', 'Upstream calls made by a single-flight group',
+                      ('flight',), lambda: [((f.name,), f.stats()['calls']) for f in FLIGHTS])
+METRICS.add_collector('singleflight_coalesced_total', 'counter', 'Callers that shared an upstream call already running',
+                      ('flight',), lambda: [((f.name,), f.stats()['coalesced']) for f in FLIGHTS])
+
+def _city_result(place: Dict) -> Dict:
+    """Public city fields of a gazetteer or geocoding entry"""
+    return {
+        'name': place['name'],
+        'country': place['country'],
+        'state': place['state'],
+        'lat': place['lat'],
+        'lon': place['lon']
+    }
+
+def geocode_urls(city: str, api_key: str) -> Tuple[str, str]:
+    """Direct-geocoding URLs: Indonesia first, then global"""
+    return (f'{OPENWEATHER_BASE_URL}/geo/1.0/direct?q={city},ID&limit=10&appid={api_key}',
+            f'{OPENWEATHER_BASE_URL}/geo/1.0/direct?q={city}&limit=15&appid={api_key}')
+
+def rank_geocode_results(items: List[Dict], city_lower: str, seen: set, indonesia_search: bool) -> List[Dict]:
+    """
+    Rank raw geocoding matches, skipping coordinates already in `seen`
+    
+    Priority: exact match ID > exact match other > ID cities > others
+    (every result of the Indonesia search counts as an ID city).
+    """
+    ranked = []
+    for item in items:
+        # Skip if already added
+        if (item['lat'], item['lon']) in seen:
+            continue
+        seen.add((item['lat'], item['lon']))
+        is_exact_match = item['name'].lower() == city_lower
+        
+        if indonesia_search:
+            priority = 0 if is_exact_match else 1  # Exact match = highest priority
+            score = 100 if is_exact_match else 50
+        else:
+            is_indonesia = item['country'] == 'ID'
+            if is_exact_match and is_indonesia:
+                priority = 0
+                score = 100
+            elif is_exact_match:
+                priority = 1
+                score = 90
+            elif is_indonesia:
+                priority = 2
+                score = 60
+            else:
+                priority = 3
+                score = 30
+        
+        ranked.append({
+            'name': item['name'],
+            'country': item['country'],
+            'state': item.get('state', ''),
+            'lat': item['lat'],
+            'lon': item['lon'],
+            'priority': priority,
+            'match_score': score
+        })
+    return ranked
+
+def geocode_remote(city: str, api_key: str) -> List[Dict]:
+    """
+    Remote geocoding via OpenWeatherMap (Indonesia first, then global)
+    
+    Results are ranked with 'priority'/'match_score'; Indonesian ones are added to GAZETTEER.
+    """
+    city_lower = city.lower()
+    url_id, url_global = geocode_urls(city, api_key)
+    all_cities = []
+    seen = set()
+    
+    logger.debug('Geocoding city %r', city)
+    
+    # Strategy 1: Search with Indonesia country code first (highest priority)
+    try:
+        response_id = upstream_get('geo', url_id)
+        if response_id.ok:
+            data_id = response_id.json()
+            logger.debug('%d results from Indonesia search', len(data_id))
+            all_cities.extend(rank_geocode_results(data_id, city_lower, seen, indonesia_search=True))
+    except Exception as e:
+        logger.warning('Indonesia geocoding search for %r failed: %s', city, e)
+    
+    # Strategy 2: Global search (lower priority)
+    if len(all_cities) < 5:
+        try:
+            response_global = upstream_get('geo', url_global)
+            if response_global.ok:
+                data_global = response_global.json()
+                logger.debug('%d results from global search', len(data_global))
+                all_cities.extend(rank_geocode_results(data_global, city_lower, seen, indonesia_search=False))
+        except Exception as e:
+            logger.warning('Global geocoding search for %r failed: %s', city, e)
+    
+    remember_places(all_cities)
+    return all_cities
+
+def remote_search_response(city: str, all_cities: List[Dict], fuzzy: List[Dict] = ()) -> Tuple[Dict, int]:
+    """
+    Top 5 remote matches as the /api/weather/search body and status
+    
+    Local fuzzy matches (see gazetteer_search) fill the list after the
+    remote ones, skipping names the remote search already returned.
+    """
+    # Sort by priority and match score, then limit to 5
+    # (sorted copy: the list may be shared with coalesced requests)
+    all_cities = sorted(all_cities, key=lambda x: (x['priority'], -x['match_score'], x['name']))
+    
+    if all_cities:
+        top = all_cities[0]
+        logger.debug('%d unique cities, top result %s, %s (priority %d, score %d)',
+                     len(all_cities), top['name'], top['country'], top['priority'], top['match_score'])
+    
+    remote_names = {normalize(c['name']) for c in all_cities}
+    source = 'remote' if all_cities else 'local'
+    all_cities += [place for place in fuzzy if normalize(place['name']) not in remote_names]
+    cities = [_city_result(c) for c in all_cities[:5]]
+    
+    if not cities:
+        logger.debug('No cities found for %r', city)
+        return {
+            'success': False,
+            'error': f'Kota "{city}" tidak ditemukan'
+        }, 404
+    
+    return {'success': True, 'source': source, 'cities': cities}, 200
+
+def _remote_city_search(city: str, api_key: str, fuzzy: List[Dict]):
+    """Geocoding fallback of /api/weather/search (requests is imported on first use)"""
+    import requests
+
+    try:
+        # Identical concurrent searches share one pair of geocoding calls
+        all_cities = GEOCODE_FLIGHTS.do(city.lower(), lambda: geocode_remote(city, api_key))
+    except requests.exceptions.Timeout:
+        return jsonify({'success': False, 'error': 'Koneksi timeout. Coba lagi.'}), 408
+    except requests.exceptions.RequestException as e:
+        return jsonify({'success': False, 'error': f'Gagal terhubung ke server: {str(e)}'}), 500
+
+    payload, status = remote_search_response(city, all_cities, fuzzy)
+    return jsonify(payload), status
+
+@api.route('/api/weather/search', methods=['GET'])
 def api_weather_search():
-    """Search for city coordinates with Indonesia priority and exact match"""
+    """
+    Search for city coordinates with Indonesia priority and exact match
+    
+    The offline gazetteer answers exact and prefix matches; otherwise remote
+    geocoding runs (merged with any fuzzy local matches) and its Indonesian
+    results are written back into the gazetteer.
+    """
     try:
         city = request.args.get('city', '').strip()
-        api_key = os.getenv('OPENWEATHER_API_KEY')
-        
-        if not api_key:
-            return jsonify({
-                'success': False,
-                'error': 'Kunci API tidak dikonfigurasi'
-            }), 400
         
         if not city:
             return jsonify({
@@ -562,159 +1280,125 @@ def api_weather_search():
                 'error': 'Parameter kota diperlukan'
             }), 400
         
-        city_lower = city.lower()
-        all_cities = []
-        
-        print(f"\n🔍 Searching for city: '{city}'")
-        
-        # Strategy 1: Search with Indonesia country code first (highest priority)
-        try:
-            url_id = f'https://api.openweathermap.org/geo/1.0/direct?q={city},ID&limit=10&appid={api_key}'
-            response_id = requests.get(url_id, timeout=3)
-            if response_id.ok:
-                data_id = response_id.json()
-                print(f"📍 Found {len(data_id)} results from Indonesia search")
-                for item in data_id:
-                    is_exact_match = item['name'].lower() == city_lower
-                    all_cities.append({
-                        'name': item['name'],
-                        'country': item['country'],
-                        'state': item.get('state', ''),
-                        'lat': item['lat'],
-                        'lon': item['lon'],
-                        'priority': 0 if is_exact_match else 1,  # Exact match = highest priority
-                        'match_score': 100 if is_exact_match else 50
-                    })
-        except Exception as e:
-            print(f"❌ Indonesia search error: {e}")
-        
-        # Strategy 2: Global search (lower priority)
-        if len(all_cities) < 5:
-            try:
-                url_global = f'https://api.openweathermap.org/geo/1.0/direct?q={city}&limit=15&appid={api_key}'
-                response_global = requests.get(url_global, timeout=3)
-                if response_global.ok:
-                    data_global = response_global.json()
-                    print(f"🌍 Found {len(data_global)} results from global search")
-                    for item in data_global:
-                        # Skip if already added
-                        if not any(c['lat'] == item['lat'] and c['lon'] == item['lon'] for c in all_cities):
-                            is_exact_match = item['name'].lower() == city_lower
-                            is_indonesia = item['country'] == 'ID'
-                            
-                            # Priority: exact match ID > exact match other > ID cities > others
-                            if is_exact_match and is_indonesia:
-                                priority = 0
-                                score = 100
-                            elif is_exact_match:
-                                priority = 1
-                                score = 90
-                            elif is_indonesia:
-                                priority = 2
-                                score = 60
-                            else:
-                                priority = 3
-                                score = 30
-                            
-                            all_cities.append({
-                                'name': item['name'],
-                                'country': item['country'],
-                                'state': item.get('state', ''),
-                                'lat': item['lat'],
-                                'lon': item['lon'],
-                                'priority': priority,
-                                'match_score': score
-                            })
-            except Exception as e:
-                print(f"❌ Global search error: {e}")
-        
-        # Sort by priority and match score, then limit to 5
-        all_cities.sort(key=lambda x: (x['priority'], -x['match_score'], x['name']))
-        
-        print(f"✅ Total unique cities found: {len(all_cities)}")
-        if all_cities:
-            print(f"🏆 Top result: {all_cities[0]['name']}, {all_cities[0]['country']} (priority: {all_cities[0]['priority']}, score: {all_cities[0]['match_score']})")
+        local, final = gazetteer_search(city)
+        if final:
+            return jsonify({'success': True, 'source': 'local', 'cities': [_city_result(p) for p in local]})
         
-        cities = [
-            {
-                'name': c['name'],
-                'country': c['country'],
-                'state': c['state'],
-                'lat': c['lat'],
-                'lon': c['lon']
-            }
-            for c in all_cities[:5]
-        ]
+        api_key = os.getenv('OPENWEATHER_API_KEY')
         
-        if not cities:
-            print(f"❌ No cities found for: '{city}'")
+        if not api_key:
+            if local:
+                return jsonify({'success': True, 'source': 'local', 'cities': [_city_result(p) for p in local]})
             return jsonify({
                 'success': False,
-                'error': f'Kota "{city}" tidak ditemukan'
-            }), 404
+                'error': 'Kunci API tidak dikonfigurasi'
+            }), 400
         
-        return jsonify({'success': True, 'cities': cities})
+        return _remote_city_search(city, api_key, local)
         
-    except requests.exceptions.Timeout:
-        return jsonify({'success': False, 'error': 'Koneksi timeout. Coba lagi.'}), 408
-    except requests.exceptions.RequestException as e:
-        return jsonify({'success': False, 'error': f'Gagal terhubung ke server: {str(e)}'}), 500
     except Exception as e:
-        print(f"❌ Search error: {e}")
+        logger.exception('City search for %r failed', request.args.get('city'))
         return jsonify({'success': False, 'error': f'Terjadi kesalahan: {str(e)}'}), 400
 
-@app.route('/api/health', methods=['GET'])
+REGION_FLAGS = load_region_flags()
+
+@api.route('/api/scan/flood', methods=['GET', 'POST'])
+def api_scan_flood():
+    """
+    Flood risk for many regions at once, streamed as NDJSON
+    
+    GET  ?state=Aceh&concurrency=8     every stored region (optionally one province)
+    POST {"regions": ["Aceh Barat", {"name": "X", "lat": 4.1, "lon": 96.1, "q": true, "r": false}],
+          "concurrency": 8}
+    
+    p comes from the current rainfall, q/r from data/region_flags.csv (or the
+    request). One line per region in completion order, then a summary line.
+    """
+    try:
+        data = request.get_json() if request.method == 'POST' else {}
+        state = (data.get('state') or request.args.get('state', '')).strip()
+        concurrency = int(data.get('concurrency') or request.args.get('concurrency', SCAN_CONCURRENCY))
+        requested = data.get('regions') or [f['name'] for f in REGION_FLAGS.values()
+                                            if not state or f['state'].lower() == state.lower()]
+        if not isinstance(requested, list):
+            raise ValueError('"regions" harus berupa array')
+        if len(requested) > MAX_SCAN_REGIONS:
+            return jsonify({
+                'success': False,
+                'error': f'Maksimal {MAX_SCAN_REGIONS} wilayah per scan'
+            }), 413
+        concurrency = max(1, min(concurrency, MAX_SCAN_CONCURRENCY))
+        targets = resolve_regions(requested, REGION_FLAGS, GAZETTEER)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    dumps = current_app.json.dumps
+    
+    def generate():
+        for item in scan_regions(targets, get_weather_data, calculate_flood_risk, concurrency):
+            yield dumps(item) + '\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson',
+                    headers={'X-Total-Regions': str(len(targets))})
+
+HEALTH_STATUS = {
+    'status': 'healthy',
+    'service': 'Sistem Pakar Mitigasi Bencana Alam - Enhanced',
+    'version': '2.0.0',
+    'features': [*HAZARDS.names, 'combined']
+}
+
+@api.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Sistem Pakar Mitigasi Bencana Alam - Enhanced',
-        'version': '2.0.0',
-        'features': ['flood', 'earthquake', 'combined']
-    })
+    """Health check (static, encoded once)"""
+    return jsonify(SHARED_FRAGMENTS.get(HEALTH_STATUS))
 
 # ============================================
 # ERROR HANDLERS
 # ============================================
 
-@app.route('/debug-static')
-def debug_static():
-    """Debug endpoint to check static files on server"""
-    try:
-        current_dir = os.getcwd()
-        files_root = os.listdir(current_dir)
-        
-        static_info = "Static folder not found"
-        team_images = []
-        
-        static_path = os.path.join(current_dir, 'static')
-        if os.path.exists(static_path):
-            static_info = os.listdir(static_path)
-            
-            team_path = os.path.join(static_path, 'images', 'team')
-            if os.path.exists(team_path):
-                team_images = os.listdir(team_path)
-            else:
-                team_images = "Team folder not found"
-        
-        return jsonify({
-            'current_dir': current_dir,
-            'root_files': files_root,
-            'static_contents': static_info,
-            'team_images': team_images,
-            'env_vars': dict(os.environ)
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)})
-
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     return jsonify({'success': False, 'error': 'Endpoint not found'}), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     return jsonify({'success': False, 'error': 'Internal server error'}), 500
 
+# ============================================
+# APP FACTORY
+# ============================================
+
+def precomputed_store(app: Flask, path: str = PRECOMPUTED_FILE) -> PrecomputedStore:
+    """Deploy-time artifact for `app`, valid only for its sources and JSON backend"""
+    return PrecomputedStore(path, PRECOMPUTED_SOURCES, (app.json.backend_version(),))
+
+def create_app() -> Flask:
+    """
+    Build the Flask app: routes, CORS, response tables, pages and the rule watcher
+
+    Response tables and pages come from the deploy-time artifact when it
+    matches the current code, template and rule file, and are computed
+    otherwise.
+    """
+    app = Flask(__name__)
+    # Before the response tables and pages are bound: they encode with app.json
+    app.json = FastJSONProvider(app)
+    CORS(app)
+    METRICS.install(app)
+    app.register_blueprint(api)
+
+    store = precomputed_store(app)
+    for table in RESPONSE_TABLES:
+        table.bind(app.json, store)
+    IMAGES.install(app)
+    for page in STATIC_PAGES:
+        page.bind(app, store)
+    RULES.watch()
+    return app
+
+app = create_app()
+
 # ============================================
 # MAIN ENTRY POINT
 # ============================================
@@ -727,21 +1411,32 @@ if __name__ == '__main__':
     print("=" * 80)
     print()
     print("✨ NEW FEATURES:")
-    print("   - Multi-disaster support (Banjir + Gempa)")
+    print("   - Multi-disaster support (Banjir + Gempa + Longsor + Tsunami)")
     print("   - Enhanced variables (7 total)")
     print("   - Combined risk assessment")
     print("   - Improved recommendations")
     print()
+    print(f"🔑 OPENWEATHER_API_KEY: {'✅ SET' if os.getenv('OPENWEATHER_API_KEY') else '❌ NOT SET (.env)'}")
     print("🚀 Starting Flask server...")
     print("📍 Server: http://localhost:5000")
     print("📍 API Endpoints:")
     print("   - POST /api/calculate-flood")
     print("   - POST /api/calculate-earthquake")
     print("   - POST /api/calculate-combined")
+    print("   - POST /api/calculate-batch")
     print("   - GET  /api/truth-table/flood")
     print("   - GET  /api/truth-table/earthquake")
+    print("   - GET  /api/truth-table/custom?formula=...")
+    print("   - GET  /api/truth-table/<landslide|tsunami>")
+    print("   - GET  /api/analyze/<flood|earthquake|custom>?p=1")
+    print("   - GET/POST /api/minimize?formula=...")
+    print("   - GET  /api/mitigation/<flood|earthquake|custom>?p=1&q=1&r=1")
+    print("   - GET  /api/rules, POST /api/rules/reload")
     print("   - GET  /api/weather")
     print("   - GET  /api/weather/search")
+    print("   - GET  /api/weather/cache-stats")
+    print("   - GET  /metrics")
+    print("   - GET/POST /api/scan/flood")
     print()
     print("Press CTRL+C to stop")
     print("=" * 80)